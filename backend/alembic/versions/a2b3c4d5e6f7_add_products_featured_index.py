@@ -0,0 +1,37 @@
+"""add products featured index
+
+The featured listing filters on is_featured, is_active and
+inventory_count > 0 and orders by created_at DESC. Featured products are
+a small fraction of the catalogue, so a partial index on exactly that
+predicate stays small and serves the page as one ordered range scan.
+
+Revision ID: a2b3c4d5e6f7
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a2b3c4d5e6f7"
+down_revision: Union[str, None] = "f1a2b3c4d5e6"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_products_featured",
+        "products",
+        [sa.text("created_at DESC")],
+        postgresql_where=sa.text(
+            "is_featured = TRUE AND is_active = TRUE AND inventory_count > 0"
+        ),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_products_featured", table_name="products")
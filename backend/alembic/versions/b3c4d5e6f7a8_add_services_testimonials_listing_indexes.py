@@ -0,0 +1,44 @@
+"""add service package and testimonial listing indexes
+
+The public service listing filters on is_active = TRUE and orders by
+display_order, name, id; the testimonial listing filters on is_approved = TRUE
+and orders by is_featured DESC, display_order, created_at DESC. The
+existing single-column indexes can serve neither ordering, so every request
+sorts all matching rows. These partial indexes hold only the listed rows,
+already in listing order.
+
+Revision ID: b3c4d5e6f7a8
+Revises: a2b3c4d5e6f7
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b3c4d5e6f7a8"
+down_revision: Union[str, None] = "a2b3c4d5e6f7"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_service_packages_listing",
+        "service_packages",
+        ["display_order", "name", "id"],
+        postgresql_where=sa.text("is_active = TRUE"),
+    )
+    op.create_index(
+        "idx_testimonials_listing",
+        "testimonials",
+        [sa.text("is_featured DESC"), "display_order", sa.text("created_at DESC")],
+        postgresql_where=sa.text("is_approved = TRUE"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_testimonials_listing", table_name="testimonials")
+    op.drop_index("idx_service_packages_listing", table_name="service_packages")
@@ -0,0 +1,33 @@
+"""add composite index for user booking history
+
+The booking history endpoint filters on user_id and orders by
+booking_date, booking_time, id; a composite index lets PostgreSQL read the
+page straight off the index (scanned backwards for DESC) instead of
+sorting every booking the user has.
+
+Revision ID: b7c8d9e0f1a2
+Revises: a3b4c5d6e7f8
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b7c8d9e0f1a2"
+down_revision: Union[str, None] = "a3b4c5d6e7f8"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_bookings_user_date",
+        "bookings",
+        ["user_id", "booking_date", "booking_time", "id"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_bookings_user_date", table_name="bookings")
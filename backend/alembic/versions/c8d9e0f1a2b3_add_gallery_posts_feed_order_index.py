@@ -0,0 +1,40 @@
+"""add gallery_posts feed order index
+
+The public gallery lists published posts ordered by is_featured DESC,
+display_order, published_at DESC, id DESC, with the nullable flag and
+display order coalesced to their defaults. The mixed sort directions can't
+be served by the single-column indexes, so this composite index is declared
+on the same expressions with the same directions.
+
+Revision ID: c8d9e0f1a2b3
+Revises: b7c8d9e0f1a2
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "c8d9e0f1a2b3"
+down_revision: Union[str, None] = "b7c8d9e0f1a2"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_gallery_posts_feed_order",
+        "gallery_posts",
+        [
+            sa.text("coalesce(is_featured, false) DESC"),
+            sa.text("coalesce(display_order, 0)"),
+            sa.text("published_at DESC"),
+            sa.text("id DESC"),
+        ],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_gallery_posts_feed_order", table_name="gallery_posts")
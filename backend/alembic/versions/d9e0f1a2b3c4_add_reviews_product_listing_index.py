@@ -0,0 +1,34 @@
+"""add reviews product listing index
+
+The public reviews listing filters by product_id and is_approved and
+orders by created_at DESC. This composite index covers the filter and the
+ordering (with id as a tiebreaker), so a paginated LIMIT query is a narrow
+index range scan instead of a scan and sort of the product's reviews.
+
+Revision ID: d9e0f1a2b3c4
+Revises: c8d9e0f1a2b3
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d9e0f1a2b3c4"
+down_revision: Union[str, None] = "c8d9e0f1a2b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "idx_reviews_product_approved_created",
+        "reviews",
+        ["product_id", "is_approved", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("idx_reviews_product_approved_created", table_name="reviews")
@@ -0,0 +1,49 @@
+"""add trigram search indexes
+
+Product search and autocomplete match ILIKE '%term%' against product
+titles and descriptions, brand names and category names. A leading
+wildcard can't use a B-tree, so each of those columns gets a pg_trgm GIN
+index, which serves ILIKE (case-insensitive, no lower() needed) directly.
+
+The indexes live only in this migration, not on the models: pg_trgm is a
+contrib extension, and create_all must keep working on servers without it.
+
+Revision ID: e0f1a2b3c4d5
+Revises: d9e0f1a2b3c4
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e0f1a2b3c4d5"
+down_revision: Union[str, None] = "d9e0f1a2b3c4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRIGRAM_INDEXES = [
+    ("idx_products_title_trgm", "products", "title"),
+    ("idx_products_description_trgm", "products", "description"),
+    ("idx_brands_name_trgm", "brands", "name"),
+    ("idx_categories_name_trgm", "categories", "name"),
+]
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    for name, table, column in TRIGRAM_INDEXES:
+        op.create_index(
+            name,
+            table,
+            [column],
+            postgresql_using="gin",
+            postgresql_ops={column: "gin_trgm_ops"},
+        )
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(TRIGRAM_INDEXES):
+        op.drop_index(name, table_name=table)
+    # The extension is left installed; other objects may depend on it
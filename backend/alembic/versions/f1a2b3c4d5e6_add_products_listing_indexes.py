@@ -0,0 +1,41 @@
+"""add products listing indexes
+
+The public product listing filters on is_active = TRUE AND
+inventory_count > 0 and orders by created_at (default), base_price or
+title. The existing single-column indexes cover the whole table, so the
+planner still has to sort every matching row before applying LIMIT. These
+partial indexes hold only listable products in sort order; B-tree indexes
+scan in either direction, so one per column serves ASC and DESC.
+
+Revision ID: f1a2b3c4d5e6
+Revises: e0f1a2b3c4d5
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f1a2b3c4d5e6"
+down_revision: Union[str, None] = "e0f1a2b3c4d5"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LISTING_SORT_COLUMNS = ["created_at", "base_price", "title"]
+
+
+def upgrade() -> None:
+    for column in LISTING_SORT_COLUMNS:
+        op.create_index(
+            f"idx_products_listing_{column}",
+            "products",
+            [column],
+            postgresql_where=sa.text("is_active = TRUE AND inventory_count > 0"),
+        )
+
+
+def downgrade() -> None:
+    for column in reversed(LISTING_SORT_COLUMNS):
+        op.drop_index(f"idx_products_listing_{column}", table_name="products")
@@ -13,6 +13,8 @@ from app.schemas.gallery import (
     GalleryPostCreate,
     GalleryPostResponse,
     GalleryPostUpdate,
+    MediaType,
+    SourceType,
 )
 from app.services import gallery_service
 
@@ -27,15 +29,8 @@ router = APIRouter(tags=["Admin Gallery"])
 def list_all_gallery_posts(
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(100, ge=1, le=500, description="Maximum number of records to return"),
-    media_type: Optional[str] = Query(
-        None, alias="mediaType", pattern="^(image|video)$", description="Filter by media type"
-    ),
-    source_type: Optional[str] = Query(
-        None,
-        alias="sourceType",
-        pattern="^(instagram|tiktok|original)$",
-        description="Filter by source type",
-    ),
+    media_type: Optional[MediaType] = Query(None, alias="mediaType", description="Filter by media type"),
+    source_type: Optional[SourceType] = Query(None, alias="sourceType", description="Filter by source type"),
     is_featured: Optional[bool] = Query(None, alias="isFeatured", description="Filter by featured status"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user),
@@ -5,7 +5,7 @@ Admin-only endpoints for brand management
 from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
-from typing import Optional
+from typing import Optional, Union
 import math
 
 from app.core.database import get_db
@@ -15,19 +15,22 @@ from app.schemas.brand import (
     BrandCreate,
     BrandUpdate,
     BrandResponse,
-    BrandListResponse
+    BrandListResponse,
+    BrandPageResponse
 )
 from app.services import brand_service
 
 router = APIRouter(prefix="/admin/brands", tags=["admin", "brands"])
 
 
-@router.get("", response_model=BrandListResponse)
+@router.get("", response_model=Union[BrandListResponse, BrandPageResponse])
 async def list_brands(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     is_active: Optional[bool] = Query(None, description="Filter by active status"),
     search: Optional[str] = Query(None, description="Search in name and description"),
+    cursor: Optional[UUID] = Query(None, description="Return brands after this brand ID (keyset pagination)"),
+    include_total: bool = Query(True, description="Include total and total_pages (runs an extra COUNT query)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
 ):
@@ -41,16 +44,37 @@ async def list_brands(
     - **page_size**: Items per page (default: 20, max: 100)
     - **is_active**: Filter by active status
     - **search**: Search in name and description
+    - **cursor**: ID of the last brand from the previous page; when given,
+      `page` is ignored and results continue after that brand
+    - **include_total**: Set to false to skip counting matching brands;
+      the response then has no `total` or `total_pages`
     """
     skip = (page - 1) * page_size
 
-    brands, total = brand_service.get_brands(
-        db=db,
-        skip=skip,
-        limit=page_size,
-        is_active=is_active,
-        search=search
-    )
+    try:
+        brands, total = brand_service.get_brands(
+            db=db,
+            skip=skip,
+            limit=page_size,
+            is_active=is_active,
+            search=search,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    next_cursor = brands[-1].id if len(brands) == page_size else None
+    if total is None:
+        return BrandPageResponse(
+            items=brands,
+            page=page,
+            page_size=page_size,
+            next_cursor=next_cursor
+        )
 
     total_pages = math.ceil(total / page_size) if total > 0 else 1
 
@@ -59,7 +83,8 @@ async def list_brands(
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
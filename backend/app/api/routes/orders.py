@@ -1,5 +1,6 @@
 """Order API routes."""
 from typing import Optional
+from uuid import UUID
 
 from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from sqlalchemy.orm import Session
@@ -111,6 +112,7 @@ def get_order(
 def get_user_orders(
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[UUID] = None,
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user),
 ):
@@ -120,22 +122,29 @@ def get_user_orders(
     Query Parameters:
         skip: Number of records to skip (default: 0)
         limit: Maximum number of records to return (default: 20, max: 100)
+        cursor: ID of the last order from the previous page (nextCursor);
+            when given, skip is ignored and results continue after that order
     """
     if limit > 100:
         limit = 100
 
-    orders, total = order_service.get_user_orders(
-        db=db,
-        user_id=current_user.id,
-        skip=skip,
-        limit=limit,
-    )
+    try:
+        orders, total = order_service.get_user_orders(
+            db=db,
+            user_id=current_user.id,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     return OrderListResponse(
         orders=orders,
         total=total,
         skip=skip,
         limit=limit,
+        next_cursor=orders[-1].id if len(orders) == limit else None,
     )
 
 
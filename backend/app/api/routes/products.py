@@ -6,6 +6,7 @@ from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import Optional
+from decimal import Decimal
 import math
 
 from app.core.database import get_db
@@ -31,8 +32,8 @@ async def list_products(
     brand_id: Optional[UUID] = Query(None, description="Filter by brand ID"),
     category_id: Optional[UUID] = Query(None, description="Filter by category ID"),
     search: Optional[str] = Query(None, description="Search in title, description, and tags"),
-    min_price: Optional[float] = Query(None, ge=0, description="Minimum base price"),
-    max_price: Optional[float] = Query(None, ge=0, description="Maximum base price"),
+    min_price: Optional[Decimal] = Query(None, ge=0, description="Minimum base price"),
+    max_price: Optional[Decimal] = Query(None, ge=0, description="Maximum base price"),
     in_stock_only: bool = Query(False, description="Only show in-stock products"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_admin_user)
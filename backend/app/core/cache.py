@@ -0,0 +1,74 @@
+"""
+Short-lived, per-process caching of serialized responses
+"""
+import time
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from pydantic import BaseModel
+
+# How long a public listing response is served from cache
+LISTING_CACHE_TTL_SECONDS = 30
+
+
+class TTLCache:
+    """
+    Small in-memory cache whose entries expire after a fixed number of seconds
+
+    Owners clear it whenever the underlying rows change, and the TTL bounds
+    staleness for changes made by other worker processes. When full, it is
+    simply emptied.
+    """
+
+    def __init__(self, ttl_seconds: float, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] <= time.monotonic():
+            return None
+        return entry[1]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """Cache value under key for ttl_seconds."""
+        if len(self._entries) >= self.max_entries:
+            self._entries.clear()
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+
+    def clear(self) -> None:
+        """Drop all cached entries."""
+        self._entries.clear()
+
+
+class ListingCache(TTLCache):
+    """
+    Cache of one public listing's JSON responses, keyed by its query parameters
+
+    Each listing has its own named instance in the service that owns the
+    listed rows, which clears it after every commit that changes them.
+    """
+
+    def __init__(self, name: str, ttl_seconds: float = LISTING_CACHE_TTL_SECONDS):
+        super().__init__(ttl_seconds)
+        self.name = name
+
+    def __repr__(self) -> str:
+        return f"ListingCache({self.name!r})"
+
+    @staticmethod
+    def dump(listing: BaseModel) -> bytes:
+        """
+        Serialize a listing response to JSON bytes
+
+        The listing was validated when it was built, so dumping it directly
+        skips FastAPI's dump and re-validation against the response_model.
+        """
+        return listing.model_dump_json(by_alias=True).encode()
+
+    def store(self, key: Hashable, listing: BaseModel) -> bytes:
+        """Serialize a listing response, cache the JSON bytes and return them."""
+        body = self.dump(listing)
+        self.set(key, body)
+        return body
@@ -2,8 +2,9 @@
 Security utilities for authentication and password hashing
 """
 from datetime import datetime, timedelta
+from functools import lru_cache
 from typing import Optional, Dict, Any
-from jose import JWTError, jwt
+from jose import JWTError, jwk, jwt
 from passlib.context import CryptContext
 from app.core.config import settings
 
@@ -11,6 +12,28 @@ from app.core.config import settings
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
+@lru_cache(maxsize=4)
+def _construct_key(secret: str, algorithm: str):
+    """
+    Build a prepared jose key for a secret and algorithm
+
+    Given the raw secret string, jose constructs a fresh key object on every
+    encode, and on every decode first tries to parse the secret as a JSON JWK
+    set; a prepared key skips both. Caching per (secret, algorithm) rather
+    than once at import means a changed SECRET_KEY or ALGORITHM gets its own
+    key instead of silently reusing the old one.
+    """
+    return jwk.construct(secret, algorithm)
+
+
+def _signing_key():
+    """
+    JWT signing/verification key for the current settings, used by every
+    encode and decode so the two always agree
+    """
+    return _construct_key(settings.SECRET_KEY, settings.ALGORITHM)
+
+
 def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta] = None) -> str:
     """
     Create JWT access token
@@ -30,7 +53,7 @@ def create_access_token(data: Dict[str, Any], expires_delta: Optional[timedelta]
         expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     
     to_encode.update({"exp": expire, "type": "access"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _signing_key(), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -47,7 +70,7 @@ def create_refresh_token(data: Dict[str, Any]) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(days=settings.REFRESH_TOKEN_EXPIRE_DAYS)
     to_encode.update({"exp": expire, "type": "refresh"})
-    encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    encoded_jwt = jwt.encode(to_encode, _signing_key(), algorithm=settings.ALGORITHM)
     return encoded_jwt
 
 
@@ -63,7 +86,7 @@ def verify_token(token: str, token_type: str = "access") -> Optional[Dict[str, A
         Decoded token payload if valid, None otherwise
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _signing_key(), algorithms=[settings.ALGORITHM])
         
         # Verify token type
         if payload.get("type") != token_type:
@@ -88,7 +111,7 @@ def create_booking_confirmation_token(
         "exp": expire,
         "type": "booking_confirmation",
     }
-    return jwt.encode(payload, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
+    return jwt.encode(payload, _signing_key(), algorithm=settings.ALGORITHM)
 
 
 def verify_booking_confirmation_token(token: str) -> Optional[str]:
@@ -98,7 +121,7 @@ def verify_booking_confirmation_token(token: str) -> Optional[str]:
     different purpose.
     """
     try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        payload = jwt.decode(token, _signing_key(), algorithms=[settings.ALGORITHM])
     except JWTError:
         return None
     if payload.get("type") != "booking_confirmation":
@@ -116,6 +116,8 @@ class Booking(Base):
             name="bookings_location_check",
         ),
         Index("idx_bookings_date_time", "booking_date", "booking_time"),
+        # Serves a user's booking history: WHERE user_id = ? ORDER BY date, time, id
+        Index("idx_bookings_user_date", "user_id", "booking_date", "booking_time", "id"),
         Index("idx_bookings_custom_location", "custom_location_latitude", "custom_location_longitude"),
     )
 
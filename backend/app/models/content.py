@@ -14,6 +14,8 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    desc,
+    text,
 )
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
@@ -61,6 +63,15 @@ class Review(Base):
         CheckConstraint("rating >= 1 AND rating <= 5", name="reviews_rating_check"),
         CheckConstraint("helpful_count >= 0", name="reviews_helpful_count_check"),
         UniqueConstraint("product_id", "user_id", name="reviews_unique_product_user"),
+        # Serves the public product listing (approved reviews, newest first)
+        # straight from the index, so a LIMIT page reads only its own rows
+        Index(
+            "idx_reviews_product_approved_created",
+            "product_id",
+            "is_approved",
+            desc("created_at"),
+            desc("id"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -96,6 +107,14 @@ class GalleryPost(Base):
             name="gallery_posts_source_type_check",
         ),
         Index("idx_gallery_posts_tags", "tags", postgresql_using="gin"),
+        # Matches the public feed ordering so pages are read in index order
+        Index(
+            "idx_gallery_posts_feed_order",
+            text("coalesce(is_featured, false) DESC"),
+            text("coalesce(display_order, 0)"),
+            desc("published_at"),
+            desc("id"),
+        ),
     )
 
     def __repr__(self) -> str:
@@ -133,6 +152,15 @@ class Testimonial(Base):
 
     __table_args__ = (
         CheckConstraint("rating >= 1 AND rating <= 5", name="testimonials_rating_check"),
+        # Approved testimonials in the public listing order (featured first,
+        # then display_order, newest first), so no sort is needed
+        Index(
+            "idx_testimonials_listing",
+            desc("is_featured"),
+            "display_order",
+            desc("created_at"),
+            postgresql_where="is_approved = TRUE",
+        ),
     )
 
     def __repr__(self) -> str:
@@ -15,6 +15,7 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    desc,
 )
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
@@ -115,8 +116,13 @@ class Product(Base):
     # Relationships
     brand = relationship("Brand", back_populates="products")
     category = relationship("Category", back_populates="products")
+    # A plain list (not lazy="dynamic") so listings can batch-load the
+    # images of a whole page with selectinload
     images = relationship(
-        "ProductImage", back_populates="product", lazy="dynamic", cascade="all, delete-orphan"
+        "ProductImage",
+        back_populates="product",
+        order_by="ProductImage.display_order",
+        cascade="all, delete-orphan",
     )
     videos = relationship(
         "ProductVideo", back_populates="product", lazy="dynamic", cascade="all, delete-orphan"
@@ -147,6 +153,33 @@ class Product(Base):
         ),
         Index("idx_products_inventory", "inventory_count"),
         Index("idx_products_tags", "tags", postgresql_using="gin"),
+        # The public listing only shows active, in-stock products, sorted by
+        # one of these columns; partial indexes let a page be read in order
+        # without sorting the whole catalogue (each also scans backwards)
+        Index(
+            "idx_products_listing_created_at",
+            "created_at",
+            postgresql_where="is_active = TRUE AND inventory_count > 0",
+        ),
+        Index(
+            "idx_products_listing_base_price",
+            "base_price",
+            postgresql_where="is_active = TRUE AND inventory_count > 0",
+        ),
+        Index(
+            "idx_products_listing_title",
+            "title",
+            postgresql_where="is_active = TRUE AND inventory_count > 0",
+        ),
+        # Featured products are a small slice of the catalogue; this index
+        # holds only those, newest first, for the featured listing
+        Index(
+            "idx_products_featured",
+            desc("created_at"),
+            postgresql_where="is_featured = TRUE AND is_active = TRUE AND inventory_count > 0",
+        ),
+        # Trigram indexes for ILIKE search on title and description are
+        # created by migration e0f1a2b3c4d5 only, since they need pg_trgm
     )
 
     def __repr__(self) -> str:
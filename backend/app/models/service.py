@@ -68,6 +68,16 @@ class ServicePackage(Base):
             "max_maids IS NULL OR min_maids IS NULL OR max_maids >= min_maids",
             name="service_packages_maid_range_check",
         ),
+        # The public listing shows active packages by display_order, then
+        # name (id breaks ties between pages); this partial index holds them
+        # in that order
+        Index(
+            "idx_service_packages_listing",
+            "display_order",
+            "name",
+            "id",
+            postgresql_where="is_active = TRUE",
+        ),
     )
 
     def __repr__(self) -> str:
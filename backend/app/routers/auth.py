@@ -28,7 +28,7 @@ router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/google-login", response_model=GoogleAuthResponse, status_code=status.HTTP_200_OK)
-async def google_auth(
+def google_auth(
     auth_data: GoogleAuthRequest,
     db: Session = Depends(get_db)
 ):
@@ -40,6 +40,10 @@ async def google_auth(
     is never trusted. Also links any guest orders/bookings placed under the same
     verified email.
 
+    Declared as a plain ``def`` so FastAPI runs it in its threadpool: the
+    token verification and the guest-linking UPDATEs are blocking calls and
+    would otherwise stall the event loop for every other request.
+
     Args:
         auth_data: Google authentication data (idToken, and optional name/image)
         db: Database session
@@ -265,7 +269,7 @@ async def create_guest_user(
 
 
 @router.post("/link-guest-data")
-async def link_guest_data(
+def link_guest_data(
     guest_email: str,
     current_user: User = Depends(get_current_active_user),
     db: Session = Depends(get_db)
@@ -5,7 +5,7 @@ Publicly accessible endpoints for booking availability and creation
 from fastapi import APIRouter, BackgroundTasks, Depends, Query, HTTPException, status
 from sqlalchemy.orm import Session
 from datetime import date as date_type, timedelta
-from typing import Optional
+from typing import Optional, Union
 from uuid import UUID
 
 from app.core.database import get_db
@@ -22,6 +22,7 @@ from app.schemas.booking import (
     BookingCreateResponse,
     BookingResponse,
     BookingListResponse,
+    BookingPageResponse,
 )
 from app.services import booking_service
 from app.services.booking_notifications import schedule_booking_notifications
@@ -30,11 +31,13 @@ import math
 router = APIRouter(prefix="/bookings", tags=["bookings"])
 
 
-@router.get("", response_model=BookingListResponse)
+@router.get("", response_model=Union[BookingListResponse, BookingPageResponse])
 async def list_user_bookings(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     status: Optional[str] = Query(None, description="Filter by status (pending, confirmed, deposit_paid, completed, cancelled)"),
+    cursor: Optional[UUID] = Query(None, description="Return bookings after this booking ID (keyset pagination)"),
+    include_total: bool = Query(True, description="Include total and total_pages (runs an extra COUNT query)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -54,6 +57,10 @@ async def list_user_bookings(
       - `deposit_paid`: Deposit received
       - `completed`: Service completed
       - `cancelled`: Booking cancelled
+    - **cursor**: ID of the last booking from the previous page; when given,
+      `page` is ignored and results continue after that booking
+    - **include_total**: Set to false to skip counting matching bookings;
+      the response then has no `total` or `total_pages`
 
     Sorting:
     - Bookings are sorted by date (newest first)
@@ -61,18 +68,35 @@ async def list_user_bookings(
 
     Returns:
     - List of user's bookings with full details
-    - Pagination metadata
+    - Pagination metadata, including `next_cursor` for keyset pagination
     """
     skip = (page - 1) * page_size
 
     # Get user's bookings
-    bookings, total = booking_service.get_user_bookings(
-        db=db,
-        user_id=current_user.id,
-        skip=skip,
-        limit=page_size,
-        status=status
-    )
+    try:
+        bookings, total = booking_service.get_user_bookings(
+            db=db,
+            user_id=current_user.id,
+            skip=skip,
+            limit=page_size,
+            status=status,
+            cursor=cursor,
+            include_total=include_total
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=400,  # "status" is shadowed by the query parameter here
+            detail=str(e)
+        )
+
+    next_cursor = bookings[-1].id if len(bookings) == page_size else None
+    if total is None:
+        return BookingPageResponse(
+            items=bookings,
+            page=page,
+            page_size=page_size,
+            next_cursor=next_cursor
+        )
 
     total_pages = math.ceil(total / page_size) if total > 0 else 1
 
@@ -81,7 +105,8 @@ async def list_user_bookings(
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=next_cursor
     )
 
 
@@ -1,32 +1,58 @@
 """Gallery API endpoints."""
+import hashlib
 from math import ceil
-from typing import Optional
+from typing import Optional, Union
+from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
-from app.schemas.gallery import GalleryListResponse, GalleryPostResponse
-from app.services.gallery_service import get_published_gallery_posts
+from app.schemas.gallery import (
+    GalleryListResponse,
+    GalleryPageResponse,
+    GalleryPostResponse,
+    MediaType,
+    SourceType,
+)
+from app.services.gallery_service import get_published_gallery_posts, listing_cache
 from app.services.instagram_service import maybe_trigger_sync
 
 router = APIRouter(prefix="/gallery", tags=["gallery"])
 
 
-@router.get("", response_model=GalleryListResponse, status_code=status.HTTP_200_OK)
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """
+    Check an If-None-Match header against etag
+
+    If-None-Match uses weak comparison (RFC 9110), so a W/ prefix is ignored,
+    and "*" matches any current representation.
+    """
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag in tags
+
+
+def _listing_response(body: bytes, etag: str, if_none_match: Optional[str]) -> Response:
+    """Return the listing body, or an empty 304 if the client already has it."""
+    headers = {"ETag": etag}
+    if if_none_match and _etag_matches(etag, if_none_match):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get(
+    "",
+    response_model=Union[GalleryListResponse, GalleryPageResponse],
+    status_code=status.HTTP_200_OK,
+)
 def list_gallery_posts(
     page: int = Query(1, ge=1, description="Page number (1-indexed)"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
-    media_type: Optional[str] = Query(
-        None,
-        description="Filter by media type",
-        pattern="^(image|video)$",
-    ),
-    source_type: Optional[str] = Query(
-        None,
-        description="Filter by source type",
-        pattern="^(instagram|tiktok|original)$",
-    ),
+    media_type: Optional[MediaType] = Query(None, description="Filter by media type"),
+    source_type: Optional[SourceType] = Query(None, description="Filter by source type"),
+    cursor: Optional[UUID] = Query(None, description="Return posts after this post ID (keyset pagination)"),
+    include_total: bool = Query(True, description="Include total and total_pages (runs an extra COUNT query)"),
+    if_none_match: Optional[str] = Header(None),
     db: Session = Depends(get_db),
 ):
     """
@@ -36,27 +62,58 @@ def list_gallery_posts(
     - **page_size**: Number of items per page (max 100)
     - **media_type**: Filter by 'image' or 'video'
     - **source_type**: Filter by 'instagram', 'tiktok', or 'original'
+    - **cursor**: ID of the last post seen; preferred over page for deep
+      pagination since it seeks instead of skipping rows
+    - **include_total**: Set to false to skip counting matching posts;
+      total and total_pages are then omitted
 
     Returns posts ordered by featured status, display order, and publication date.
-    Only returns posts with published_at <= current time.
+    Only returns posts with published_at <= current time. Responses are cached
+    for a few seconds and invalidated whenever posts change. Each response
+    carries an ETag of its body; a request whose If-None-Match matches gets
+    an empty 304 instead.
     """
-    # Trigger background Instagram sync if stale (non-blocking)
+    # Trigger background Instagram sync if stale (non-blocking), on cache
+    # hits too, so a busy gallery still picks up new posts
     maybe_trigger_sync(db)
 
-    posts, total = get_published_gallery_posts(
-        db=db,
-        page=page,
-        page_size=page_size,
-        media_type=media_type,
-        source_type=source_type,
-    )
-
-    total_pages = ceil(total / page_size) if total > 0 else 0
-
-    return GalleryListResponse(
-        items=[GalleryPostResponse.model_validate(post) for post in posts],
-        total=total,
-        page=page,
-        page_size=page_size,
-        total_pages=total_pages,
-    )
+    cache_key = (page, page_size, media_type, source_type, cursor, include_total)
+    cached = listing_cache.get(cache_key)
+    if cached is not None:
+        return _listing_response(*cached, if_none_match)
+
+    try:
+        posts, total = get_published_gallery_posts(
+            db=db,
+            page=page,
+            page_size=page_size,
+            media_type=media_type,
+            source_type=source_type,
+            cursor=cursor,
+            include_total=include_total,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    items = [GalleryPostResponse.model_validate(post) for post in posts]
+    next_cursor = posts[-1].id if len(posts) == page_size else None
+    if total is None:
+        listing = GalleryPageResponse(
+            items=items,
+            page=page,
+            page_size=page_size,
+            next_cursor=next_cursor,
+        )
+    else:
+        listing = GalleryListResponse(
+            items=items,
+            total=total,
+            page=page,
+            page_size=page_size,
+            total_pages=ceil(total / page_size) if total > 0 else 0,
+            next_cursor=next_cursor,
+        )
+    body = listing_cache.dump(listing)
+    etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+    listing_cache.set(cache_key, (body, etag))
+    return _listing_response(body, etag, if_none_match)
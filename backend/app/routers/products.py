@@ -1,9 +1,10 @@
 """Public product API routes."""
 import math
+from decimal import Decimal
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
@@ -27,11 +28,12 @@ async def list_products(
     brand_id: Optional[UUID] = Query(None, alias="brandId", description="Filter by brand ID"),
     category_id: Optional[UUID] = Query(None, alias="categoryId", description="Filter by category ID"),
     search: Optional[str] = Query(None, description="Search in title, description, and tags"),
-    min_price: Optional[float] = Query(None, ge=0, alias="minPrice", description="Minimum base price"),
-    max_price: Optional[float] = Query(None, ge=0, alias="maxPrice", description="Maximum base price"),
+    min_price: Optional[Decimal] = Query(None, ge=0, alias="minPrice", description="Minimum base price"),
+    max_price: Optional[Decimal] = Query(None, ge=0, alias="maxPrice", description="Maximum base price"),
     sort_by: str = Query("created_at", alias="sortBy", description="Sort field"),
     sort_order: str = Query("desc", alias="sortOrder", pattern="^(asc|desc)$", description="Sort order"),
     in_stock_only: bool = Query(True, alias="inStockOnly", description="Only show in-stock products"),
+    cursor: Optional[UUID] = Query(None, description="Return products after this product ID (keyset pagination)"),
     db: Session = Depends(get_db),
 ):
     """
@@ -50,30 +52,54 @@ async def list_products(
     - **sortBy**: Sort field (created_at, price, title, etc.)
     - **sortOrder**: Sort order (asc/desc)
     - **inStockOnly**: Only show products with inventory > 0 (default: true)
+    - **cursor**: ID of the last product seen (next_cursor); preferred over
+      page for deep pagination since it seeks instead of skipping rows
+
+    Responses are cached for a few seconds and invalidated whenever listed
+    products, images, brands or categories change.
     """
+    cache_key = (
+        "list", page, page_size, brand_id, category_id, search, min_price, max_price,
+        sort_by, sort_order, in_stock_only, cursor,
+    )
+    cached = product_service.listing_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     skip = (page - 1) * page_size
 
-    products, total = product_service.get_products(
-        db=db,
-        skip=skip,
-        limit=page_size,
-        is_active=True,  # Only active products for public
-        brand_id=brand_id,
-        category_id=category_id,
-        search=search,
-        min_price=min_price,
-        max_price=max_price,
-        in_stock_only=in_stock_only,
-        load_relations=True,
-        sort_by=sort_by,
-        sort_order=sort_order,
-    )
+    try:
+        products, total = product_service.get_products(
+            db=db,
+            skip=skip,
+            limit=page_size,
+            is_active=True,  # Only active products for public
+            brand_id=brand_id,
+            category_id=category_id,
+            search=search,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock_only=in_stock_only,
+            load_relations=True,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     total_pages = math.ceil(total / page_size) if total > 0 else 1
 
-    return ProductListResponse(
-        items=products, total=total, page=page, page_size=page_size, total_pages=total_pages
+    listing = ProductListResponse(
+        items=products,
+        total=total,
+        page=page,
+        page_size=page_size,
+        total_pages=total_pages,
+        next_cursor=products[-1].id if len(products) == page_size else None,
     )
+    body = product_service.listing_cache.store(cache_key, listing)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/featured", response_model=ProductListResponse)
@@ -85,8 +111,14 @@ async def list_featured_products(
     """
     Get featured products (public).
 
-    Returns only active, in-stock featured products.
+    Returns only active, in-stock featured products. Cached like the
+    product list.
     """
+    cache_key = ("featured", page, page_size)
+    cached = product_service.listing_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     skip = (page - 1) * page_size
 
     products, total = product_service.get_products(
@@ -103,9 +135,11 @@ async def list_featured_products(
 
     total_pages = math.ceil(total / page_size) if total > 0 else 1
 
-    return ProductListResponse(
+    listing = ProductListResponse(
         items=products, total=total, page=page, page_size=page_size, total_pages=total_pages
     )
+    body = product_service.listing_cache.store(cache_key, listing)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/search", response_model=ProductSearchResponse)
@@ -113,10 +147,11 @@ async def search_products(
     q: str = Query(..., min_length=1, max_length=200, description="Search query"),
     brand_id: Optional[UUID] = Query(None, alias="brandId", description="Filter by brand ID"),
     category_id: Optional[UUID] = Query(None, alias="categoryId", description="Filter by category ID"),
-    min_price: Optional[float] = Query(None, ge=0, alias="minPrice", description="Minimum price"),
-    max_price: Optional[float] = Query(None, ge=0, alias="maxPrice", description="Maximum price"),
+    min_price: Optional[Decimal] = Query(None, ge=0, alias="minPrice", description="Minimum price"),
+    max_price: Optional[Decimal] = Query(None, ge=0, alias="maxPrice", description="Maximum price"),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(20, ge=1, le=100, description="Maximum number of results"),
+    cursor: Optional[UUID] = Query(None, description="Return results after this product ID (keyset pagination)"),
     db: Session = Depends(get_db),
 ):
     """
@@ -136,27 +171,37 @@ async def search_products(
     - **maxPrice**: Maximum price filter
     - **skip**: Pagination offset (default: 0)
     - **limit**: Results per page (default: 20, max: 100)
+    - **cursor**: ID of the last result seen (next_cursor); skip is ignored
+      when given
 
     Returns only active products with complete brand and category information.
     """
-    products, total = product_service.search_products(
-        db=db,
-        query=q,
-        brand_id=brand_id,
-        category_id=category_id,
-        min_price=min_price,
-        max_price=max_price,
-        skip=skip,
-        limit=limit,
-    )
+    try:
+        products, total = product_service.search_products(
+            db=db,
+            query=q,
+            brand_id=brand_id,
+            category_id=category_id,
+            min_price=min_price,
+            max_price=max_price,
+            skip=skip,
+            limit=limit,
+            cursor=cursor,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
-    return ProductSearchResponse(
+    results = ProductSearchResponse(
         products=products,
         total=total,
         skip=skip,
         limit=limit,
         query=q,
+        next_cursor=products[-1].id if len(products) == limit else None,
     )
+    # Search results are too varied to cache, but like the listings they are
+    # validated once here and dumped straight to JSON
+    return Response(content=results.model_dump_json(by_alias=True), media_type="application/json")
 
 
 @router.get("/suggestions", response_model=ProductSuggestionsResponse)
@@ -2,7 +2,7 @@
 Public Service Package API routes
 Publicly accessible endpoints for customers to view service packages
 """
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, Response, status, Query
 from sqlalchemy.orm import Session
 from uuid import UUID
 from typing import Optional
@@ -21,11 +21,12 @@ router = APIRouter(prefix="/services", tags=["services"])
 
 
 @router.get("", response_model=ServicePackageListResponse)
-async def list_active_packages(
+def list_active_packages(
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
     package_type: Optional[str] = Query(None, description="Filter by package type"),
     is_featured: Optional[bool] = Query(None, description="Filter by featured status"),
+    cursor: Optional[UUID] = Query(None, description="Return packages after this package ID (keyset pagination)"),
     db: Session = Depends(get_db)
 ):
     """
@@ -40,36 +41,53 @@ async def list_active_packages(
     - **page_size**: Items per page (default: 20, max: 100)
     - **package_type**: Filter by package type (bridal_large, bridal_small, bride_only, regular, classes)
     - **is_featured**: Filter by featured status (true = homepage featured services)
+    - **cursor**: ID of the last package seen (next_cursor); page is ignored
+      when given
 
     Returns:
     - Service packages with pricing breakdown
     - Pagination metadata
+
+    Responses are cached for a few seconds and invalidated whenever packages
+    change.
     """
+    cache_key = (page, page_size, package_type, is_featured, cursor)
+    cached = service_package_service.listing_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     skip = (page - 1) * page_size
 
     # Only show active packages to public
-    packages, total = service_package_service.get_packages(
-        db=db,
-        skip=skip,
-        limit=page_size,
-        package_type=package_type,
-        is_active=True,  # Force only active packages
-        is_featured=is_featured
-    )
+    try:
+        packages, total = service_package_service.get_packages(
+            db=db,
+            skip=skip,
+            limit=page_size,
+            package_type=package_type,
+            is_active=True,  # Force only active packages
+            is_featured=is_featured,
+            cursor=cursor
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
 
     total_pages = math.ceil(total / page_size) if total > 0 else 1
 
-    return ServicePackageListResponse(
+    listing = ServicePackageListResponse(
         items=packages,
         total=total,
         page=page,
         page_size=page_size,
-        total_pages=total_pages
+        total_pages=total_pages,
+        next_cursor=packages[-1].id if len(packages) == page_size else None
     )
+    body = service_package_service.listing_cache.store(cache_key, listing)
+    return Response(content=body, media_type="application/json")
 
 
 @router.get("/locations", response_model=list[TransportLocationResponse])
-async def list_active_locations(
+def list_active_locations(
     db: Session = Depends(get_db)
 ):
     """
@@ -91,7 +109,7 @@ async def list_active_locations(
 
 
 @router.get("/{package_id}", response_model=ServicePackageResponse)
-async def get_package_details(
+def get_package_details(
     package_id: UUID,
     db: Session = Depends(get_db)
 ):
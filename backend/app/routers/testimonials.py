@@ -2,16 +2,26 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query, status
+from fastapi import APIRouter, Depends, Query, Response, status
 from sqlalchemy.orm import Session
 
 from app.core.database import get_db
 from app.schemas.testimonial import TestimonialListResponse, TestimonialResponse
-from app.services.testimonial_service import get_approved_testimonials
+from app.services.testimonial_service import get_approved_testimonials, listing_cache
 
 router = APIRouter(prefix="/testimonials", tags=["testimonials"])
 
 
+def _cached_listing_response(cache_key: tuple, testimonials: list) -> Response:
+    """Validate the testimonials once, cache the listing's JSON bytes and return them."""
+    listing = TestimonialListResponse(
+        items=[TestimonialResponse.model_validate(t) for t in testimonials],
+        total=len(testimonials),
+    )
+    body = listing_cache.store(cache_key, listing)
+    return Response(content=body, media_type="application/json")
+
+
 @router.get("", response_model=TestimonialListResponse, status_code=status.HTTP_200_OK)
 def list_testimonials(
     related_service_id: Optional[UUID] = Query(
@@ -29,7 +39,13 @@ def list_testimonials(
     - **related_product_id**: Filter testimonials for a specific product
 
     Returns approved testimonials ordered by featured status, display order, and creation date.
+    Responses are cached for a few seconds and invalidated whenever testimonials change.
     """
+    cache_key = ("list", related_service_id, related_product_id)
+    cached = listing_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     testimonials = get_approved_testimonials(
         db=db,
         featured_only=False,
@@ -37,10 +53,7 @@ def list_testimonials(
         related_product_id=related_product_id,
     )
 
-    return TestimonialListResponse(
-        items=[TestimonialResponse.model_validate(t) for t in testimonials],
-        total=len(testimonials),
-    )
+    return _cached_listing_response(cache_key, testimonials)
 
 
 @router.get(
@@ -55,14 +68,16 @@ def list_featured_testimonials(
     Get list of featured testimonials only.
 
     Returns only approved testimonials marked as featured,
-    ordered by display order and creation date.
+    ordered by display order and creation date. Cached like the full listing.
     """
+    cache_key = ("featured",)
+    cached = listing_cache.get(cache_key)
+    if cached is not None:
+        return Response(content=cached, media_type="application/json")
+
     testimonials = get_approved_testimonials(
         db=db,
         featured_only=True,
     )
 
-    return TestimonialListResponse(
-        items=[TestimonialResponse.model_validate(t) for t in testimonials],
-        total=len(testimonials),
-    )
+    return _cached_listing_response(cache_key, testimonials)
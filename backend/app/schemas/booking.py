@@ -114,3 +114,16 @@ class BookingListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[UUID] = Field(
+        None, description="Pass as `cursor` to fetch the next page (keyset pagination)"
+    )
+
+
+class BookingPageResponse(BaseModel):
+    """Schema for a booking list page without the total (include_total=false)"""
+    items: list[BookingResponse]
+    page: int
+    page_size: int
+    next_cursor: Optional[UUID] = Field(
+        None, description="Pass as `cursor` to fetch the next page (keyset pagination)"
+    )
@@ -73,3 +73,16 @@ class BrandListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[UUID] = Field(
+        None, description="Pass as `cursor` to fetch the next page (keyset pagination)"
+    )
+
+
+class BrandPageResponse(BaseModel):
+    """Schema for a brand list page without the total (include_total=false)"""
+    items: list[BrandResponse]
+    page: int
+    page_size: int
+    next_cursor: Optional[UUID] = Field(
+        None, description="Pass as `cursor` to fetch the next page (keyset pagination)"
+    )
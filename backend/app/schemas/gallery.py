@@ -1,10 +1,14 @@
 """Gallery post schemas for API requests and responses."""
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Literal, Optional
 from uuid import UUID
 
 from pydantic import BaseModel, Field
 
+# Allowed values, validated by pydantic-core without a regex match
+MediaType = Literal["image", "video"]
+SourceType = Literal["instagram", "tiktok", "original"]
+
 
 class GalleryPostResponse(BaseModel):
     """Gallery post response schema."""
@@ -34,6 +38,27 @@ class GalleryListResponse(BaseModel):
     page: int
     page_size: int = Field(..., alias="pageSize")
     total_pages: int = Field(..., alias="totalPages")
+    next_cursor: Optional[UUID] = Field(
+        None,
+        alias="nextCursor",
+        description="Pass as `cursor` to fetch the next page (keyset pagination)",
+    )
+
+    class Config:
+        populate_by_name = True
+
+
+class GalleryPageResponse(BaseModel):
+    """Gallery list page without the total (include_total=false)."""
+
+    items: List[GalleryPostResponse]
+    page: int
+    page_size: int = Field(..., alias="pageSize")
+    next_cursor: Optional[UUID] = Field(
+        None,
+        alias="nextCursor",
+        description="Pass as `cursor` to fetch the next page (keyset pagination)",
+    )
 
     class Config:
         populate_by_name = True
@@ -153,6 +153,11 @@ class OrderListResponse(BaseModel):
     total: int
     skip: int
     limit: int
+    next_cursor: Optional[UUID] = Field(
+        None,
+        alias="nextCursor",
+        description="Pass as `cursor` to fetch the next page (keyset pagination)",
+    )
 
     class Config:
         populate_by_name = True
@@ -154,14 +154,6 @@ class ProductResponse(ProductBase):
     category: Optional[CategorySummary] = None
     images: List[ProductImageSummary] = Field(default_factory=list)
 
-    @field_validator("images", mode="before")
-    @classmethod
-    def resolve_dynamic_images(cls, v):
-        """Convert SQLAlchemy dynamic relationship (AppenderQuery) to a list."""
-        if hasattr(v, "all"):
-            return list(v.all())
-        return v or []
-
     @computed_field
     @property
     def final_price(self) -> Decimal:
@@ -225,6 +217,9 @@ class ProductListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[UUID] = Field(
+        None, description="Pass as `cursor` to fetch the next page (keyset pagination)"
+    )
 
 
 class ProductSearchRequest(BaseModel):
@@ -232,8 +227,8 @@ class ProductSearchRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=200, description="Search query")
     brand_id: Optional[UUID] = Field(None, alias="brandId", description="Filter by brand ID")
     category_id: Optional[UUID] = Field(None, alias="categoryId", description="Filter by category ID")
-    min_price: Optional[float] = Field(None, ge=0, alias="minPrice", description="Minimum price filter")
-    max_price: Optional[float] = Field(None, ge=0, alias="maxPrice", description="Maximum price filter")
+    min_price: Optional[Decimal] = Field(None, ge=0, alias="minPrice", description="Minimum price filter")
+    max_price: Optional[Decimal] = Field(None, ge=0, alias="maxPrice", description="Maximum price filter")
     skip: int = Field(0, ge=0, description="Number of records to skip")
     limit: int = Field(20, ge=1, le=100, description="Maximum number of results")
 
@@ -247,6 +242,9 @@ class ProductSearchResponse(BaseModel):
     skip: int
     limit: int
     query: str
+    next_cursor: Optional[UUID] = Field(
+        None, description="Pass as `cursor` to fetch the next page (keyset pagination)"
+    )
 
     model_config = {"populate_by_name": True}
 
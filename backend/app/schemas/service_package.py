@@ -118,6 +118,7 @@ class ServicePackageListResponse(BaseModel):
     page: int
     page_size: int
     total_pages: int
+    next_cursor: Optional[UUID] = None
 
 
 class TransportLocationResponse(BaseModel):
@@ -10,8 +10,8 @@ from datetime import time as time_type
 from typing import Optional
 from uuid import UUID
 from decimal import Decimal, ROUND_UP
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_, func
+from sqlalchemy.orm import Session, raiseload
+from sqlalchemy import and_, or_, func, tuple_
 from sqlalchemy.exc import IntegrityError
 
 from app.models.booking import Booking
@@ -380,34 +380,56 @@ def get_user_bookings(
     user_id: UUID,
     skip: int = 0,
     limit: int = 100,
-    status: Optional[str] = None
-) -> tuple[list[Booking], int]:
+    status: Optional[str] = None,
+    cursor: Optional[UUID] = None,
+    include_total: bool = True
+) -> tuple[list[Booking], Optional[int]]:
     """
     Get list of bookings for a specific user with pagination and filters
 
     Args:
         db: Database session
         user_id: User ID to get bookings for
-        skip: Number of records to skip
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
         status: Filter by status (optional)
+        cursor: ID of the last booking already seen; when given, returns the
+            bookings that follow it in sort order (keyset pagination)
+        include_total: Whether to run the COUNT query for the total
 
     Returns:
-        Tuple of (bookings list, total count)
+        Tuple of (bookings list, total count or None if not requested)
+
+    Raises:
+        ValueError: If the cursor does not match one of the user's bookings
     """
-    query = db.query(Booking).filter(Booking.user_id == user_id)
+    # Listings serialize scalar columns only; fail loudly on any lazy load
+    query = db.query(Booking).options(raiseload("*")).filter(Booking.user_id == user_id)
 
     # Apply status filter
     if status:
         query = query.filter(Booking.status == status.lower())
 
     # Get total count
-    total = query.count()
+    total = query.count() if include_total else None
+
+    if cursor:
+        anchor = db.query(
+            Booking.booking_date, Booking.booking_time, Booking.id
+        ).filter(Booking.id == cursor, Booking.user_id == user_id).first()
+        if not anchor:
+            raise ValueError("Invalid pagination cursor")
+        # Seek past the cursor instead of scanning and discarding OFFSET rows
+        query = query.filter(
+            tuple_(Booking.booking_date, Booking.booking_time, Booking.id) < tuple_(*anchor)
+        )
+        skip = 0
 
     # Apply sorting and pagination
     bookings = query.order_by(
         Booking.booking_date.desc(),
-        Booking.booking_time.desc()
+        Booking.booking_time.desc(),
+        Booking.id.desc()
     ).offset(skip).limit(limit).all()
 
     return bookings, total
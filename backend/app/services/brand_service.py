@@ -5,10 +5,11 @@ Business logic for brand management
 from typing import Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import or_, tuple_
 
 from app.models.product import Brand
 from app.schemas.brand import BrandCreate, BrandUpdate, slugify
+from app.services import product_service
 
 
 def get_brand_by_id(db: Session, brand_id: UUID) -> Optional[Brand]:
@@ -31,20 +32,28 @@ def get_brands(
     skip: int = 0,
     limit: int = 100,
     is_active: Optional[bool] = None,
-    search: Optional[str] = None
-) -> tuple[list[Brand], int]:
+    search: Optional[str] = None,
+    cursor: Optional[UUID] = None,
+    include_total: bool = True
+) -> tuple[list[Brand], Optional[int]]:
     """
     Get list of brands with pagination and filters
 
     Args:
         db: Database session
-        skip: Number of records to skip
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
         is_active: Filter by active status
         search: Search in name and description
+        cursor: ID of the last brand already seen; when given, returns the
+            brands that follow it in name order (keyset pagination)
+        include_total: Whether to run the COUNT query for the total
 
     Returns:
-        Tuple of (brands list, total count)
+        Tuple of (brands list, total count or None if not requested)
+
+    Raises:
+        ValueError: If the cursor does not match an existing brand
     """
     query = db.query(Brand)
 
@@ -62,10 +71,18 @@ def get_brands(
         )
 
     # Get total count
-    total = query.count()
+    total = query.count() if include_total else None
+
+    if cursor:
+        anchor = db.query(Brand.name, Brand.id).filter(Brand.id == cursor).first()
+        if not anchor:
+            raise ValueError("Invalid pagination cursor")
+        # Seek past the cursor instead of scanning and discarding OFFSET rows
+        query = query.filter(tuple_(Brand.name, Brand.id) > tuple_(*anchor))
+        skip = 0
 
     # Apply pagination
-    brands = query.order_by(Brand.name).offset(skip).limit(limit).all()
+    brands = query.order_by(Brand.name, Brand.id).offset(skip).limit(limit).all()
 
     return brands, total
 
@@ -110,6 +127,7 @@ def create_brand(db: Session, brand_data: BrandCreate) -> Brand:
 
     db.add(brand)
     db.commit()
+    product_service.listing_cache.clear()
     db.refresh(brand)
 
     return brand
@@ -159,6 +177,7 @@ def update_brand(
         brand.is_active = brand_data.is_active
 
     db.commit()
+    product_service.listing_cache.clear()
     db.refresh(brand)
 
     return brand
@@ -191,5 +210,6 @@ def delete_brand(db: Session, brand_id: UUID) -> bool:
 
     db.delete(brand)
     db.commit()
+    product_service.listing_cache.clear()
 
     return True
@@ -9,6 +9,7 @@ from sqlalchemy import or_
 
 from app.models.product import Category
 from app.schemas.category import CategoryCreate, CategoryUpdate, slugify, CategoryWithSubcategories
+from app.services import product_service
 
 
 def get_category_by_id(db: Session, category_id: UUID) -> Optional[Category]:
@@ -177,6 +178,7 @@ def create_category(db: Session, category_data: CategoryCreate) -> Category:
 
     db.add(category)
     db.commit()
+    product_service.listing_cache.clear()
     db.refresh(category)
 
     return category
@@ -246,6 +248,7 @@ def update_category(
         category.is_active = category_data.is_active
 
     db.commit()
+    product_service.listing_cache.clear()
     db.refresh(category)
 
     return category
@@ -279,6 +282,7 @@ def delete_category(db: Session, category_id: UUID) -> bool:
     # Delete will cascade to subcategories due to ondelete="CASCADE"
     db.delete(category)
     db.commit()
+    product_service.listing_cache.clear()
 
     return True
 
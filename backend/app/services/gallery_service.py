@@ -3,11 +3,42 @@ from datetime import datetime
 from typing import List, Optional
 from uuid import UUID
 
-from sqlalchemy import and_, func
+from sqlalchemy import Row, and_, false, func, literal, or_
 from sqlalchemy.orm import Session
 
+from app.core.cache import ListingCache
 from app.models.content import GalleryPost
 
+# Public gallery listing responses. Cleared whenever posts are created,
+# updated, deleted or synced; the TTL also bounds how long a scheduled post
+# waits to appear.
+listing_cache = ListingCache("gallery")
+
+
+# Feed sort keys. The featured flag and display order are nullable, so they
+# are read and sorted as their column defaults (not featured, order 0); a raw
+# NULL would fail the response schema and fall outside every seek comparison.
+# The published_at <= now() filter already excludes NULL publication dates.
+_FEED_FEATURED = func.coalesce(GalleryPost.is_featured, false())
+_FEED_DISPLAY_ORDER = func.coalesce(GalleryPost.display_order, 0)
+
+# Columns served by the public listing (the fields of GalleryPostResponse).
+# Selecting them as plain rows skips building, instrumenting and
+# identity-mapping an ORM instance per post, and leaves nothing to lazy-load.
+_LISTING_COLUMNS = (
+    GalleryPost.id,
+    GalleryPost.media_type,
+    GalleryPost.media_url,
+    GalleryPost.thumbnail_url,
+    GalleryPost.caption,
+    GalleryPost.tags,
+    GalleryPost.source_type,
+    _FEED_FEATURED.label("is_featured"),
+    _FEED_DISPLAY_ORDER.label("display_order"),
+    GalleryPost.external_permalink,
+    GalleryPost.published_at,
+)
+
 
 def get_published_gallery_posts(
     db: Session,
@@ -15,23 +46,34 @@ def get_published_gallery_posts(
     page_size: int = 20,
     media_type: Optional[str] = None,
     source_type: Optional[str] = None,
-) -> tuple[List[GalleryPost], int]:
+    cursor: Optional[UUID] = None,
+    include_total: bool = True,
+) -> tuple[List[Row], Optional[int]]:
     """
     Get published gallery posts with pagination and filters.
 
     Args:
         db: Database session
-        page: Page number (1-indexed)
+        page: Page number (1-indexed, ignored when cursor is given)
         page_size: Number of items per page
         media_type: Filter by media type ('image' or 'video')
         source_type: Filter by source type ('instagram', 'tiktok', or 'original')
+        cursor: ID of the last post already seen; when given, returns the
+            posts that follow it in feed order (keyset pagination)
+        include_total: Whether to run the COUNT query for the total
 
     Returns:
-        Tuple of (list of gallery posts, total count)
+        Tuple of (list of read-only post rows with the listing columns,
+        total count or None if not requested)
+
+    Raises:
+        ValueError: If the cursor does not match a published post
     """
-    # Build base query - only published posts (published_at <= now)
+    # Build base query - only published posts. The cutoff is the database's
+    # now(), which compares against the timestamptz column in UTC whatever
+    # the server's local time zone.
     query = db.query(GalleryPost).filter(
-        GalleryPost.published_at <= datetime.utcnow()
+        GalleryPost.published_at <= func.now()
     )
 
     # Apply filters
@@ -41,19 +83,65 @@ def get_published_gallery_posts(
     if source_type:
         query = query.filter(GalleryPost.source_type == source_type)
 
-    # Get total count before pagination
-    total = query.count()
+    total = None
+    # The seek filter below narrows the rows, so a cursor page counts the
+    # matching posts separately, before it is applied
+    if include_total and cursor:
+        total = query.count()
+
+    offset = (page - 1) * page_size
+    if cursor:
+        anchor = (
+            query.with_entities(
+                _FEED_FEATURED,
+                _FEED_DISPLAY_ORDER,
+                GalleryPost.published_at,
+                GalleryPost.id,
+            )
+            .filter(GalleryPost.id == cursor)
+            .first()
+        )
+        if not anchor:
+            raise ValueError("Invalid pagination cursor")
+        featured, order, published, post_id = anchor
+        # Bind the flag as a parameter: SQLAlchemy refuses < against a bare True/False
+        featured = literal(featured)
+        # Seek past the cursor instead of scanning and discarding OFFSET rows.
+        # The sort directions are mixed, so spell out the row comparison.
+        query = query.filter(
+            or_(
+                _FEED_FEATURED < featured,
+                and_(_FEED_FEATURED == featured, _FEED_DISPLAY_ORDER > order),
+                and_(
+                    _FEED_FEATURED == featured,
+                    _FEED_DISPLAY_ORDER == order,
+                    or_(
+                        GalleryPost.published_at < published,
+                        and_(GalleryPost.published_at == published, GalleryPost.id < post_id),
+                    ),
+                ),
+            )
+        )
+        offset = 0
 
     # Apply ordering (featured first, then by display_order, then by published_at desc)
     query = query.order_by(
-        GalleryPost.is_featured.desc(),
-        GalleryPost.display_order.asc(),
+        _FEED_FEATURED.desc(),
+        _FEED_DISPLAY_ORDER.asc(),
         GalleryPost.published_at.desc(),
+        GalleryPost.id.desc(),
     )
 
-    # Apply pagination
-    offset = (page - 1) * page_size
-    posts = query.offset(offset).limit(page_size).all()
+    # Apply pagination, reading only the listing columns
+    columns = _LISTING_COLUMNS
+    if include_total and not cursor:
+        # Count the matching posts in the same query with a window function
+        columns += (func.count().over().label("total"),)
+    posts = query.with_entities(*columns).offset(offset).limit(page_size).all()
+
+    if include_total and not cursor:
+        # A page past the end returns no rows to read the count from
+        total = posts[0].total if posts else (query.count() if offset else 0)
 
     return posts, total
 
@@ -65,7 +153,7 @@ def get_gallery_post_by_id(db: Session, post_id: UUID) -> Optional[GalleryPost]:
         .filter(
             and_(
                 GalleryPost.id == post_id,
-                GalleryPost.published_at <= datetime.utcnow(),
+                GalleryPost.published_at <= func.now(),
             )
         )
         .first()
@@ -174,6 +262,7 @@ def create_gallery_post(
 
     db.add(post)
     db.commit()
+    listing_cache.clear()
     db.refresh(post)
 
     return post
@@ -244,6 +333,7 @@ def update_gallery_post(
         post.published_at = published_at
 
     db.commit()
+    listing_cache.clear()
     db.refresh(post)
 
     return post
@@ -266,5 +356,6 @@ def delete_gallery_post(db: Session, post_id: UUID) -> bool:
 
     db.delete(post)
     db.commit()
+    listing_cache.clear()
 
     return True
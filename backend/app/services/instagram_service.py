@@ -10,7 +10,7 @@ from sqlalchemy.orm import Session
 from app.core.database import SessionLocal
 from app.core.encryption import decrypt_value
 from app.models.content import GalleryPost
-from app.services import site_settings_service
+from app.services import gallery_service, site_settings_service
 
 logger = logging.getLogger(__name__)
 
@@ -190,6 +190,7 @@ def sync_instagram_posts(db: Session) -> Dict[str, Any]:
             db.delete(post)
 
     db.commit()
+    gallery_service.listing_cache.clear()
 
     # Update last sync timestamp
     site_settings_service.upsert_setting(
@@ -8,14 +8,14 @@ from typing import List, Optional, Tuple
 from uuid import UUID
 
 from fastapi import BackgroundTasks
-from sqlalchemy import update
+from sqlalchemy import tuple_, update
 from sqlalchemy.orm import Session
 
 from app.models.order import Cart, CartItem, Order, OrderItem
 from app.models.product import Product, ProductVariant
 from app.models.user import User
 from app.schemas.order import DeliveryInfo, GuestInfo, OrderItemCreate
-from app.services import promo_code_service
+from app.services import product_service, promo_code_service
 from app.services.email_service import email_service
 from app.services.order_notifications import schedule_order_notifications
 
@@ -377,6 +377,8 @@ def create_order(
 
     # Commit the entire order (order, items, stock, promo, cart clear) atomically
     db.commit()
+    # The stock decrements change what the public product listings show
+    product_service.listing_cache.clear()
     db.refresh(order)
 
     # Notify the customer and admin. Sends run on background tasks so a slow or
@@ -469,7 +471,7 @@ def get_order_by_number(db: Session, order_number: str) -> Optional[Order]:
 
 
 def get_user_orders(
-    db: Session, user_id: UUID, skip: int = 0, limit: int = 20
+    db: Session, user_id: UUID, skip: int = 0, limit: int = 20, cursor: Optional[UUID] = None
 ) -> Tuple[List[Order], int]:
     """
     Get orders for a user with pagination.
@@ -477,16 +479,33 @@ def get_user_orders(
     Args:
         db: Database session
         user_id: User ID
-        skip: Number of records to skip
+        skip: Number of records to skip (ignored when cursor is given)
         limit: Maximum number of records to return
+        cursor: ID of the last order already seen; when given, returns the
+            orders that follow it, newest first (keyset pagination)
 
     Returns:
         Tuple of (orders list, total count)
+
+    Raises:
+        ValueError: If the cursor does not match one of the user's orders
     """
     query = db.query(Order).filter(Order.user_id == user_id)
 
     total = query.count()
 
-    orders = query.order_by(Order.created_at.desc()).offset(skip).limit(limit).all()
+    if cursor:
+        anchor = db.query(Order.created_at, Order.id).filter(
+            Order.id == cursor, Order.user_id == user_id
+        ).first()
+        if not anchor:
+            raise ValueError("Invalid pagination cursor")
+        # Seek past the cursor instead of scanning and discarding OFFSET rows
+        query = query.filter(tuple_(Order.created_at, Order.id) < tuple_(*anchor))
+        skip = 0
+
+    orders = (
+        query.order_by(Order.created_at.desc(), Order.id.desc()).offset(skip).limit(limit).all()
+    )
 
     return orders, total
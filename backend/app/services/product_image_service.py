@@ -9,6 +9,7 @@ from sqlalchemy import and_
 
 from app.models.product import ProductImage, Product
 from app.schemas.product_image import ProductImageCreate, ProductImageUpdate
+from app.services import product_service
 from app.services.file_storage_service import file_storage
 
 
@@ -95,6 +96,7 @@ def create_product_image(
 
     db.add(product_image)
     db.commit()
+    product_service.listing_cache.clear()
     db.refresh(product_image)
 
     return product_image
@@ -182,6 +184,7 @@ def update_product_image(
         product_image.display_order = image_data.display_order
 
     db.commit()
+    product_service.listing_cache.clear()
     db.refresh(product_image)
 
     return product_image
@@ -208,6 +211,7 @@ def set_primary_image(db: Session, image_id: UUID) -> Optional[ProductImage]:
     # Set this image as primary
     product_image.is_primary = True
     db.commit()
+    product_service.listing_cache.clear()
     db.refresh(product_image)
 
     return product_image
@@ -252,6 +256,7 @@ def delete_product_image(db: Session, image_id: UUID, delete_from_storage: bool
     # Delete from database
     db.delete(product_image)
     db.commit()
+    product_service.listing_cache.clear()
 
     return True
 
@@ -287,6 +292,7 @@ def reorder_product_images(
         product_image.display_order = display_order
 
     db.commit()
+    product_service.listing_cache.clear()
 
     return get_product_images(db, product_id)
 
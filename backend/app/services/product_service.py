@@ -2,14 +2,21 @@
 Product service
 Business logic for product management
 """
+from decimal import Decimal
 from typing import Optional
 from uuid import UUID
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import or_, and_, any_
+from sqlalchemy.orm import Session, contains_eager, joinedload, selectinload
+from sqlalchemy import func, or_, and_, any_, tuple_
 
+from app.core.cache import ListingCache
 from app.models.product import Product, Brand, Category
 from app.schemas.product import ProductCreate, ProductUpdate, slugify
 
+# Public /products and /products/featured responses. Cleared after every
+# commit that writes listed data: products, their images, brands, categories
+# and inventory changes at checkout.
+listing_cache = ListingCache("products")
+
 
 def get_product_by_id(db: Session, product_id: UUID, load_relations: bool = True) -> Optional[Product]:
     """
@@ -78,7 +85,7 @@ def get_product_detail_by_slug(db: Session, slug: str) -> Optional[dict]:
         return None
 
     # Load dynamic relationships separately
-    images = product.images.all() if product.images else []
+    images = list(product.images)
     videos = product.videos.all() if product.videos else []
     variants = product.variants.all() if product.variants else []
 
@@ -114,7 +121,8 @@ def get_product_detail_by_slug(db: Session, slug: str) -> Optional[dict]:
     # Get related products (same category or brand, excluding current product)
     related_query = db.query(Product).options(
         joinedload(Product.brand),
-        joinedload(Product.category)
+        joinedload(Product.category),
+        selectinload(Product.images),
     ).filter(
         Product.id != product.id,
         Product.is_active == True,
@@ -146,6 +154,38 @@ def get_product_detail_by_slug(db: Session, slug: str) -> Optional[dict]:
     }
 
 
+def _seek_after(db: Session, query, sort_field, descending: bool, cursor: UUID):
+    """
+    Restrict a product query to the rows that follow the cursor product in
+    (sort_field, id) order, so a page is found by seeking instead of OFFSET
+
+    Raises:
+        ValueError: If the cursor is not a product with a value in sort_field
+    """
+    anchor = db.query(sort_field, Product.id).filter(Product.id == cursor).first()
+    if not anchor or anchor[0] is None:
+        raise ValueError("Invalid pagination cursor")
+
+    key, anchor = tuple_(sort_field, Product.id), tuple_(*anchor)
+    return query.filter(key < anchor if descending else key > anchor)
+
+
+def _fetch_page(query, skip: int, limit: int, with_total: bool) -> tuple[list[Product], Optional[int]]:
+    """
+    Fetch one page of an ordered product query, and when with_total is set
+    also the number of matching products, counted in the same statement with
+    a window function instead of a separate COUNT query
+    """
+    if not with_total:
+        return query.offset(skip).limit(limit).all(), None
+
+    rows = query.add_columns(func.count().over().label("total")).offset(skip).limit(limit).all()
+    if rows:
+        return [row[0] for row in rows], rows[0].total
+    # A page past the end returns no rows to read the count from
+    return [], (query.count() if skip else 0)
+
+
 def get_products(
     db: Session,
     skip: int = 0,
@@ -155,12 +195,13 @@ def get_products(
     brand_id: Optional[UUID] = None,
     category_id: Optional[UUID] = None,
     search: Optional[str] = None,
-    min_price: Optional[float] = None,
-    max_price: Optional[float] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
     in_stock_only: bool = False,
     load_relations: bool = True,
     sort_by: str = "created_at",
-    sort_order: str = "desc"
+    sort_order: str = "desc",
+    cursor: Optional[UUID] = None,
 ) -> tuple[list[Product], int]:
     """
     Get list of products with pagination and filters
@@ -180,17 +221,24 @@ def get_products(
         load_relations: Whether to eagerly load brand and category
         sort_by: Sort field (created_at, base_price, title, etc.)
         sort_order: Sort order (asc or desc)
+        cursor: ID of the last product already seen; when given, skip is
+            ignored and the products that follow it are returned
 
     Returns:
         Tuple of (products list, total count)
+
+    Raises:
+        ValueError: If the cursor is invalid
     """
     query = db.query(Product)
 
-    # Eagerly load relations if requested
+    # Eagerly load relations if requested; images are one-to-many, so they
+    # come in one extra IN query for the page rather than multiplying rows
     if load_relations:
         query = query.options(
             joinedload(Product.brand),
             joinedload(Product.category),
+            selectinload(Product.images),
         )
 
     # Apply filters
@@ -225,22 +273,26 @@ def get_products(
     if in_stock_only:
         query = query.filter(Product.inventory_count > 0)
 
-    # Get total count
-    total = query.count()
-
     # Determine sort field
     sort_field = getattr(Product, sort_by, Product.created_at)
+    descending = sort_order != "asc"
+
+    if cursor:
+        # The seek filter narrows the rows, so count the matches before it
+        total = query.count()
+        query = _seek_after(db, query, sort_field, descending, cursor)
+        skip = 0
 
-    # Apply sorting
-    if sort_order == "asc":
-        query = query.order_by(sort_field.asc())
+    # Apply sorting, with id as a tiebreaker so pages don't overlap
+    if descending:
+        query = query.order_by(sort_field.desc(), Product.id.desc())
     else:
-        query = query.order_by(sort_field.desc())
+        query = query.order_by(sort_field.asc(), Product.id.asc())
 
     # Apply pagination
-    products = query.offset(skip).limit(limit).all()
+    products, page_total = _fetch_page(query, skip, limit, with_total=not cursor)
 
-    return products, total
+    return products, total if cursor else page_total
 
 
 def create_product(db: Session, product_data: ProductCreate) -> Product:
@@ -313,6 +365,7 @@ def create_product(db: Session, product_data: ProductCreate) -> Product:
 
     db.add(product)
     db.commit()
+    listing_cache.clear()
     db.refresh(product)
 
     # Load relations
@@ -411,6 +464,7 @@ def update_product(
         product.meta_description = product_data.meta_description
 
     db.commit()
+    listing_cache.clear()
     db.refresh(product)
 
     # Load relations
@@ -445,6 +499,7 @@ def delete_product(db: Session, product_id: UUID) -> bool:
     # Delete will cascade to images, videos, and variants due to cascade settings
     db.delete(product)
     db.commit()
+    listing_cache.clear()
 
     return True
 
@@ -474,6 +529,7 @@ def update_inventory(db: Session, product_id: UUID, quantity_delta: int) -> Opti
 
     product.inventory_count = new_inventory
     db.commit()
+    listing_cache.clear()
     db.refresh(product)
 
     return get_product_by_id(db, product_id, load_relations=True)
@@ -484,10 +540,11 @@ def search_products(
     query: str,
     brand_id: Optional[UUID] = None,
     category_id: Optional[UUID] = None,
-    min_price: Optional[float] = None,
-    max_price: Optional[float] = None,
+    min_price: Optional[Decimal] = None,
+    max_price: Optional[Decimal] = None,
     skip: int = 0,
     limit: int = 20,
+    cursor: Optional[UUID] = None,
 ) -> tuple[list[Product], int]:
     """
     Search products by title, description, brand name, or category name.
@@ -501,20 +558,33 @@ def search_products(
         max_price: Maximum price filter
         skip: Number of records to skip
         limit: Maximum number of records to return
+        cursor: ID of the last product already seen; when given, skip is
+            ignored and the products that follow it are returned
 
     Returns:
         Tuple of (products list, total count)
+
+    Raises:
+        ValueError: If the cursor is invalid
     """
-    # Start with base query
-    db_query = db.query(Product).options(
-        joinedload(Product.brand),
-        joinedload(Product.category)
+    # Start with base query. The brand and category joins that the search
+    # filter needs also populate the relationships, rather than joinedload
+    # adding a second, aliased join to each table.
+    db_query = (
+        db.query(Product)
+        .outerjoin(Product.brand)
+        .outerjoin(Product.category)
+        .options(
+            contains_eager(Product.brand),
+            contains_eager(Product.category),
+            selectinload(Product.images),
+        )
     )
 
     # Apply search filter
     if query and query.strip():
         search_term = f"%{query.lower()}%"
-        db_query = db_query.outerjoin(Product.brand).outerjoin(Product.category).filter(
+        db_query = db_query.filter(
             or_(
                 Product.title.ilike(search_term),
                 Product.description.ilike(search_term),
@@ -540,13 +610,17 @@ def search_products(
     # Only show active products
     db_query = db_query.filter(Product.is_active == True)
 
-    # Get total count
-    total = db_query.count()
+    if cursor:
+        # The seek filter narrows the rows, so count the matches before it
+        total = db_query.count()
+        db_query = _seek_after(db, db_query, Product.created_at, True, cursor)
+        skip = 0
 
-    # Apply pagination and order by relevance (title match first, then created_at)
-    products = db_query.order_by(Product.created_at.desc()).offset(skip).limit(limit).all()
+    # Apply pagination, newest first (id breaks ties between pages)
+    db_query = db_query.order_by(Product.created_at.desc(), Product.id.desc())
+    products, page_total = _fetch_page(db_query, skip, limit, with_total=not cursor)
 
-    return products, total
+    return products, total if cursor else page_total
 
 
 def get_product_suggestions(
@@ -570,10 +644,10 @@ def get_product_suggestions(
 
     search_term = f"%{query.lower()}%"
 
-    # Search in product titles and brands
-    products = (
-        db.query(Product)
-        .options(joinedload(Product.brand))
+    # Search in product titles and brands. This runs on every keystroke, so
+    # select just the four fields returned instead of loading Product rows.
+    rows = (
+        db.query(Product.id, Product.title, Product.slug, Brand.name)
         .outerjoin(Product.brand)
         .filter(
             and_(
@@ -590,13 +664,12 @@ def get_product_suggestions(
     )
 
     # Format suggestions
-    suggestions = []
-    for product in products:
-        suggestions.append({
-            "id": str(product.id),
-            "title": product.title,
-            "slug": product.slug,
-            "brand_name": product.brand.name if product.brand else None,
-        })
-
-    return suggestions
+    return [
+        {
+            "id": str(product_id),
+            "title": title,
+            "slug": slug,
+            "brand_name": brand_name,
+        }
+        for product_id, title, slug, brand_name in rows
+    ]
@@ -4,7 +4,7 @@ from typing import Optional, Tuple
 from uuid import UUID
 
 from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
+from sqlalchemy import and_, func, update
 
 from app.models.content import Review
 from app.models.order import Order, OrderItem
@@ -309,12 +309,17 @@ def increment_helpful_count(db: Session, review_id: UUID) -> Tuple[bool, str]:
     Returns:
         Tuple of (success, message)
     """
-    review = db.query(Review).filter(Review.id == review_id).first()
+    # Increment in the database: a read-modify-write would let two concurrent
+    # votes read the same count and lose one of them under READ COMMITTED.
+    result = db.execute(
+        update(Review)
+        .where(Review.id == review_id)
+        .values(helpful_count=Review.helpful_count + 1)
+    )
 
-    if not review:
+    if result.rowcount == 0:
         return False, "Review not found"
 
-    review.helpful_count += 1
     db.commit()
 
     return True, "Review marked as helpful"
@@ -331,14 +336,20 @@ def mark_review_helpful(db: Session, review_id: UUID) -> Optional[Review]:
     Returns:
         Updated review or None if not found
     """
-    review = db.query(Review).filter(Review.id == review_id).first()
+    # Atomic increment as above; RETURNING hands back the updated review in
+    # the same round trip instead of a SELECT before it. The commit still
+    # expires the instance, so it is reloaded when the caller reads it.
+    review = db.execute(
+        update(Review)
+        .where(Review.id == review_id)
+        .values(helpful_count=Review.helpful_count + 1)
+        .returning(Review)
+    ).scalar_one_or_none()
 
     if not review:
         return None
 
-    review.helpful_count += 1
     db.commit()
-    db.refresh(review)
 
     return review
 
@@ -354,31 +365,30 @@ def get_product_rating_summary(db: Session, product_id: UUID) -> dict:
     Returns:
         Dictionary with total_reviews, average_rating, rating_distribution
     """
-    # Get all approved reviews for the product
-    reviews = (
-        db.query(Review)
+    # Count approved reviews per rating in the database instead of loading
+    # every review row
+    counts = (
+        db.query(Review.rating, func.count())
         .filter(Review.product_id == product_id, Review.is_approved == True)
+        .group_by(Review.rating)
         .all()
     )
 
-    total_reviews = len(reviews)
+    rating_distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
+    rating_distribution.update(counts)
+    total_reviews = sum(rating_distribution.values())
 
     if total_reviews == 0:
         return {
             "total_reviews": 0,
             "average_rating": 0.0,
-            "rating_distribution": {1: 0, 2: 0, 3: 0, 4: 0, 5: 0},
+            "rating_distribution": rating_distribution,
         }
 
     # Calculate average rating
-    total_rating = sum(review.rating for review in reviews)
+    total_rating = sum(rating * count for rating, count in rating_distribution.items())
     average_rating = total_rating / total_reviews
 
-    # Calculate rating distribution
-    rating_distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-    for review in reviews:
-        rating_distribution[review.rating] += 1
-
     return {
         "total_reviews": total_reviews,
         "average_rating": round(average_rating, 1),
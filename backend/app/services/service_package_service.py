@@ -5,8 +5,9 @@ Business logic for service package management
 from typing import BinaryIO, Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_, tuple_
 
+from app.core.cache import ListingCache
 from app.models.service import ServicePackage
 from app.schemas.service_package import ServicePackageCreate, ServicePackageUpdate
 from app.services.file_storage_service import file_storage
@@ -14,6 +15,10 @@ from app.services.file_storage_service import file_storage
 # Maximum number of packages that can be featured on the homepage at once
 MAX_FEATURED_PACKAGES = 3
 
+# Public service package listing responses. Cleared whenever a package or
+# its image changes.
+listing_cache = ListingCache("service_packages")
+
 
 def _assert_featured_slot_available(db: Session, exclude_id: Optional[UUID] = None) -> None:
     """Raise ValueError if all homepage featured slots are already taken."""
@@ -44,7 +49,8 @@ def get_packages(
     package_type: Optional[str] = None,
     is_active: Optional[bool] = None,
     is_featured: Optional[bool] = None,
-    search: Optional[str] = None
+    search: Optional[str] = None,
+    cursor: Optional[UUID] = None
 ) -> tuple[list[ServicePackage], int]:
     """
     Get list of service packages with pagination and filters
@@ -57,9 +63,14 @@ def get_packages(
         is_active: Filter by active status
         is_featured: Filter by featured status
         search: Search in name and description
+        cursor: ID of the last package already seen; when given, skip is
+            ignored and the packages that follow it are returned
 
     Returns:
         Tuple of (packages list, total count)
+
+    Raises:
+        ValueError: If the cursor is invalid
     """
     query = db.query(ServicePackage)
 
@@ -82,16 +93,33 @@ def get_packages(
             )
         )
 
-    # Get total count
-    total = query.count()
-
-    # Apply pagination and ordering
-    packages = query.order_by(
-        ServicePackage.display_order,
-        ServicePackage.name
+    # Packages are listed by display_order, then name, with id as a
+    # tiebreaker so pages don't overlap
+    sort_columns = (ServicePackage.display_order, ServicePackage.name, ServicePackage.id)
+
+    if cursor:
+        anchor = db.query(*sort_columns).filter(ServicePackage.id == cursor).first()
+        if not anchor or anchor.display_order is None:
+            raise ValueError("Invalid pagination cursor")
+        # The seek filter narrows the rows, so count the matches before it
+        total = query.count()
+        # Seek past the cursor instead of scanning and discarding OFFSET rows
+        packages = query.filter(
+            tuple_(*sort_columns) > tuple_(*anchor)
+        ).order_by(*sort_columns).limit(limit).all()
+        return packages, total
+
+    # Apply ordering and pagination, counting the matching packages in the
+    # same statement with a window function instead of a separate COUNT query
+    rows = query.add_columns(func.count().over().label("total")).order_by(
+        *sort_columns
     ).offset(skip).limit(limit).all()
 
-    return packages, total
+    if not rows:
+        # A page past the end returns no rows to read the count from
+        return [], (query.count() if skip else 0)
+
+    return [row[0] for row in rows], rows[0].total
 
 
 def get_package_types(db: Session) -> list[str]:
@@ -156,6 +184,7 @@ def create_package(db: Session, package_data: ServicePackageCreate) -> ServicePa
 
     db.add(package)
     db.commit()
+    listing_cache.clear()
     db.refresh(package)
 
     return package
@@ -239,6 +268,7 @@ def update_package(
         package.display_order = package_data.display_order
 
     db.commit()
+    listing_cache.clear()
     db.refresh(package)
 
     return package
@@ -271,6 +301,7 @@ def delete_package(db: Session, package_id: UUID) -> bool:
 
     db.delete(package)
     db.commit()
+    listing_cache.clear()
 
     return True
 
@@ -313,6 +344,7 @@ def upload_package_image(
 
     package.image_url = image_url
     db.commit()
+    listing_cache.clear()
     db.refresh(package)
 
     # Best-effort cleanup of the previous image; never block the response on it.
@@ -337,6 +369,7 @@ def delete_package_image(db: Session, package_id: UUID) -> Optional[ServicePacka
     old_image_url = package.image_url
     package.image_url = None
     db.commit()
+    listing_cache.clear()
     db.refresh(package)
 
     if old_image_url:
@@ -2,17 +2,44 @@
 from typing import List, Optional, Tuple
 from uuid import UUID
 
+from sqlalchemy import Row
 from sqlalchemy.orm import Session
 
+from app.core.cache import ListingCache
 from app.models.content import Testimonial
 
+# Public testimonial listing responses. Cleared whenever a testimonial is
+# created, updated (including approval) or deleted.
+listing_cache = ListingCache("testimonials")
+
+
+# Columns served by the public listing (the fields of TestimonialResponse).
+# Selecting them as plain rows skips building, instrumenting and
+# identity-mapping an ORM instance per testimonial, and the related service
+# and product are only ever exposed by their foreign-key ids.
+_LISTING_COLUMNS = (
+    Testimonial.id,
+    Testimonial.customer_name,
+    Testimonial.customer_photo_url,
+    Testimonial.location,
+    Testimonial.rating,
+    Testimonial.testimonial_text,
+    Testimonial.related_service_id,
+    Testimonial.related_product_id,
+    Testimonial.is_featured,
+    Testimonial.is_approved,
+    Testimonial.display_order,
+    Testimonial.created_at,
+    Testimonial.updated_at,
+)
+
 
 def get_approved_testimonials(
     db: Session,
     featured_only: bool = False,
     related_service_id: Optional[UUID] = None,
     related_product_id: Optional[UUID] = None,
-) -> List[Testimonial]:
+) -> List[Row]:
     """
     Get approved testimonials with optional filters.
 
@@ -23,7 +50,7 @@ def get_approved_testimonials(
         related_product_id: Filter by product ID
 
     Returns:
-        List of approved testimonials
+        List of read-only rows with the listing columns of approved testimonials
     """
     # Build base query - only approved testimonials
     query = db.query(Testimonial).filter(Testimonial.is_approved == True)
@@ -45,7 +72,7 @@ def get_approved_testimonials(
         Testimonial.created_at.desc(),
     )
 
-    return query.all()
+    return query.with_entities(*_LISTING_COLUMNS).all()
 
 
 def get_testimonial_by_id(db: Session, testimonial_id: UUID) -> Optional[Testimonial]:
@@ -165,6 +192,7 @@ def create_testimonial(
 
     db.add(testimonial)
     db.commit()
+    listing_cache.clear()
     db.refresh(testimonial)
 
     return testimonial
@@ -223,6 +251,7 @@ def update_testimonial(
         testimonial.display_order = display_order
 
     db.commit()
+    listing_cache.clear()
     db.refresh(testimonial)
 
     return testimonial
@@ -246,5 +275,6 @@ def delete_testimonial(db: Session, testimonial_id: UUID) -> bool:
 
     db.delete(testimonial)
     db.commit()
+    listing_cache.clear()
 
     return True
@@ -5,7 +5,7 @@ Business logic for user management, guest users, and data linking
 from typing import Optional
 from uuid import UUID
 from sqlalchemy.orm import Session
-from sqlalchemy import or_
+from sqlalchemy import func, or_, select, update
 
 from app.models.user import User
 from app.models.order import Order, Cart
@@ -79,34 +79,38 @@ def link_guest_data_to_user(
     if not user:
         raise ValueError(f"User with ID {user_id} not found")
 
-    # Find all guest orders with this email
-    guest_orders = db.query(Order).filter(
-        Order.user_id == None,  # Guest orders have NULL user_id
-        Order.guest_email == guest_email
-    ).all()
-
-    # Find all guest bookings with this email
-    guest_bookings = db.query(Booking).filter(
-        Booking.user_id == None,  # Guest bookings have NULL user_id
-        Booking.guest_email == guest_email
-    ).all()
+    # Link guest orders and bookings with this email in a single statement:
+    # both UPDATEs run as data-modifying CTEs and the outer SELECT counts the
+    # rows each one touched, so linking costs one round trip. Both lookups
+    # are served by the guest_email indexes; guest rows have NULL user_id,
+    # which also keeps already-linked rows from being reassigned. updated_at
+    # is set server-side: the models' Python onupdate default would emit the
+    # same bind parameter in both CTEs, which SQLAlchemy refuses to compile.
+    linked_orders = (
+        update(Order)
+        .where(Order.user_id == None, Order.guest_email == guest_email)
+        .values(user_id=user_id, updated_at=func.now())
+        .returning(Order.id)
+        .cte("linked_orders")
+    )
+    linked_bookings = (
+        update(Booking)
+        .where(Booking.user_id == None, Booking.guest_email == guest_email)
+        .values(user_id=user_id, updated_at=func.now())
+        .returning(Booking.id)
+        .cte("linked_bookings")
+    )
+    orders_linked, bookings_linked = db.execute(
+        select(
+            select(func.count()).select_from(linked_orders).scalar_subquery(),
+            select(func.count()).select_from(linked_bookings).scalar_subquery(),
+        )
+    ).one()
 
     # Note: Carts are user-only (no guest carts in the system)
     # The Cart model requires user_id and doesn't support guest_email
     guest_carts = []
 
-    # Link orders to user
-    orders_linked = 0
-    for order in guest_orders:
-        order.user_id = user_id
-        orders_linked += 1
-
-    # Link bookings to user
-    bookings_linked = 0
-    for booking in guest_bookings:
-        booking.user_id = user_id
-        bookings_linked += 1
-
     # Link carts to user
     carts_linked = 0
     for cart in guest_carts:
@@ -7,7 +7,7 @@ from decimal import Decimal
 from typing import Generator
 from uuid import uuid4
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, Session
 from faker import Faker
 
@@ -50,6 +50,19 @@ engine = create_engine(
     connect_args={"check_same_thread": False}
 )
 
+
+# pysqlite defers BEGIN and commits on its own around DDL, which breaks
+# SAVEPOINTs; let SQLAlchemy emit BEGIN itself so the per-test rollback holds
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
+
 # Create test session
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
@@ -61,37 +74,62 @@ fake = Faker()
 # Base Fixtures
 # ============================================================================
 
+@pytest.fixture(scope="session")
+def db_schema():
+    """
+    Create the database schema once for the whole test run.
+    """
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+
 @pytest.fixture(scope="function")
-def db() -> Generator[Session, None, None]:
+def db(db_schema) -> Generator[Session, None, None]:
     """
-    Create a fresh database for each test.
+    Create a database session for each test, isolated by transaction rollback.
+
+    The session joins an outer transaction through a SAVEPOINT, so commits
+    made during the test are discarded when the outer transaction is rolled
+    back, without dropping and recreating the tables per test.
 
     Note: This uses SQLite by default for speed. For full feature testing
     with ARRAY, JSONB, and UUID columns, configure PostgreSQL test database.
     """
-    Base.metadata.create_all(bind=engine)
-    db_session = TestingSessionLocal()
+    connection = db_schema.connect()
+    transaction = connection.begin()
+    db_session = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db_session
     finally:
         db_session.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
+
+
+@pytest.fixture(scope="session")
+def app_client() -> Generator[TestClient, None, None]:
+    """
+    Create one test client for the whole run.
+
+    Starting the app happens once here; the per-test ``client`` fixture
+    only swaps the database override.
+    """
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture(scope="function")
-def client(db: Session) -> Generator[TestClient, None, None]:
+def client(app_client: TestClient, db: Session) -> Generator[TestClient, None, None]:
     """
-    Create a test client with database dependency override.
+    Provide the shared test client with database dependency override.
     """
     def override_get_db():
-        try:
-            yield db
-        finally:
-            db.close()
+        yield db
 
     app.dependency_overrides[get_db] = override_get_db
-    with TestClient(app) as test_client:
-        yield test_client
+    app_client.cookies.clear()
+    yield app_client
     app.dependency_overrides.clear()
 
 
@@ -1,14 +1,20 @@
 """
 Pytest configuration and fixtures
 """
+import contextlib
 import pytest
+import pytest_asyncio
 import os
+import httpx
+from datetime import timedelta
+from uuid import UUID
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event, text
 from sqlalchemy.orm import sessionmaker
 
 from app.main import app
 from app.core.database import Base, get_db
+from app.services import gallery_service, product_service, service_package_service, testimonial_service
 from app.models.user import User
 # Import all models to ensure they're registered with SQLAlchemy
 from app.models.product import Brand, Category, Product, ProductImage, ProductVideo, ProductVariant
@@ -24,31 +30,117 @@ from app.core.config import settings
 
 TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", settings.DATABASE_URL)
 
+# Under pytest-xdist every worker builds its tables in its own schema, so
+# parallel drop_all/create_all and committed module fixtures don't collide
+XDIST_WORKER = os.getenv("PYTEST_XDIST_WORKER")
+TEST_SCHEMA = f"test_{XDIST_WORKER}" if XDIST_WORKER else None
+
 engine = create_engine(TEST_DATABASE_URL)
+
+
+@event.listens_for(engine, "connect")
+def _configure_test_connection(dbapi_connection, connection_record):
+    """Don't wait for the WAL flush on commit; test data is disposable"""
+    cursor = dbapi_connection.cursor()
+    cursor.execute("SET synchronous_commit TO off")
+    if TEST_SCHEMA:
+        cursor.execute(f"SET search_path TO {TEST_SCHEMA}")
+    cursor.close()
+    # Commit so a later rollback of the first transaction can't undo the SET
+    dbapi_connection.commit()
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
 
-@pytest.fixture(scope="function")
-def db_session():
-    """Create a fresh database session for each test"""
+@pytest.fixture(scope="session")
+def db_schema():
+    """Create the database schema once for the whole test run (per xdist worker)"""
+    if TEST_SCHEMA:
+        with engine.begin() as connection:
+            connection.execute(text(f"CREATE SCHEMA IF NOT EXISTS {TEST_SCHEMA}"))
+    Base.metadata.drop_all(bind=engine)
     Base.metadata.create_all(bind=engine)
-    db = TestingSessionLocal()
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+    if TEST_SCHEMA:
+        with engine.begin() as connection:
+            connection.execute(text(f"DROP SCHEMA IF EXISTS {TEST_SCHEMA} CASCADE"))
+
+
+@pytest.fixture(scope="function")
+def db_session(db_schema):
+    """
+    Create a database session for each test, isolated by transaction rollback
+
+    The session is bound to a connection with an open outer transaction and
+    joins it through a SAVEPOINT, so commits made by the test (or by the
+    endpoints it calls) only release the SAVEPOINT. Rolling back the outer
+    transaction afterwards leaves the tables empty for the next test without
+    re-running any DDL.
+    """
+    connection = db_schema.connect()
+    transaction = connection.begin()
+    db = TestingSessionLocal(bind=connection, join_transaction_mode="create_savepoint")
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
+        transaction.rollback()
+        connection.close()
 
 
-@pytest.fixture(scope="function")
-def client(db_session):
-    """Create a test client with overridden database dependency and disabled rate limiting"""
-    def override_get_db():
+@pytest.fixture
+def count_queries(db_session):
+    """
+    Create a context manager that records the SQL statements executed on the
+    test connection, for asserting an endpoint's query budget (N+1 checks)
+    """
+    connection = db_session.get_bind()
+
+    @contextlib.contextmanager
+    def _count_queries():
+        statements = []
+
+        def _record(conn, cursor, statement, parameters, context, executemany):
+            # SAVEPOINT bookkeeping comes from the test isolation, not the app
+            if "SAVEPOINT" not in statement:
+                statements.append(statement)
+
+        event.listen(connection, "before_cursor_execute", _record)
         try:
-            yield db_session
+            yield statements
         finally:
-            pass
+            event.remove(connection, "before_cursor_execute", _record)
+
+    return _count_queries
+
+
+@pytest.fixture
+def explain(db_session):
+    """
+    Create a callable that returns PostgreSQL's query plan for a SQL string
 
+    Sequential scans, bitmap scans and explicit sorts are disabled for the
+    test transaction, so on near-empty test tables the plan still shows
+    whether an index can serve the filter and ORDER BY on its own.
+    """
+    for setting in ("enable_seqscan", "enable_bitmapscan", "enable_sort"):
+        db_session.execute(text(f"SET LOCAL {setting} = off"))
+
+    def _explain(sql, **params):
+        return "\n".join(db_session.execute(text(f"EXPLAIN {sql}"), params).scalars())
+
+    return _explain
+
+
+@pytest.fixture(scope="session")
+def app_client():
+    """
+    Create one test client for the whole run with rate limiting disabled
+
+    Building the middleware stack and starting the app happens once here;
+    the per-test ``client`` fixture only swaps the database override.
+    """
     # Clear middleware to disable rate limiting in tests
     # Save original middleware
     original_middleware = app.user_middleware.copy()
@@ -60,21 +152,70 @@ def client(db_session):
     ]
     app.middleware_stack = app.build_middleware_stack()
 
-    app.dependency_overrides[get_db] = override_get_db
-
     with TestClient(app) as test_client:
         yield test_client
 
     # Restore original middleware
     app.user_middleware = original_middleware
     app.middleware_stack = app.build_middleware_stack()
+
+
+@pytest.fixture(scope="function")
+def client(app_client, request):
+    """
+    Provide the shared test client with the database dependency overridden
+
+    Tests marked ``no_db`` skip the database session entirely; the override
+    then yields None so any endpoint that does reach the database fails loudly.
+    """
+    if request.node.get_closest_marker("no_db"):
+        db_session = None
+    else:
+        db_session = request.getfixturevalue("db_session")
+
+    def override_get_db():
+        try:
+            yield db_session
+        finally:
+            pass
+
+    app.dependency_overrides[get_db] = override_get_db
+    app_client.cookies.clear()
+    # Cached listings would outlive the rolled-back data of earlier tests
+    gallery_service.listing_cache.clear()
+    product_service.listing_cache.clear()
+    service_package_service.listing_cache.clear()
+    testimonial_service.listing_cache.clear()
+
+    yield app_client
+
     app.dependency_overrides.clear()
 
 
+@pytest_asyncio.fixture
+async def aclient(client):
+    """
+    Create an async client that calls the app in-process over ASGI
+
+    Shares the database override and middleware setup of ``client``. Every
+    request resolves to the same ``db_session``, which is not safe for
+    concurrent use, so await requests one at a time.
+    """
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as async_client:
+        yield async_client
+
+
+# Fixed ids for the shared test users, so their tokens can be signed once
+ADMIN_USER_ID = UUID("00000000-0000-4000-8000-00000000ad01")
+REGULAR_USER_ID = UUID("00000000-0000-4000-8000-00000000a5e1")
+
+
 @pytest.fixture
 def admin_user(db_session):
     """Create an admin user for testing"""
     user = User(
+        id=ADMIN_USER_ID,
         email="admin@test.com",
         full_name="Admin User",
         google_id="admin123",
@@ -92,6 +233,7 @@ def admin_user(db_session):
 def regular_user(db_session):
     """Create a regular user for testing"""
     user = User(
+        id=REGULAR_USER_ID,
         email="user@test.com",
         full_name="Regular User",
         google_id="user123",
@@ -104,18 +246,33 @@ def regular_user(db_session):
     return user
 
 
+@pytest.fixture(scope="session")
+def session_tokens():
+    """
+    Sign access tokens for the shared admin and regular users once per run
+
+    The users themselves are recreated (and rolled back) per test with the
+    same fixed ids, so the tokens stay valid for every test. They outlive the
+    default short expiry so a long run never sees them lapse.
+    """
+    from app.core.security import create_access_token
+    lifetime = timedelta(hours=12)
+    return {
+        "admin": create_access_token(data={"sub": str(ADMIN_USER_ID)}, expires_delta=lifetime),
+        "user": create_access_token(data={"sub": str(REGULAR_USER_ID)}, expires_delta=lifetime),
+    }
+
+
 @pytest.fixture
-def admin_token(admin_user):
+def admin_token(admin_user, session_tokens):
     """Create a mock admin token"""
-    from app.core.security import create_access_token
-    return create_access_token(data={"sub": str(admin_user.id)})
+    return session_tokens["admin"]
 
 
 @pytest.fixture
-def user_token(regular_user):
+def user_token(regular_user, session_tokens):
     """Create a mock regular user token"""
-    from app.core.security import create_access_token
-    return create_access_token(data={"sub": str(regular_user.id)})
+    return session_tokens["user"]
 
 
 @pytest.fixture
@@ -198,6 +198,31 @@ class TestJWTTokens:
         assert payload["sub"] == str(regular_user.id)
         assert payload["type"] == "refresh"
 
+    def test_token_signing_uses_cryptography_backend(self):
+        """Test that python-jose signs through the cryptography (OpenSSL) backend"""
+        from jose import backends, jwk
+
+        from app.core.config import settings
+
+        # Guards the python-jose[cryptography] extra from requirements.txt:
+        # jose only exports AESKey when the cryptography backend imports, and
+        # HMACKey then resolves to that backend's key
+        assert backends.AESKey is not None
+        key = jwk.construct(settings.SECRET_KEY, settings.ALGORITHM)
+        assert isinstance(key, backends.HMACKey)
+
+    def test_token_signing_follows_secret_key_changes(self, monkeypatch):
+        """Test that tokens are signed and verified with the current SECRET_KEY"""
+        from app.core.config import settings
+
+        user_id = str(uuid4())
+        old_token = create_access_token(data={"sub": user_id})
+        monkeypatch.setattr(settings, "SECRET_KEY", "rotated-test-secret")
+
+        new_token = create_access_token(data={"sub": user_id})
+        assert verify_token(new_token)["sub"] == user_id
+        assert verify_token(old_token) is None
+
     def test_invalid_token_verification(self):
         """Test verification of invalid token"""
         payload = verify_token("invalid.token.here", token_type="access")
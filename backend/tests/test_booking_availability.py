@@ -63,9 +63,7 @@ class TestBookingAvailabilityAPI:
             is_free=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create a booking for tomorrow at 10:00
         booking_date = date.today() + timedelta(days=1)
@@ -177,9 +175,7 @@ class TestBookingAvailabilityAPI:
             is_free=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Book all slots for tomorrow
         booking_date = date.today() + timedelta(days=1)
@@ -246,9 +242,7 @@ class TestBookingAvailabilityAPI:
             is_free=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create a cancelled booking for tomorrow at 10:00
         booking_date = date.today() + timedelta(days=1)
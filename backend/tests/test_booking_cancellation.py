@@ -27,9 +27,7 @@ class TestBookingCancellationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create booking (3 days in future - well within 24 hour window)
         booking = Booking(
@@ -46,8 +44,7 @@ class TestBookingCancellationAPI:
             status="pending"
         )
         db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        db_session.flush()
 
         # Cancel booking
         response = client.put(f"/api/bookings/{booking.id}/cancel", headers=admin_headers)
@@ -77,9 +74,7 @@ class TestBookingCancellationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         booking = Booking(
             booking_number="BK0001",
@@ -95,8 +90,7 @@ class TestBookingCancellationAPI:
             status="pending"
         )
         db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        db_session.flush()
 
         # Try to cancel without authentication
         response = client.put(f"/api/bookings/{booking.id}/cancel")
@@ -120,9 +114,7 @@ class TestBookingCancellationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create booking for admin user
         booking = Booking(
@@ -139,8 +131,7 @@ class TestBookingCancellationAPI:
             status="pending"
         )
         db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        db_session.flush()
 
         # Try to cancel with regular user credentials
         response = client.put(f"/api/bookings/{booking.id}/cancel", headers=user_headers)
@@ -164,9 +155,7 @@ class TestBookingCancellationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create a booking ~2 hours from now so it is deterministically inside
         # the 24-hour cancellation window regardless of what time the tests run.
@@ -185,8 +174,7 @@ class TestBookingCancellationAPI:
             status="pending"
         )
         db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        db_session.flush()
 
         # Try to cancel
         response = client.put(f"/api/bookings/{booking.id}/cancel", headers=admin_headers)
@@ -211,9 +199,7 @@ class TestBookingCancellationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create already cancelled booking
         booking = Booking(
@@ -230,8 +216,7 @@ class TestBookingCancellationAPI:
             status="cancelled"  # Already cancelled
         )
         db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        db_session.flush()
 
         # Try to cancel again
         response = client.put(f"/api/bookings/{booking.id}/cancel", headers=admin_headers)
@@ -256,9 +241,7 @@ class TestBookingCancellationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create completed booking
         booking = Booking(
@@ -275,8 +258,7 @@ class TestBookingCancellationAPI:
             status="completed"
         )
         db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        db_session.flush()
 
         # Try to cancel
         response = client.put(f"/api/bookings/{booking.id}/cancel", headers=admin_headers)
@@ -309,9 +291,7 @@ class TestBookingCancellationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create booking
         booking_date = date.today() + timedelta(days=5)
@@ -331,8 +311,7 @@ class TestBookingCancellationAPI:
             status="confirmed"
         )
         db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        db_session.flush()
 
         # Check availability - slot should be unavailable
         response = client.get(
@@ -383,9 +362,7 @@ class TestBookingCancellationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create booking with existing admin notes
         booking = Booking(
@@ -403,8 +380,7 @@ class TestBookingCancellationAPI:
             admin_notes="Previous note"
         )
         db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        db_session.flush()
 
         # Cancel booking
         response = client.put(f"/api/bookings/{booking.id}/cancel", headers=admin_headers)
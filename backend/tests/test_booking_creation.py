@@ -3,6 +3,22 @@ Tests for booking creation API endpoints
 """
 import pytest
 from datetime import date, time, timedelta
+from decimal import Decimal
+
+# Monetary fields asserted together on every successful booking response
+AMOUNT_FIELDS = ("subtotal", "transport_cost", "total_amount", "deposit_amount")
+
+
+def booking_amounts(data):
+    """Return the booking's monetary fields as a tuple of Decimals"""
+    return tuple(Decimal(str(data[field])) for field in AMOUNT_FIELDS)
+
+
+# ISO booking dates N days from today, computed once at import
+_FUTURE_DATES = {
+    days: (date.today() + timedelta(days=days)).isoformat()
+    for days in range(1, 14)
+}
 
 
 class TestBookingCreationAPI:
@@ -26,12 +42,10 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create booking data
-        booking_date = (date.today() + timedelta(days=3)).isoformat()
+        booking_date = _FUTURE_DATES[3]
         booking_data = {
             "package_id": str(package.id),
             "booking_date": booking_date,
@@ -54,11 +68,11 @@ class TestBookingCreationAPI:
         assert data["status"] == "pending"
         assert data["guest_email"] == "guest@example.com"
         assert data["guest_name"] == "Jane Doe"
-        assert float(data["subtotal"]) == 3000
         # Transport cost is determined manually after booking (0 at creation)
-        assert float(data["transport_cost"]) == 0
-        assert float(data["total_amount"]) == 3000
-        assert float(data["deposit_amount"]) == 1500  # 50%
+        # Deposit is 50% of the total
+        assert booking_amounts(data) == (
+            Decimal("3000"), Decimal("0"), Decimal("3000"), Decimal("1500")
+        )
         assert "booking_number" in data
         assert data["booking_number"].startswith("BK")
 
@@ -80,12 +94,10 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create booking data (no guest info required for authenticated users)
-        booking_date = (date.today() + timedelta(days=5)).isoformat()
+        booking_date = _FUTURE_DATES[5]
         booking_data = {
             "package_id": str(package.id),
             "booking_date": booking_date,
@@ -104,10 +116,9 @@ class TestBookingCreationAPI:
         data = response.json()
         assert data["status"] == "pending"
         assert data["user_id"] is not None  # Should have user_id
-        assert float(data["subtotal"]) == 10000
-        assert float(data["transport_cost"]) == 0
-        assert float(data["total_amount"]) == 10000
-        assert float(data["deposit_amount"]) == 5000
+        assert booking_amounts(data) == (
+            Decimal("10000"), Decimal("0"), Decimal("10000"), Decimal("5000")
+        )
 
     def test_create_booking_missing_guest_info(self, client, db_session):
         """Test that guest bookings without contact info fail"""
@@ -126,12 +137,10 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Missing guest info
-        booking_date = (date.today() + timedelta(days=3)).isoformat()
+        booking_date = _FUTURE_DATES[3]
         booking_data = {
             "package_id": str(package.id),
             "booking_date": booking_date,
@@ -167,9 +176,7 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         # Create existing booking
         booking_date = date.today() + timedelta(days=3)
@@ -226,11 +233,9 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
-        booking_date = (date.today() + timedelta(days=3)).isoformat()
+        booking_date = _FUTURE_DATES[3]
         booking_data = {
             "package_id": str(package.id),
             "booking_date": booking_date,
@@ -267,11 +272,9 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
-        booking_date = (date.today() + timedelta(days=3)).isoformat()
+        booking_date = _FUTURE_DATES[3]
         booking_data = {
             "package_id": str(package.id),
             "booking_date": booking_date,
@@ -309,11 +312,9 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
-        booking_date = (date.today() + timedelta(days=3)).isoformat()
+        booking_date = _FUTURE_DATES[3]
         booking_data = {
             "package_id": str(package.id),
             "booking_date": booking_date,
@@ -353,11 +354,9 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
-        booking_date = (date.today() + timedelta(days=7)).isoformat()
+        booking_date = _FUTURE_DATES[7]
         booking_data = {
             "package_id": str(package.id),
             "booking_date": booking_date,
@@ -383,10 +382,9 @@ class TestBookingCreationAPI:
         # Transport is set manually after booking (0 at creation)
         # Total = 66000
         # Deposit = 33000
-        assert float(data["subtotal"]) == 66000
-        assert float(data["transport_cost"]) == 0
-        assert float(data["total_amount"]) == 66000
-        assert float(data["deposit_amount"]) == 33000
+        assert booking_amounts(data) == (
+            Decimal("66000"), Decimal("0"), Decimal("66000"), Decimal("33000")
+        )
         assert data["wedding_theme"] == "Rustic Outdoor"
         assert data["special_requests"] == "Natural makeup look preferred"
 
@@ -408,11 +406,9 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
-        booking_date = (date.today() + timedelta(days=3)).isoformat()
+        booking_date = _FUTURE_DATES[3]
         booking_data = {
             "package_id": str(package.id),
             "booking_date": booking_date,
@@ -450,15 +446,13 @@ class TestBookingCreationAPI:
             is_active=True
         )
         db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        db_session.flush()
 
         booking_numbers = set()
 
         # Create 5 bookings
         for i in range(5):
-            booking_date = (date.today() + timedelta(days=3 + i)).isoformat()
+            booking_date = _FUTURE_DATES[3 + i]
             booking_data = {
                 "package_id": str(package.id),
                 "booking_date": booking_date,
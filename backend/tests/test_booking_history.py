@@ -3,17 +3,23 @@ Tests for booking history API endpoints
 """
 import pytest
 from datetime import date, time, timedelta
+from uuid import uuid4
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
 
-class TestBookingHistoryAPI:
-    """Test suite for booking history endpoints (authentication required)"""
+@pytest.fixture(scope="module")
+def booking_refs(db_schema):
+    """
+    Insert the package and location shared by every booking in this module
 
-    def test_list_user_bookings(self, client, db_session, admin_user, admin_headers):
-        """Test listing authenticated user's bookings"""
-        from app.models.service import ServicePackage, TransportLocation
-        from app.models.booking import Booking
+    The rows are committed once through a dedicated session so they outlive
+    the per-test rollback, and only their ids are yielded to avoid handing
+    detached ORM instances across tests.
+    """
+    from app.models.service import ServicePackage, TransportLocation
 
-        # Create test package and location
+    with Session(db_schema) as session:
         package = ServicePackage(
             package_type="regular",
             name="Regular Makeup",
@@ -26,18 +32,97 @@ class TestBookingHistoryAPI:
             transport_cost=500,
             is_active=True
         )
-        db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        session.add_all([package, location])
+        session.flush()
+        refs = (package.id, location.id)
+        session.commit()
+
+    yield refs
+
+    with Session(db_schema) as session:
+        session.query(ServicePackage).filter(ServicePackage.id == refs[0]).delete()
+        session.query(TransportLocation).filter(TransportLocation.id == refs[1]).delete()
+        session.commit()
+
+
+@pytest.fixture(scope="module")
+def status_bookings(db_schema, booking_refs):
+    """
+    Commit a user holding one pending, one confirmed and one completed booking
+
+    Shared read-only by the status filter cases; yields auth headers for the
+    user that owns the bookings.
+    """
+    from app.core.security import create_access_token
+    from app.models.booking import Booking
+    from app.models.user import User
+
+    today = date.today()
+    package_id, location_id = booking_refs
+    bookings = [
+        ("BK1001", today + timedelta(days=5), time(10, 0), "pending"),
+        ("BK1002", today + timedelta(days=10), time(14, 0), "confirmed"),
+        ("BK1003", today - timedelta(days=5), time(10, 0), "completed"),
+    ]
+
+    with Session(db_schema) as session:
+        user = User(
+            email="history@test.com",
+            full_name="History User",
+            google_id="history123",
+            is_active=True,
+            is_admin=False
+        )
+        session.add(user)
+        session.flush()
+        user_id = user.id
+        session.add_all([
+            Booking(
+                booking_number=booking_number,
+                user_id=user_id,
+                package_id=package_id,
+                location_id=location_id,
+                booking_date=booking_date,
+                booking_time=booking_time,
+                num_others=1,
+                subtotal=3000,
+                transport_cost=500,
+                total_amount=3500,
+                status=status
+            )
+            for booking_number, booking_date, booking_time, status in bookings
+        ])
+        session.commit()
+
+    token = create_access_token(data={"sub": str(user_id)})
+    yield {"Authorization": f"Bearer {token}"}
+
+    with Session(db_schema) as session:
+        session.query(Booking).filter(Booking.user_id == user_id).delete()
+        session.query(User).filter(User.id == user_id).delete()
+        session.commit()
+
+
+@pytest.fixture
+def make_booking(db_session, admin_user, booking_refs):
+    """
+    Create a factory that inserts a booking for the admin user
 
-        # Create bookings for admin user
-        booking1 = Booking(
+    Keyword arguments override the defaults. Bookings are only flushed:
+    the test transaction is rolled back afterwards anyway.
+    """
+    from app.models.booking import Booking
+
+    today = date.today()
+    package_id, location_id = booking_refs
+
+    def _make_booking(**overrides):
+        fields = dict(
             booking_number="BK0001",
             user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=5),
+            package_id=package_id,
+            location_id=location_id,
+            booking_date=today + timedelta(days=5),
             booking_time=time(10, 0),
             num_others=1,
             subtotal=3000,
@@ -45,248 +130,189 @@ class TestBookingHistoryAPI:
             total_amount=3500,
             status="pending"
         )
-        booking2 = Booking(
+        fields.update(overrides)
+        booking = Booking(**fields)
+        db_session.add(booking)
+        db_session.flush()
+        return booking
+
+    return _make_booking
+
+
+class TestBookingHistoryAPI:
+    """Test suite for booking history endpoints (authentication required)"""
+
+    def test_list_user_bookings(self, client, make_booking, admin_headers, count_queries):
+        """Test listing authenticated user's bookings"""
+        today = date.today()
+
+        make_booking(booking_number="BK0001")
+        make_booking(
             booking_number="BK0002",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=10),
+            booking_date=today + timedelta(days=10),
             booking_time=time(14, 0),
             num_others=2,
             subtotal=6000,
-            transport_cost=500,
             total_amount=6500,
             status="confirmed"
         )
-        db_session.add_all([booking1, booking2])
-        db_session.commit()
 
-        # List bookings
-        response = client.get("/api/bookings", headers=admin_headers)
+        # List bookings: user lookup, count and page select, regardless of row count
+        with count_queries() as queries:
+            response = client.get("/api/bookings", headers=admin_headers)
         assert response.status_code == 200
+        assert len(queries) <= 3
 
         data = response.json()
         assert data["total"] == 2
         assert len(data["items"]) == 2
         assert data["page"] == 1
 
-    def test_list_bookings_no_auth(self, client):
-        """Test that listing bookings without authentication fails"""
-        response = client.get("/api/bookings")
+    @pytest.mark.no_db
+    @pytest.mark.parametrize(
+        "path", ["/api/bookings", f"/api/bookings/{uuid4()}"], ids=["list", "detail"]
+    )
+    def test_bookings_no_auth(self, client, path):
+        """Test that listing or viewing bookings without authentication fails"""
+        response = client.get(path)
         assert response.status_code == 401  # Unauthorized
+        # Fast-fail responses stay a minimal, fixed payload (compared as bytes, no parse)
+        assert response.content == b'{"detail":"Not authenticated"}'
 
-    def test_list_bookings_with_pagination(self, client, db_session, admin_user, admin_headers):
+    @pytest.mark.asyncio
+    async def test_list_bookings_with_pagination(self, aclient, db_session, admin_user, admin_headers, booking_refs):
         """Test booking list pagination"""
-        from app.models.service import ServicePackage, TransportLocation
         from app.models.booking import Booking
 
-        package = ServicePackage(
-            package_type="regular",
-            name="Regular Makeup",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True
-        )
-        location = TransportLocation(
-            location_name="Nairobi CBD",
-            transport_cost=500,
-            is_active=True
-        )
-        db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
-
-        # Create 25 bookings
-        for i in range(25):
-            booking = Booking(
-                booking_number=f"BK{i:04d}",
-                user_id=admin_user.id,
-                package_id=package.id,
-                location_id=location.id,
-                booking_date=date.today() + timedelta(days=i+1),
-                booking_time=time(10, 0),
-                num_others=1,
-                subtotal=3000,
-                transport_cost=500,
-                total_amount=3500,
-                status="pending"
-            )
-            db_session.add(booking)
-        db_session.commit()
-
-        # Get first page
-        response = client.get("/api/bookings?page=1&page_size=10", headers=admin_headers)
-        assert response.status_code == 200
-        data = response.json()
+        today = date.today()
+        package_id, location_id = booking_refs
+
+        # Create 25 bookings in one multi-row INSERT ... VALUES statement
+        db_session.execute(insert(Booking).values([
+            {
+                "booking_number": f"BK{i:04d}",
+                "user_id": admin_user.id,
+                "package_id": package_id,
+                "location_id": location_id,
+                "booking_date": today + timedelta(days=i+1),
+                "booking_time": time(10, 0),
+                "num_others": 1,
+                "subtotal": 3000,
+                "transport_cost": 500,
+                "total_amount": 3500,
+                "status": "pending"
+            }
+            for i in range(25)
+        ]))
+
+        # Fetch the three pages one after another; every request shares db_session
+        first, second, last = [
+            await aclient.get(f"/api/bookings?page={page}&page_size=10", headers=admin_headers)
+            for page in (1, 2, 3)
+        ]
+
+        assert first.status_code == 200
+        data = first.json()
         assert data["total"] == 25
         assert data["page"] == 1
         assert data["page_size"] == 10
         assert data["total_pages"] == 3
         assert len(data["items"]) == 10
 
-        # Get second page
-        response = client.get("/api/bookings?page=2&page_size=10", headers=admin_headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["items"]) == 10
+        assert second.status_code == 200
+        assert len(second.json()["items"]) == 10
 
-        # Get last page
-        response = client.get("/api/bookings?page=3&page_size=10", headers=admin_headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["items"]) == 5
+        assert last.status_code == 200
+        assert len(last.json()["items"]) == 5
 
-    def test_filter_bookings_by_status(self, client, db_session, admin_user, admin_headers):
-        """Test filtering bookings by status"""
-        from app.models.service import ServicePackage, TransportLocation
+    def test_list_bookings_with_cursor(self, client, db_session, admin_user, admin_headers, booking_refs):
+        """Test keyset pagination continues after the cursor booking"""
         from app.models.booking import Booking
 
-        package = ServicePackage(
-            package_type="regular",
-            name="Regular Makeup",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True
-        )
-        location = TransportLocation(
-            location_name="Nairobi CBD",
-            transport_cost=500,
-            is_active=True
-        )
-        db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        today = date.today()
+        package_id, location_id = booking_refs
+
+        db_session.execute(insert(Booking).values([
+            {
+                "booking_number": f"BK{i:04d}",
+                "user_id": admin_user.id,
+                "package_id": package_id,
+                "location_id": location_id,
+                "booking_date": today + timedelta(days=i+1),
+                "booking_time": time(10, 0),
+                "num_others": 1,
+                "subtotal": 3000,
+                "transport_cost": 500,
+                "total_amount": 3500,
+                "status": "pending"
+            }
+            for i in range(25)
+        ]))
 
-        # Create bookings with different statuses
-        pending_booking = Booking(
-            booking_number="BK0001",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=5),
-            booking_time=time(10, 0),
-            num_others=1,
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            status="pending"
-        )
-        confirmed_booking = Booking(
-            booking_number="BK0002",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=10),
-            booking_time=time(14, 0),
-            num_others=1,
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            status="confirmed"
-        )
-        completed_booking = Booking(
-            booking_number="BK0003",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() - timedelta(days=5),
-            booking_time=time(10, 0),
-            num_others=1,
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            status="completed"
-        )
-        db_session.add_all([pending_booking, confirmed_booking, completed_booking])
-        db_session.commit()
+        response = client.get("/api/bookings?page=1&page_size=10", headers=admin_headers)
+        first_page = response.json()
+        last_item = first_page["items"][-1]
+        assert first_page["next_cursor"] == last_item["id"]
 
-        # Filter by pending
-        response = client.get("/api/bookings?status=pending", headers=admin_headers)
+        response = client.get(
+            f"/api/bookings?cursor={last_item['id']}&page_size=10", headers=admin_headers
+        )
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 1
-        assert data["items"][0]["status"] == "pending"
+        assert len(data["items"]) == 10
+        # Sorted newest first, so the next page starts strictly before the cursor
+        assert data["items"][0]["booking_date"] < last_item["booking_date"]
 
-        # Filter by confirmed
-        response = client.get("/api/bookings?status=confirmed", headers=admin_headers)
-        assert response.status_code == 200
+        # Keyset pages line up with the equivalent OFFSET page
+        offset_page = client.get("/api/bookings?page=2&page_size=10", headers=admin_headers).json()
+        assert [b["id"] for b in data["items"]] == [b["id"] for b in offset_page["items"]]
+
+        # Last page has no further cursor
+        response = client.get(
+            f"/api/bookings?cursor={data['next_cursor']}&page_size=10", headers=admin_headers
+        )
         data = response.json()
-        assert data["total"] == 1
-        assert data["items"][0]["status"] == "confirmed"
+        assert len(data["items"]) == 5
+        assert data["next_cursor"] is None
+
+    def test_list_bookings_no_total_is_cheap(self, client, make_booking, admin_headers, count_queries):
+        """Test that include_total=false skips the COUNT query"""
+        make_booking()
+
+        with count_queries() as queries:
+            response = client.get("/api/bookings?include_total=false", headers=admin_headers)
+        assert response.status_code == 200
 
-        # Filter by completed
-        response = client.get("/api/bookings?status=completed", headers=admin_headers)
+        data = response.json()
+        assert "total" not in data
+        assert "total_pages" not in data
+        assert len(data["items"]) == 1
+        # Only the current-user lookup and the page select
+        assert len(queries) == 2
+        assert not any("count(" in statement.lower() for statement in queries)
+
+    def test_list_bookings_invalid_cursor(self, client, admin_headers):
+        """Test that an unknown cursor is rejected"""
+        response = client.get(f"/api/bookings?cursor={uuid4()}", headers=admin_headers)
+        assert response.status_code == 400
+
+    @pytest.mark.parametrize("status", ["pending", "confirmed", "completed"])
+    def test_filter_bookings_by_status(self, client, status, status_bookings):
+        """Test filtering bookings by status"""
+        response = client.get(f"/api/bookings?status={status}", headers=status_bookings)
         assert response.status_code == 200
         data = response.json()
         assert data["total"] == 1
-        assert data["items"][0]["status"] == "completed"
+        assert data["items"][0]["status"] == status
 
-    def test_bookings_sorted_by_date(self, client, db_session, admin_user, admin_headers):
+    def test_bookings_sorted_by_date(self, client, make_booking, admin_headers):
         """Test that bookings are sorted by date (newest first)"""
-        from app.models.service import ServicePackage, TransportLocation
-        from app.models.booking import Booking
-
-        package = ServicePackage(
-            package_type="regular",
-            name="Regular Makeup",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True
-        )
-        location = TransportLocation(
-            location_name="Nairobi CBD",
-            transport_cost=500,
-            is_active=True
-        )
-        db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        today = date.today()
 
         # Create bookings with different dates (in random order)
-        booking1 = Booking(
-            booking_number="BK0001",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=5),
-            booking_time=time(10, 0),
-            num_others=1,
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            status="pending"
-        )
-        booking2 = Booking(
-            booking_number="BK0002",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=15),
-            booking_time=time(10, 0),
-            num_others=1,
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            status="pending"
-        )
-        booking3 = Booking(
-            booking_number="BK0003",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=10),
-            booking_time=time(10, 0),
-            num_others=1,
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            status="pending"
-        )
-        db_session.add_all([booking1, booking2, booking3])
-        db_session.commit()
+        make_booking(booking_number="BK0001", booking_date=today + timedelta(days=5))
+        make_booking(booking_number="BK0002", booking_date=today + timedelta(days=15))
+        make_booking(booking_number="BK0003", booking_date=today + timedelta(days=10))
 
         # List bookings
         response = client.get("/api/bookings", headers=admin_headers)
@@ -298,48 +324,23 @@ class TestBookingHistoryAPI:
         assert data["items"][1]["booking_number"] == "BK0003"  # 10 days ahead
         assert data["items"][2]["booking_number"] == "BK0001"  # 5 days ahead
 
-    def test_get_booking_details(self, client, db_session, admin_user, admin_headers):
-        """Test getting specific booking details"""
-        from app.models.service import ServicePackage, TransportLocation
-        from app.models.booking import Booking
-
-        package = ServicePackage(
-            package_type="regular",
-            name="Regular Makeup",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True
-        )
-        location = TransportLocation(
-            location_name="Nairobi CBD",
-            transport_cost=500,
-            is_active=True
+    def test_bookings_list_uses_index(self, admin_user, explain):
+        """Test that the booking history query is served by the composite index"""
+        plan = explain(
+            "SELECT * FROM bookings WHERE user_id = :user_id "
+            "ORDER BY booking_date DESC, booking_time DESC, id DESC LIMIT 20",
+            user_id=admin_user.id
         )
-        db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
+        assert "idx_bookings_user_date" in plan
+        assert "Sort" not in plan
 
-        # Create booking
-        booking = Booking(
-            booking_number="BK0001",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=5),
-            booking_time=time(10, 0),
-            num_others=1,
+    def test_get_booking_details(self, client, make_booking, admin_headers):
+        """Test getting specific booking details"""
+        booking = make_booking(
             wedding_theme="Elegant Garden",
             special_requests="Natural look preferred",
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            deposit_amount=1750,
-            status="pending"
+            deposit_amount=1750
         )
-        db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
 
         # Get booking details
         response = client.get(f"/api/bookings/{booking.id}", headers=admin_headers)
@@ -353,88 +354,10 @@ class TestBookingHistoryAPI:
         assert float(data["total_amount"]) == 3500
         assert float(data["deposit_amount"]) == 1750
 
-    def test_get_booking_details_no_auth(self, client, db_session, admin_user):
-        """Test that getting booking details without authentication fails"""
-        from app.models.service import ServicePackage, TransportLocation
-        from app.models.booking import Booking
-
-        package = ServicePackage(
-            package_type="regular",
-            name="Regular Makeup",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True
-        )
-        location = TransportLocation(
-            location_name="Nairobi CBD",
-            transport_cost=500,
-            is_active=True
-        )
-        db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
-
-        booking = Booking(
-            booking_number="BK0001",
-            user_id=admin_user.id,
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=5),
-            booking_time=time(10, 0),
-            num_others=1,
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            status="pending"
-        )
-        db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
-
-        # Try without authentication
-        response = client.get(f"/api/bookings/{booking.id}")
-        assert response.status_code == 401
-
-    def test_get_booking_other_user(self, client, db_session, admin_user, regular_user, user_headers):
+    def test_get_booking_other_user(self, client, make_booking, regular_user, user_headers):
         """Test that users cannot access other users' bookings"""
-        from app.models.service import ServicePackage, TransportLocation
-        from app.models.booking import Booking
-
-        package = ServicePackage(
-            package_type="regular",
-            name="Regular Makeup",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True
-        )
-        location = TransportLocation(
-            location_name="Nairobi CBD",
-            transport_cost=500,
-            is_active=True
-        )
-        db_session.add_all([package, location])
-        db_session.commit()
-        db_session.refresh(package)
-        db_session.refresh(location)
-
         # Create booking for admin user
-        booking = Booking(
-            booking_number="BK0001",
-            user_id=admin_user.id,  # Admin user's booking
-            package_id=package.id,
-            location_id=location.id,
-            booking_date=date.today() + timedelta(days=5),
-            booking_time=time(10, 0),
-            num_others=1,
-            subtotal=3000,
-            transport_cost=500,
-            total_amount=3500,
-            status="pending"
-        )
-        db_session.add(booking)
-        db_session.commit()
-        db_session.refresh(booking)
+        booking = make_booking()
 
         # Try to access with regular user credentials
         response = client.get(f"/api/bookings/{booking.id}", headers=user_headers)
@@ -442,8 +365,6 @@ class TestBookingHistoryAPI:
 
     def test_get_nonexistent_booking(self, client, admin_headers):
         """Test getting a booking that doesn't exist"""
-        from uuid import uuid4
-
         fake_id = uuid4()
         response = client.get(f"/api/bookings/{fake_id}", headers=admin_headers)
         assert response.status_code == 404
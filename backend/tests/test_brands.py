@@ -3,60 +3,67 @@ Tests for Brand API endpoints
 """
 import pytest
 from uuid import uuid4
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
 
-class TestBrandAPI:
-    """Test suite for Brand CRUD operations"""
+@pytest.fixture(scope="class")
+def brand_catalog(db_schema):
+    """
+    Commit a fixed brand catalog shared by the read-only tests
 
-    def test_list_brands_as_admin(self, client, admin_headers, db_session):
-        """Test listing brands as admin"""
-        # Create test brands
-        from app.models.product import Brand
-        brand1 = Brand(name="Test Brand 1", slug="test-brand-1", is_active=True)
-        brand2 = Brand(name="Test Brand 2", slug="test-brand-2", is_active=False)
-        db_session.add_all([brand1, brand2])
-        db_session.commit()
+    Rows are inserted once per class through a dedicated session and removed
+    afterwards, so other classes still start from an empty brands table.
+    Yields a mapping of brand name to id.
+    """
+    from app.models.product import Brand
 
-        # List all brands
-        response = client.get("/api/admin/brands", headers=admin_headers)
-        assert response.status_code == 200
-        data = response.json()
-        assert data["total"] == 2
-        assert len(data["items"]) == 2
+    with Session(db_schema) as session:
+        brands = [
+            Brand(name="Active Brand", slug="active-brand", is_active=True),
+            Brand(name="Inactive Brand", slug="inactive-brand", is_active=False),
+            Brand(name="MAC Cosmetics", slug="mac-cosmetics", description="Makeup brand"),
+            Brand(name="NYX", slug="nyx", description="Budget makeup"),
+        ]
+        session.add_all(brands)
+        session.flush()
+        catalog = {brand.name: brand.id for brand in brands}
+        session.commit()
 
-    def test_list_brands_as_regular_user(self, client, user_headers):
-        """Test listing brands as regular user (should fail)"""
-        response = client.get("/api/admin/brands", headers=user_headers)
-        assert response.status_code == 403
+    yield catalog
 
-    def test_list_brands_unauthenticated(self, client):
-        """Test listing brands without authentication (should fail)"""
-        response = client.get("/api/admin/brands")
-        assert response.status_code == 401
+    with Session(db_schema) as session:
+        session.query(Brand).filter(Brand.id.in_(catalog.values())).delete()
+        session.commit()
 
-    def test_filter_brands_by_active_status(self, client, admin_headers, db_session):
-        """Test filtering brands by active status"""
-        from app.models.product import Brand
-        brand1 = Brand(name="Active Brand", slug="active-brand", is_active=True)
-        brand2 = Brand(name="Inactive Brand", slug="inactive-brand", is_active=False)
-        db_session.add_all([brand1, brand2])
-        db_session.commit()
 
-        # Filter active brands
-        response = client.get("/api/admin/brands?is_active=true", headers=admin_headers)
+class TestBrandCatalog:
+    """Read-only Brand API tests against the shared catalog"""
+
+    def test_list_brands_as_admin(self, client, admin_headers, brand_catalog):
+        """Test listing brands as admin"""
+        response = client.get("/api/admin/brands", headers=admin_headers)
         assert response.status_code == 200
         data = response.json()
-        assert data["total"] == 1
-        assert data["items"][0]["name"] == "Active Brand"
+        assert data["total"] == len(brand_catalog)
+        assert {b["name"] for b in data["items"]} == set(brand_catalog)
+
+    @pytest.mark.parametrize("is_active,expected_name,excluded_name", [
+        ("true", "Active Brand", "Inactive Brand"),
+        ("false", "Inactive Brand", "Active Brand"),
+    ])
+    def test_filter_brands_by_active_status(
+        self, client, admin_headers, brand_catalog, is_active, expected_name, excluded_name
+    ):
+        """Test filtering brands by active status"""
+        response = client.get(f"/api/admin/brands?is_active={is_active}", headers=admin_headers)
+        assert response.status_code == 200
+        names = {b["name"] for b in response.json()["items"]}
+        assert expected_name in names
+        assert excluded_name not in names
 
-    def test_search_brands(self, client, admin_headers, db_session):
+    def test_search_brands(self, client, admin_headers, brand_catalog):
         """Test searching brands by name"""
-        from app.models.product import Brand
-        brand1 = Brand(name="MAC Cosmetics", slug="mac-cosmetics", description="Makeup brand")
-        brand2 = Brand(name="NYX", slug="nyx", description="Budget makeup")
-        db_session.add_all([brand1, brand2])
-        db_session.commit()
-
         # Search for "MAC"
         response = client.get("/api/admin/brands?search=MAC", headers=admin_headers)
         assert response.status_code == 200
@@ -64,19 +71,41 @@ class TestBrandAPI:
         assert data["total"] == 1
         assert data["items"][0]["name"] == "MAC Cosmetics"
 
-    def test_get_brand_by_id(self, client, admin_headers, db_session):
+    def test_get_brand_by_id(self, client, admin_headers, brand_catalog):
         """Test getting a specific brand by ID"""
-        from app.models.product import Brand
-        brand = Brand(name="Test Brand", slug="test-brand")
-        db_session.add(brand)
-        db_session.commit()
-        db_session.refresh(brand)
-
-        response = client.get(f"/api/admin/brands/{brand.id}", headers=admin_headers)
+        brand_id = brand_catalog["MAC Cosmetics"]
+        response = client.get(f"/api/admin/brands/{brand_id}", headers=admin_headers)
         assert response.status_code == 200
         data = response.json()
-        assert data["name"] == "Test Brand"
-        assert data["slug"] == "test-brand"
+        assert data["name"] == "MAC Cosmetics"
+        assert data["slug"] == "mac-cosmetics"
+
+
+class TestBrandAPI:
+    """Test suite for Brand CRUD operations"""
+
+    def test_list_brands_as_regular_user(self, client, user_headers):
+        """Test listing brands as regular user (should fail)"""
+        response = client.get("/api/admin/brands", headers=user_headers)
+        assert response.status_code == 403
+
+    @pytest.mark.no_db
+    @pytest.mark.parametrize("method,path", [
+        ("get", "/api/admin/brands"),
+        ("get", f"/api/admin/brands/{uuid4()}"),
+        ("delete", f"/api/admin/brands/{uuid4()}"),
+    ], ids=["list", "detail", "delete"])
+    def test_brands_unauthenticated(self, client, method, path):
+        """Test accessing brands without authentication (should fail)"""
+        response = client.request(method, path)
+        assert response.status_code == 401
+        assert response.content == b'{"detail":"Not authenticated"}'
+
+    def test_brand_list_order_uses_index(self, explain):
+        """Test that the name-ordered brand page is read from the name index"""
+        plan = explain("SELECT * FROM brands ORDER BY name LIMIT 20")
+        assert "brands_name_key" in plan
+        assert "Sort" not in plan
 
     def test_get_nonexistent_brand(self, client, admin_headers):
         """Test getting a brand that doesn't exist"""
@@ -130,8 +159,7 @@ class TestBrandAPI:
         from app.models.product import Brand
         brand = Brand(name="Old Name", slug="old-name")
         db_session.add(brand)
-        db_session.commit()
-        db_session.refresh(brand)
+        db_session.flush()
 
         update_data = {
             "name": "New Name",
@@ -150,8 +178,7 @@ class TestBrandAPI:
         brand1 = Brand(name="Brand 1", slug="brand-1")
         brand2 = Brand(name="Brand 2", slug="brand-2")
         db_session.add_all([brand1, brand2])
-        db_session.commit()
-        db_session.refresh(brand1)
+        db_session.flush()
 
         update_data = {"name": "Brand 2"}
         response = client.put(f"/api/admin/brands/{brand1.id}", json=update_data, headers=admin_headers)
@@ -170,16 +197,13 @@ class TestBrandAPI:
         from app.models.product import Brand
         brand = Brand(name="To Delete", slug="to-delete")
         db_session.add(brand)
-        db_session.commit()
-        db_session.refresh(brand)
+        db_session.flush()
 
         response = client.delete(f"/api/admin/brands/{brand.id}", headers=admin_headers)
         assert response.status_code == 204
 
         # Verify brand is deleted
-        db_session.expire_all()
-        deleted_brand = db_session.query(Brand).filter(Brand.id == brand.id).first()
-        assert deleted_brand is None
+        assert db_session.get(Brand, brand.id) is None
 
     def test_delete_brand_with_products(self, client, admin_headers, db_session):
         """Test deleting a brand that has associated products"""
@@ -192,8 +216,7 @@ class TestBrandAPI:
 
         brand = Brand(name="Brand With Products", slug="brand-with-products")
         db_session.add(brand)
-        db_session.commit()
-        db_session.refresh(brand)
+        db_session.flush()
 
         # Create product associated with brand
         product = Product(
@@ -217,33 +240,78 @@ class TestBrandAPI:
         response = client.delete(f"/api/admin/brands/{fake_id}", headers=admin_headers)
         assert response.status_code == 404
 
-    def test_pagination(self, client, admin_headers, db_session):
+    @pytest.mark.asyncio
+    async def test_pagination(self, aclient, admin_headers, db_session):
         """Test brand list pagination"""
         from app.models.product import Brand
-        # Create 25 brands
-        for i in range(25):
-            brand = Brand(name=f"Brand {i}", slug=f"brand-{i}")
-            db_session.add(brand)
+        # Create 25 brands in one multi-row INSERT ... VALUES statement
+        db_session.execute(insert(Brand).values(
+            [{"name": f"Brand {i}", "slug": f"brand-{i}"} for i in range(25)]
+        ))
         db_session.commit()
 
-        # Get first page
-        response = client.get("/api/admin/brands?page=1&page_size=10", headers=admin_headers)
-        assert response.status_code == 200
-        data = response.json()
+        # Fetch the three pages one after another; every request shares db_session
+        first, second, last = [
+            await aclient.get(f"/api/admin/brands?page={page}&page_size=10", headers=admin_headers)
+            for page in (1, 2, 3)
+        ]
+
+        assert first.status_code == 200
+        data = first.json()
         assert data["total"] == 25
         assert data["page"] == 1
         assert data["page_size"] == 10
         assert data["total_pages"] == 3
         assert len(data["items"]) == 10
 
-        # Get second page
-        response = client.get("/api/admin/brands?page=2&page_size=10", headers=admin_headers)
+        assert second.status_code == 200
+        assert len(second.json()["items"]) == 10
+
+        assert last.status_code == 200
+        assert len(last.json()["items"]) == 5
+
+    def test_cursor_pagination(self, client, admin_headers, db_session):
+        """Test keyset pagination continues after the cursor brand"""
+        from app.models.product import Brand
+        db_session.execute(insert(Brand).values(
+            [{"name": f"Brand {i}", "slug": f"brand-{i}"} for i in range(25)]
+        ))
+        db_session.commit()
+
+        response = client.get("/api/admin/brands?page=1&page_size=10", headers=admin_headers)
+        last_item = response.json()["items"][-1]
+
+        response = client.get(
+            f"/api/admin/brands?cursor={last_item['id']}&page_size=10", headers=admin_headers
+        )
         assert response.status_code == 200
         data = response.json()
         assert len(data["items"]) == 10
+        # Sorted by name, so the next page starts strictly after the cursor
+        assert data["items"][0]["name"] > last_item["name"]
+
+        offset_page = client.get("/api/admin/brands?page=2&page_size=10", headers=admin_headers).json()
+        assert [b["id"] for b in data["items"]] == [b["id"] for b in offset_page["items"]]
 
-        # Get last page
-        response = client.get("/api/admin/brands?page=3&page_size=10", headers=admin_headers)
+    def test_list_brands_no_total_is_cheap(self, client, admin_headers, db_session, count_queries):
+        """Test that include_total=false skips the COUNT query"""
+        from app.models.product import Brand
+        db_session.add(Brand(name="Test Brand", slug="test-brand"))
+        db_session.flush()
+
+        with count_queries() as queries:
+            response = client.get("/api/admin/brands?include_total=false", headers=admin_headers)
         assert response.status_code == 200
+
         data = response.json()
-        assert len(data["items"]) == 5
+        assert "total" not in data
+        assert "total_pages" not in data
+        assert len(data["items"]) == 1
+        # Only the admin lookup and the page select
+        assert len(queries) == 2
+        assert not any("count(" in statement.lower() for statement in queries)
+
+    def test_invalid_cursor(self, client, admin_headers):
+        """Test that an unknown cursor is rejected"""
+        response = client.get(f"/api/admin/brands?cursor={uuid4()}", headers=admin_headers)
+        assert response.status_code == 400
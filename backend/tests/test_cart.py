@@ -1,178 +1,275 @@
 """Tests for shopping cart functionality."""
+import json
 from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
 
 import pytest
+import pytest_asyncio
 from fastapi import status
+from sqlalchemy.orm import Session
 
+from app.core.dependencies import get_current_user
+from app.core.security import create_access_token
+from app.main import app
 from app.models.product import Brand, Category, Product, ProductVariant
 from app.models.user import User
 
-
-@pytest.fixture
-def sample_brand(db_session):
-    """Create a sample brand."""
-    brand = Brand(
-        name="Test Brand",
-        slug="test-brand",
-        description="Test brand for cart tests",
-        is_active=True,
-    )
-    db_session.add(brand)
-    db_session.commit()
-    db_session.refresh(brand)
-    return brand
-
-
-@pytest.fixture
-def sample_category(db_session):
-    """Create a sample category."""
-    category = Category(
-        name="Test Category",
-        slug="test-category",
-        description="Test category for cart tests",
-        is_active=True,
-    )
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(category)
-    return category
-
-
-@pytest.fixture
-def sample_products(db_session, sample_brand, sample_category):
+pytestmark = pytest.mark.asyncio
+
+# Prices used by the sample catalog, parsed once at import
+_DEC_0 = Decimal("0.00")
+_DEC_200 = Decimal("200.00")
+_DEC_1000 = Decimal("1000.00")
+_DEC_1500 = Decimal("1500.00")
+_DEC_2000 = Decimal("2000.00")
+_DEC_3000 = Decimal("3000.00")
+
+
+def _bulk_commit(engine, model, rows):
+    """Commit plain row mappings in one batched INSERT, skipping the unit of work.
+
+    Returns lightweight read-only stand-ins carrying the inserted columns.
+    """
+    with Session(engine) as session:
+        session.bulk_insert_mappings(model, rows)
+        session.commit()
+    return [SimpleNamespace(**row) for row in rows]
+
+
+def _delete(engine, model, *ids):
+    """Delete rows committed by a module-scoped fixture."""
+    with Session(engine) as session:
+        session.query(model).filter(model.id.in_(ids)).delete()
+        session.commit()
+
+
+# Catalog and user fixtures are committed once per module and only read by
+# the tests; anything a test changes happens inside its db_session
+# transaction and is rolled back, so the rows are never modified.
+
+
+@pytest.fixture(scope="module")
+def seed_baseline(db_schema):
+    """Seed the brand, category and two users in a single transaction.
+
+    Ids are generated client-side, so each table is one batched INSERT and
+    nothing has to be read back.
+    """
+    rows = {
+        Brand: [{
+            "id": uuid4(),
+            "name": "Test Brand",
+            "slug": "test-brand",
+            "description": "Test brand for cart tests",
+            "is_active": True,
+        }],
+        Category: [{
+            "id": uuid4(),
+            "name": "Test Category",
+            "slug": "test-category",
+            "description": "Test category for cart tests",
+            "is_active": True,
+        }],
+        User: [
+            {
+                "id": uuid4(),
+                "email": "testuser@example.com",
+                "google_id": "test123",
+                "full_name": "Test User",
+                "is_active": True,
+            },
+            {
+                "id": uuid4(),
+                "email": "anotheruser@example.com",
+                "google_id": "test456",
+                "full_name": "Another User",
+                "is_active": True,
+            },
+        ],
+    }
+
+    with Session(db_schema) as session:
+        for model, mappings in rows.items():
+            session.bulk_insert_mappings(model, mappings)
+        session.commit()
+
+    brand, category, users = (
+        [SimpleNamespace(**row) for row in rows[model]] for model in (Brand, Category, User)
+    )
+    yield {"brand": brand[0], "category": category[0], "users": users}
+
+    with Session(db_schema) as session:
+        for model in (User, Category, Brand):
+            session.query(model).filter(model.id.in_([row["id"] for row in rows[model]])).delete()
+        session.commit()
+
+
+@pytest.fixture(scope="module")
+def sample_brand(seed_baseline):
+    """Sample brand."""
+    return seed_baseline["brand"]
+
+
+@pytest.fixture(scope="module")
+def sample_category(seed_baseline):
+    """Sample category."""
+    return seed_baseline["category"]
+
+
+@pytest.fixture(scope="module")
+def sample_products(db_schema, sample_brand, sample_category):
     """Create sample products for cart testing."""
-    products = [
-        Product(
-            title="Product 1",
-            slug="product-1",
-            description="First test product",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("1000.00"),
-            inventory_count=50,
-            is_active=True,
-        ),
-        Product(
-            title="Product 2",
-            slug="product-2",
-            description="Second test product",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("2000.00"),
-            inventory_count=10,
-            is_active=True,
-        ),
-        Product(
-            title="Out of Stock Product",
-            slug="out-of-stock",
-            description="Product with no stock",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("1500.00"),
-            inventory_count=0,
-            is_active=True,
-        ),
-        Product(
-            title="Inactive Product",
-            slug="inactive-product",
-            description="Product that is not active",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("3000.00"),
-            inventory_count=100,
-            is_active=False,
-        ),
+    common = {
+        "brand_id": sample_brand.id,
+        "category_id": sample_category.id,
+    }
+    products_data = [
+        {
+            "title": "Product 1",
+            "slug": "product-1",
+            "description": "First test product",
+            "base_price": _DEC_1000,
+            "inventory_count": 50,
+            "is_active": True,
+        },
+        {
+            "title": "Product 2",
+            "slug": "product-2",
+            "description": "Second test product",
+            "base_price": _DEC_2000,
+            "inventory_count": 10,
+            "is_active": True,
+        },
+        {
+            "title": "Out of Stock Product",
+            "slug": "out-of-stock",
+            "description": "Product with no stock",
+            "base_price": _DEC_1500,
+            "inventory_count": 0,
+            "is_active": True,
+        },
+        {
+            "title": "Inactive Product",
+            "slug": "inactive-product",
+            "description": "Product that is not active",
+            "base_price": _DEC_3000,
+            "inventory_count": 100,
+            "is_active": False,
+        },
     ]
+    # Ids are generated here so no RETURNING round-trip is needed
+    products_data = [{"id": uuid4(), **common, **data} for data in products_data]
 
-    for product in products:
-        db_session.add(product)
-    db_session.commit()
+    yield _bulk_commit(db_schema, Product, products_data)
+    _delete(db_schema, Product, *[data["id"] for data in products_data])
 
-    return products
 
-
-@pytest.fixture
-def sample_variants(db_session, sample_products):
+@pytest.fixture(scope="module")
+def sample_variants(db_schema, sample_products):
     """Create sample product variants."""
     product = sample_products[0]  # Product 1
 
-    variants = [
-        ProductVariant(
-            product_id=product.id,
-            variant_type="Size",
-            variant_value="Small",
-            price_adjustment=Decimal("0.00"),
-            inventory_count=20,
-        ),
-        ProductVariant(
-            product_id=product.id,
-            variant_type="Size",
-            variant_value="Large",
-            price_adjustment=Decimal("200.00"),
-            inventory_count=5,
-        ),
+    variants_data = [
+        {
+            "id": uuid4(),
+            "product_id": product.id,
+            "variant_type": "Size",
+            "variant_value": "Small",
+            "price_adjustment": _DEC_0,
+            "inventory_count": 20,
+        },
+        {
+            "id": uuid4(),
+            "product_id": product.id,
+            "variant_type": "Size",
+            "variant_value": "Large",
+            "price_adjustment": _DEC_200,
+            "inventory_count": 5,
+        },
     ]
 
-    for variant in variants:
-        db_session.add(variant)
-    db_session.commit()
+    yield _bulk_commit(db_schema, ProductVariant, variants_data)
+    _delete(db_schema, ProductVariant, *[data["id"] for data in variants_data])
 
-    return variants
 
-
-@pytest.fixture
-def authenticated_user(db_session):
-    """Create authenticated user for testing."""
-    user = User(
-        email="testuser@example.com",
-        google_id="test123",
-        full_name="Test User",
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+@pytest.fixture(scope="module")
+def authenticated_user(seed_baseline):
+    """Authenticated user for testing."""
+    return seed_baseline["users"][0]
 
 
-@pytest.fixture
-def another_user(db_session):
-    """Create another user for authorization testing."""
-    user = User(
-        email="anotheruser@example.com",
-        google_id="test456",
-        full_name="Another User",
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+@pytest.fixture(scope="module")
+def another_user(seed_baseline):
+    """Another user for authorization testing."""
+    return seed_baseline["users"][1]
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def user_token(authenticated_user):
     """Create JWT token for authenticated user."""
-    from app.core.security import create_access_token
-
     return create_access_token(
         data={"sub": str(authenticated_user.id), "email": authenticated_user.email}
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def another_user_token(another_user):
     """Create JWT token for another user."""
-    from app.core.security import create_access_token
-
     return create_access_token(data={"sub": str(another_user.id), "email": another_user.email})
 
 
-def test_get_empty_cart(client, user_token):
+@pytest.fixture(scope="module")
+def user_auth_headers(user_token):
+    """Authorization headers for the authenticated user, built once."""
+    return {"Authorization": f"Bearer {user_token}"}
+
+
+@pytest.fixture(scope="module")
+def another_user_auth_headers(another_user_token):
+    """Authorization headers for another user, built once."""
+    return {"Authorization": f"Bearer {another_user_token}"}
+
+
+@pytest.fixture(scope="module")
+def add_item_request(sample_products):
+    """Request arguments adding two of Product 1, with the JSON body encoded once."""
+    return {
+        "headers": {"Content-Type": "application/json"},
+        "content": json.dumps({"productId": str(sample_products[0].id), "quantity": 2}).encode(),
+    }
+
+
+@pytest_asyncio.fixture
+async def existing_cart_item(aclient, add_item_request, user_auth_headers):
+    """Add two of Product 1 to the authenticated user's cart and return the item id."""
+    response = await aclient.post(
+        "/api/cart/items",
+        headers={**add_item_request["headers"], **user_auth_headers},
+        content=add_item_request["content"],
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+    return response.json()["id"]
+
+
+@pytest.fixture
+def stub_current_user(authenticated_user):
+    """Resolve get_current_user to the authenticated user without decoding a JWT.
+
+    For tests exercising cart logic rather than authentication; the
+    unauthorized and wrong-user tests keep going through the real token check.
+    """
+    user = User(**vars(authenticated_user))
+    app.dependency_overrides[get_current_user] = lambda: user
+    yield
+    app.dependency_overrides.pop(get_current_user, None)
+
+
+async def test_get_empty_cart(aclient, user_auth_headers):
     """Test getting empty cart creates one if it doesn't exist."""
-    response = client.get(
+    response = await aclient.get(
         "/api/cart",
-        headers={"Authorization": f"Bearer {user_token}"},
+        headers=user_auth_headers,
     )
 
     assert response.status_code == status.HTTP_200_OK
@@ -188,21 +285,22 @@ def test_get_empty_cart(client, user_token):
     assert float(data["totalAmount"]) == 0.0
 
 
-def test_get_cart_unauthorized(client):
+@pytest.mark.no_db
+async def test_get_cart_unauthorized(aclient):
     """Test that unauthenticated users cannot access cart."""
-    response = client.get("/api/cart")
+    response = await aclient.get("/api/cart")
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-def test_add_item_to_cart_success(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_add_item_to_cart_success(aclient, sample_products, add_item_request):
     """Test successfully adding item to cart."""
     product = sample_products[0]
 
-    response = client.post(
+    response = await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 2},
+        **add_item_request,
     )
 
     assert response.status_code == status.HTTP_201_CREATED
@@ -218,14 +316,14 @@ def test_add_item_to_cart_success(client, user_token, sample_products):
     assert float(data["subtotal"]) == 2000.00
 
 
-def test_add_item_with_variant(client, user_token, sample_products, sample_variants):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_add_item_with_variant(aclient, sample_products, sample_variants):
     """Test adding item with variant to cart."""
     product = sample_products[0]
     variant = sample_variants[1]  # Large variant
 
-    response = client.post(
+    response = await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={
             "productId": str(product.id),
             "productVariantId": str(variant.id),
@@ -245,22 +343,23 @@ def test_add_item_with_variant(client, user_token, sample_products, sample_varia
     assert float(data["unitPrice"]) == 1200.00
 
 
-def test_add_item_increases_quantity_if_exists(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_add_item_increases_quantity_if_exists(
+    aclient, sample_products, add_item_request,
+):
     """Test adding same item again increases quantity."""
     product = sample_products[0]
 
     # Add item first time
-    response1 = client.post(
+    response1 = await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 2},
+        **add_item_request,
     )
     assert response1.status_code == status.HTTP_201_CREATED
 
     # Add same item again
-    response2 = client.post(
+    response2 = await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product.id), "quantity": 3},
     )
     assert response2.status_code == status.HTTP_201_CREATED
@@ -270,81 +369,65 @@ def test_add_item_increases_quantity_if_exists(client, user_token, sample_produc
     assert data["quantity"] == 5
 
 
-def test_add_item_out_of_stock(client, user_token, sample_products):
-    """Test adding out of stock item returns error."""
-    product = sample_products[2]  # Out of stock product
-
-    response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 1},
-    )
+@pytest.mark.usefixtures("stub_current_user")
+@pytest.mark.parametrize(
+    "product_idx,variant_idx,quantity,expected_details",
+    [
+        (2, None, 1, ["stock"]),
+        (1, None, 15, ["insufficient stock"]),
+        (3, None, 1, ["not available"]),
+        (0, 1, 10, ["insufficient stock", "5 available"]),
+    ],
+    ids=["out_of_stock", "insufficient_stock", "inactive_product", "variant_stock"],
+)
+async def test_add_item_error_paths(
+    aclient, sample_products, sample_variants,
+    product_idx, variant_idx, quantity, expected_details,
+):
+    """Test that unavailable products and stock shortfalls are rejected."""
+    payload = {"productId": str(sample_products[product_idx].id), "quantity": quantity}
+    if variant_idx is not None:
+        payload["productVariantId"] = str(sample_variants[variant_idx].id)
+
+    response = await aclient.post("/api/cart/items", json=payload)
 
     assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert "stock" in response.json()["detail"].lower()
+    detail = response.json()["detail"].lower()
+    for expected in expected_details:
+        assert expected in detail
 
 
-def test_add_item_insufficient_stock(client, user_token, sample_products):
-    """Test adding more items than available returns error."""
-    product = sample_products[1]  # Product with 10 inventory
-
-    response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 15},
-    )
-
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert "insufficient stock" in response.json()["detail"].lower()
-
-
-def test_add_inactive_product(client, user_token, sample_products):
-    """Test adding inactive product returns error."""
-    product = sample_products[3]  # Inactive product
-
-    response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 1},
-    )
-
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert "not available" in response.json()["detail"].lower()
-
-
-def test_add_item_unauthorized(client, sample_products):
+@pytest.mark.no_db
+async def test_add_item_unauthorized(aclient):
     """Test adding item without authentication fails."""
-    product = sample_products[0]
-
-    response = client.post(
+    # Rejected before the product is looked up, so any id will do
+    response = await aclient.post(
         "/api/cart/items",
-        json={"productId": str(product.id), "quantity": 1},
+        json={"productId": str(uuid4()), "quantity": 1},
     )
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-def test_get_cart_with_items(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_get_cart_with_items(aclient, sample_products):
     """Test getting cart with items."""
     product1 = sample_products[0]
     product2 = sample_products[1]
 
     # Add two different items
-    client.post(
+    await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product1.id), "quantity": 2},
     )
-    client.post(
+    await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product2.id), "quantity": 1},
     )
 
     # Get cart
-    response = client.get(
+    response = await aclient.get(
         "/api/cart",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
 
     assert response.status_code == status.HTTP_200_OK
@@ -356,22 +439,12 @@ def test_get_cart_with_items(client, user_token, sample_products):
     assert float(data["totalAmount"]) == 4000.00
 
 
-def test_update_cart_item_quantity(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_update_cart_item_quantity(aclient, existing_cart_item):
     """Test updating cart item quantity."""
-    product = sample_products[0]
-
-    # Add item
-    add_response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 2},
-    )
-    cart_item_id = add_response.json()["id"]
-
     # Update quantity
-    response = client.put(
-        f"/api/cart/items/{cart_item_id}",
-        headers={"Authorization": f"Bearer {user_token}"},
+    response = await aclient.put(
+        f"/api/cart/items/{existing_cart_item}",
         json={"quantity": 5},
     )
 
@@ -382,22 +455,21 @@ def test_update_cart_item_quantity(client, user_token, sample_products):
     assert float(data["subtotal"]) == 5000.00
 
 
-def test_update_cart_item_insufficient_stock(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_update_cart_item_insufficient_stock(aclient, sample_products):
     """Test updating quantity to more than available returns error."""
     product = sample_products[1]  # Product with 10 inventory
 
     # Add item
-    add_response = client.post(
+    add_response = await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product.id), "quantity": 2},
     )
     cart_item_id = add_response.json()["id"]
 
     # Try to update to quantity beyond stock
-    response = client.put(
+    response = await aclient.put(
         f"/api/cart/items/{cart_item_id}",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"quantity": 15},
     )
 
@@ -405,197 +477,136 @@ def test_update_cart_item_insufficient_stock(client, user_token, sample_products
     assert "insufficient stock" in response.json()["detail"].lower()
 
 
-def test_update_cart_item_not_found(client, user_token):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_update_cart_item_not_found(aclient):
     """Test updating non-existent cart item returns 404."""
-    from uuid import uuid4
-
     fake_id = uuid4()
 
-    response = client.put(
+    response = await aclient.put(
         f"/api/cart/items/{fake_id}",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"quantity": 5},
     )
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-def test_update_cart_item_wrong_user(client, user_token, another_user_token, sample_products):
+async def test_update_cart_item_wrong_user(aclient, another_user_auth_headers, existing_cart_item):
     """Test updating another user's cart item returns 404."""
-    product = sample_products[0]
-
-    # User 1 adds item
-    add_response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 2},
-    )
-    cart_item_id = add_response.json()["id"]
-
     # User 2 tries to update user 1's cart item
-    response = client.put(
-        f"/api/cart/items/{cart_item_id}",
-        headers={"Authorization": f"Bearer {another_user_token}"},
+    response = await aclient.put(
+        f"/api/cart/items/{existing_cart_item}",
+        headers=another_user_auth_headers,
         json={"quantity": 5},
     )
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-def test_remove_cart_item(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_remove_cart_item(aclient, existing_cart_item):
     """Test removing item from cart."""
-    product = sample_products[0]
-
-    # Add item
-    add_response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 2},
-    )
-    cart_item_id = add_response.json()["id"]
-
     # Remove item
-    response = client.delete(
-        f"/api/cart/items/{cart_item_id}",
-        headers={"Authorization": f"Bearer {user_token}"},
+    response = await aclient.delete(
+        f"/api/cart/items/{existing_cart_item}",
     )
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
 
     # Verify cart is now empty
-    cart_response = client.get(
+    cart_response = await aclient.get(
         "/api/cart",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     assert len(cart_response.json()["items"]) == 0
 
 
-def test_remove_cart_item_not_found(client, user_token):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_remove_cart_item_not_found(aclient):
     """Test removing non-existent cart item returns 404."""
-    from uuid import uuid4
-
     fake_id = uuid4()
 
-    response = client.delete(
+    response = await aclient.delete(
         f"/api/cart/items/{fake_id}",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-def test_remove_cart_item_wrong_user(client, user_token, another_user_token, sample_products):
+async def test_remove_cart_item_wrong_user(aclient, another_user_auth_headers, existing_cart_item):
     """Test removing another user's cart item returns 404."""
-    product = sample_products[0]
-
-    # User 1 adds item
-    add_response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 2},
-    )
-    cart_item_id = add_response.json()["id"]
-
     # User 2 tries to remove user 1's cart item
-    response = client.delete(
-        f"/api/cart/items/{cart_item_id}",
-        headers={"Authorization": f"Bearer {another_user_token}"},
+    response = await aclient.delete(
+        f"/api/cart/items/{existing_cart_item}",
+        headers=another_user_auth_headers,
     )
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-def test_clear_cart(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_clear_cart(aclient, sample_products):
     """Test clearing entire cart."""
     product1 = sample_products[0]
     product2 = sample_products[1]
 
     # Add multiple items
-    client.post(
+    await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product1.id), "quantity": 2},
     )
-    client.post(
+    await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product2.id), "quantity": 1},
     )
 
     # Clear cart
-    response = client.delete(
+    response = await aclient.delete(
         "/api/cart",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
 
     assert response.status_code == status.HTTP_204_NO_CONTENT
 
     # Verify cart is empty
-    cart_response = client.get(
+    cart_response = await aclient.get(
         "/api/cart",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
     data = cart_response.json()
     assert len(data["items"]) == 0
     assert data["totalItems"] == 0
 
 
-def test_clear_cart_unauthorized(client):
+@pytest.mark.no_db
+async def test_clear_cart_unauthorized(aclient):
     """Test clearing cart without authentication fails."""
-    response = client.delete("/api/cart")
+    response = await aclient.delete("/api/cart")
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-def test_cart_availability_check(client, user_token, sample_products):
-    """Test that cart response includes availability status."""
+@pytest.mark.usefixtures("stub_current_user")
+async def test_cart_response_fields(aclient, sample_products):
+    """Test that cart response includes availability status and computed fields."""
     product = sample_products[0]
 
     # Add item
-    client.post(
+    await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 2},
-    )
-
-    # Get cart
-    response = client.get(
-        "/api/cart",
-        headers={"Authorization": f"Bearer {user_token}"},
-    )
-
-    data = response.json()
-    assert len(data["items"]) == 1
-    assert "isAvailable" in data["items"][0]
-    assert data["items"][0]["isAvailable"] is True
-    assert "hasUnavailableItems" in data
-    assert data["hasUnavailableItems"] is False
-
-
-def test_cart_computed_fields(client, user_token, sample_products):
-    """Test that cart response includes computed fields."""
-    product = sample_products[0]
-
-    # Add item
-    client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product.id), "quantity": 3},
     )
 
     # Get cart
-    response = client.get(
+    response = await aclient.get(
         "/api/cart",
-        headers={"Authorization": f"Bearer {user_token}"},
     )
 
     data = response.json()
+    assert len(data["items"]) == 1
     item = data["items"][0]
 
     # Check item computed fields
     assert "unitPrice" in item
     assert "subtotal" in item
     assert "isAvailable" in item
+    assert item["isAvailable"] is True
     assert float(item["unitPrice"]) == 1000.00
     assert float(item["subtotal"]) == 3000.00
 
@@ -603,38 +614,18 @@ def test_cart_computed_fields(client, user_token, sample_products):
     assert "totalItems" in data
     assert "totalAmount" in data
     assert "hasUnavailableItems" in data
+    assert data["hasUnavailableItems"] is False
     assert data["totalItems"] == 3
     assert float(data["totalAmount"]) == 3000.00
 
 
-def test_variant_stock_validation(client, user_token, sample_products, sample_variants):
-    """Test that variant stock is validated correctly."""
-    product = sample_products[0]
-    variant = sample_variants[1]  # Large variant with 5 stock
-
-    # Try to add more than available variant stock
-    response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={
-            "productId": str(product.id),
-            "productVariantId": str(variant.id),
-            "quantity": 10,
-        },
-    )
-
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert "insufficient stock" in response.json()["detail"].lower()
-    assert "5 available" in response.json()["detail"].lower()
-
-
-def test_add_zero_quantity(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_add_zero_quantity(aclient, sample_products):
     """Test that adding zero quantity is rejected."""
     product = sample_products[0]
 
-    response = client.post(
+    response = await aclient.post(
         "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product.id), "quantity": 0},
     )
 
@@ -642,22 +633,12 @@ def test_add_zero_quantity(client, user_token, sample_products):
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-def test_update_zero_quantity(client, user_token, sample_products):
+@pytest.mark.usefixtures("stub_current_user")
+async def test_update_zero_quantity(aclient, existing_cart_item):
     """Test that updating to zero quantity is rejected."""
-    product = sample_products[0]
-
-    # Add item
-    add_response = client.post(
-        "/api/cart/items",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id), "quantity": 2},
-    )
-    cart_item_id = add_response.json()["id"]
-
     # Try to update to zero
-    response = client.put(
-        f"/api/cart/items/{cart_item_id}",
-        headers={"Authorization": f"Bearer {user_token}"},
+    response = await aclient.put(
+        f"/api/cart/items/{existing_cart_item}",
         json={"quantity": 0},
     )
 
@@ -2,6 +2,7 @@
 Tests for guest order and booking linking functionality
 """
 import pytest
+from sqlalchemy import insert, select
 from app.models.user import User
 from app.models.booking import Booking
 from app.models.order import Order, OrderItem
@@ -22,8 +23,7 @@ def service_package(db_session):
         is_active=True
     )
     db_session.add(package)
-    db_session.commit()
-    db_session.refresh(package)
+    db_session.flush()
     return package
 
 
@@ -37,8 +37,7 @@ def transport_location(db_session):
         is_active=True
     )
     db_session.add(location)
-    db_session.commit()
-    db_session.refresh(location)
+    db_session.flush()
     return location
 
 
@@ -55,11 +54,8 @@ def brand_and_category(db_session):
         slug="makeup",
         is_active=True
     )
-    db_session.add(brand)
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(brand)
-    db_session.refresh(category)
+    db_session.add_all([brand, category])
+    db_session.flush()
     return brand, category
 
 
@@ -78,8 +74,7 @@ def product(db_session, brand_and_category):
         is_active=True
     )
     db_session.add(product)
-    db_session.commit()
-    db_session.refresh(product)
+    db_session.flush()
     return product
 
 
@@ -189,48 +184,48 @@ def test_link_guest_orders_to_user(db_session, product):
     assert order.guest_email == guest_email  # Guest info preserved
 
 
-def test_link_multiple_guest_data(db_session, service_package, transport_location, product):
+def test_link_multiple_guest_data(db_session, service_package, transport_location, product, count_queries):
     """Test linking multiple guest orders and bookings at once"""
     guest_email = "guest@example.com"
 
-    # Create 2 guest bookings
-    for i in range(2):
-        booking = Booking(
-            booking_number=f"BK2025011800{i+1}",
-            guest_email=guest_email,
-            guest_name="Guest User",
-            guest_phone="+254712345678",
-            package_id=service_package.id,
-            location_id=transport_location.id,
-            booking_date=date(2025, 6, i+1),
-            booking_time=time(10, 0),
-            num_brides=1,
-            num_maids=0,
-            num_mothers=0,
-            num_others=0,
-            subtotal=Decimal("15000.00"),
-            transport_cost=Decimal("1000.00"),
-            total_amount=Decimal("16000.00"),
-            deposit_amount=Decimal("8000.00"),
-            status="pending"
-        )
-        db_session.add(booking)
-
-    # Create 3 guest orders
-    for i in range(3):
-        order = Order(
-            order_number=f"ORD2025011800{i+1}",
-            guest_email=guest_email,
-            guest_name="Guest User",
-            guest_phone="+254712345678",
-            subtotal=Decimal("500.00"),
-            delivery_fee=Decimal("200.00"),
-            total_amount=Decimal("700.00"),
-            payment_method="mpesa",
-            payment_confirmed=False,
-            status="pending"
-        )
-        db_session.add(order)
+    # Create 2 guest bookings and 3 guest orders, one multi-row INSERT each
+    db_session.execute(insert(Booking).values([
+        {
+            "booking_number": f"BK2025011800{i+1}",
+            "guest_email": guest_email,
+            "guest_name": "Guest User",
+            "guest_phone": "+254712345678",
+            "package_id": service_package.id,
+            "location_id": transport_location.id,
+            "booking_date": date(2025, 6, i+1),
+            "booking_time": time(10, 0),
+            "num_brides": 1,
+            "num_maids": 0,
+            "num_mothers": 0,
+            "num_others": 0,
+            "subtotal": Decimal("15000.00"),
+            "transport_cost": Decimal("1000.00"),
+            "total_amount": Decimal("16000.00"),
+            "deposit_amount": Decimal("8000.00"),
+            "status": "pending"
+        }
+        for i in range(2)
+    ]))
+    db_session.execute(insert(Order).values([
+        {
+            "order_number": f"ORD2025011800{i+1}",
+            "guest_email": guest_email,
+            "guest_name": "Guest User",
+            "guest_phone": "+254712345678",
+            "subtotal": Decimal("500.00"),
+            "delivery_fee": Decimal("200.00"),
+            "total_amount": Decimal("700.00"),
+            "payment_method": "mpesa",
+            "payment_confirmed": False,
+            "status": "pending"
+        }
+        for i in range(3)
+    ]))
 
     db_session.commit()
 
@@ -245,8 +240,10 @@ def test_link_multiple_guest_data(db_session, service_package, transport_locatio
     db_session.commit()
     db_session.refresh(user)
 
-    # Link all guest data
-    link_stats = link_guest_data_to_user(db_session, user.id, guest_email)
+    # Link all guest data: user lookup plus one statement for both tables
+    with count_queries() as queries:
+        link_stats = link_guest_data_to_user(db_session, user.id, guest_email)
+    assert len(queries) == 2
 
     # Verify all were linked
     assert link_stats["orders_linked"] == 3
@@ -352,24 +349,23 @@ def test_oauth_login_triggers_linking(db_session, service_package, transport_loc
     assert booking.user_id == user.id
 
 
-def test_existing_user_orders_not_affected(db_session, regular_user, product):
+def test_existing_user_orders_not_affected(db_session, regular_user):
     """Test that existing user orders are not affected by linking"""
     guest_email = "other_guest@example.com"
 
-    # Create an order for regular_user
-    existing_order = Order(
-        order_number="ORD202501180001",
-        user_id=regular_user.id,
-        subtotal=Decimal("1000.00"),
-        delivery_fee=Decimal("200.00"),
-        total_amount=Decimal("1200.00"),
-        payment_method="mpesa",
-        payment_confirmed=True,
-        status="shipped"
-    )
-    db_session.add(existing_order)
-    db_session.commit()
-    db_session.refresh(existing_order)
+    # Create an order for regular_user (no ORM instance needed)
+    order_id = db_session.execute(
+        insert(Order).values(
+            order_number="ORD202501180001",
+            user_id=regular_user.id,
+            subtotal=Decimal("1000.00"),
+            delivery_fee=Decimal("200.00"),
+            total_amount=Decimal("1200.00"),
+            payment_method="mpesa",
+            payment_confirmed=True,
+            status="shipped"
+        ).returning(Order.id)
+    ).scalar_one()
 
     # Try to link guest data (should have no effect)
     link_stats = link_guest_data_to_user(db_session, regular_user.id, guest_email)
@@ -377,7 +373,5 @@ def test_existing_user_orders_not_affected(db_session, regular_user, product):
     # Verify nothing was linked
     assert link_stats["orders_linked"] == 0
 
-    # Verify existing order unchanged
-    db_session.refresh(existing_order)
-    assert existing_order.user_id == regular_user.id
-    assert existing_order.payment_confirmed == True
+    # Verify existing order still belongs to its user
+    assert db_session.scalar(select(Order.user_id).where(Order.id == order_id)) == regular_user.id
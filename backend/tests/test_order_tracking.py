@@ -1,48 +1,94 @@
 """Tests for order tracking API."""
 from decimal import Decimal
-from datetime import datetime
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from uuid import uuid4
 
 import pytest
 from fastapi import status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
 from app.models.order import Order, OrderItem
 from app.models.product import Product
 from app.models.user import User
 
 
-@pytest.fixture
-def regular_user(db_session):
-    """Create a regular user for testing."""
-    user = User(
-        email="user@example.com",
-        google_id="user123",
-        full_name="Test User",
-        is_admin=False,
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
-
-
-@pytest.fixture
-def other_user(db_session):
-    """Create another user for testing."""
-    user = User(
-        email="other@example.com",
-        google_id="other123",
-        full_name="Other User",
-        is_admin=False,
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
-
-
-@pytest.fixture
+def _insert(session, model, **values):
+    """Insert one row through Core and return a read-only stand-in with its id."""
+    row_id = session.execute(insert(model).values(**values).returning(model.id)).scalar_one()
+    return SimpleNamespace(id=row_id, **values)
+
+
+# Users and the product are committed once per module and only read by the
+# tests; orders are created per test inside the db_session transaction and
+# rolled back.
+
+
+@pytest.fixture(scope="module")
+def seed_baseline(db_schema):
+    """Seed both users and the sample product in a single transaction.
+
+    Ids are generated client-side, so each table is one batched INSERT and
+    nothing has to be read back.
+    """
+    rows = {
+        User: [
+            {
+                "id": uuid4(),
+                "email": "user@example.com",
+                "google_id": "user123",
+                "full_name": "Test User",
+                "is_admin": False,
+                "is_active": True,
+            },
+            {
+                "id": uuid4(),
+                "email": "other@example.com",
+                "google_id": "other123",
+                "full_name": "Other User",
+                "is_admin": False,
+                "is_active": True,
+            },
+        ],
+        Product: [{
+            "id": uuid4(),
+            "title": "Test Product",
+            "slug": "test-product",
+            "description": "Test product description",
+            "base_price": Decimal("1000.00"),
+            "inventory_count": 100,
+            "is_active": True,
+        }],
+    }
+
+    with Session(db_schema) as session:
+        for model, mappings in rows.items():
+            session.bulk_insert_mappings(model, mappings)
+        session.commit()
+
+    users, products = ([SimpleNamespace(**row) for row in rows[model]] for model in (User, Product))
+    yield {"users": users, "product": products[0]}
+
+    with Session(db_schema) as session:
+        for model in (Product, User):
+            session.query(model).filter(model.id.in_([row["id"] for row in rows[model]])).delete()
+        session.commit()
+
+
+@pytest.fixture(scope="module")
+def regular_user(seed_baseline):
+    """Regular user for testing."""
+    return seed_baseline["users"][0]
+
+
+@pytest.fixture(scope="module")
+def other_user(seed_baseline):
+    """Another user for testing."""
+    return seed_baseline["users"][1]
+
+
+@pytest.fixture(scope="module")
 def user_token(regular_user):
     """Create JWT token for regular user."""
     from app.core.security import create_access_token
@@ -50,7 +96,7 @@ def user_token(regular_user):
     return create_access_token(data={"sub": str(regular_user.id), "email": regular_user.email})
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def other_token(other_user):
     """Create JWT token for other user."""
     from app.core.security import create_access_token
@@ -58,27 +104,18 @@ def other_token(other_user):
     return create_access_token(data={"sub": str(other_user.id), "email": other_user.email})
 
 
-@pytest.fixture
-def sample_product(db_session):
-    """Create a sample product."""
-    product = Product(
-        title="Test Product",
-        slug="test-product",
-        description="Test product description",
-        base_price=Decimal("1000.00"),
-        inventory_count=100,
-        is_active=True,
-    )
-    db_session.add(product)
-    db_session.commit()
-    db_session.refresh(product)
-    return product
+@pytest.fixture(scope="module")
+def sample_product(seed_baseline):
+    """Sample product."""
+    return seed_baseline["product"]
 
 
 @pytest.fixture
-def user_order(db_session, regular_user, sample_product):
-    """Create an order for an authenticated user."""
-    order = Order(
+def user_order_bare(db_session, regular_user):
+    """Create an order without items for an authenticated user."""
+    return _insert(
+        db_session,
+        Order,
         order_number="ORD-20250119-ABC12",
         user_id=regular_user.id,
         delivery_county="Nairobi",
@@ -92,10 +129,15 @@ def user_order(db_session, regular_user, sample_product):
         payment_confirmed=True,
         status="processing",
     )
-    db_session.add(order)
-    db_session.flush()
 
-    order_item = OrderItem(
+
+@pytest.fixture
+def user_order(db_session, user_order_bare, sample_product):
+    """Create an order with items for an authenticated user."""
+    order = user_order_bare
+    _insert(
+        db_session,
+        OrderItem,
         order_id=order.id,
         product_id=sample_product.id,
         product_title=sample_product.title,
@@ -105,16 +147,15 @@ def user_order(db_session, regular_user, sample_product):
         discount=Decimal("0.00"),
         total_price=Decimal("2000.00"),
     )
-    db_session.add(order_item)
-    db_session.commit()
-    db_session.refresh(order)
     return order
 
 
 @pytest.fixture
-def guest_order(db_session, sample_product):
-    """Create a guest order."""
-    order = Order(
+def guest_order_bare(db_session):
+    """Create a guest order without items."""
+    return _insert(
+        db_session,
+        Order,
         order_number="ORD-20250119-XYZ99",
         guest_email="guest@example.com",
         guest_name="Guest User",
@@ -130,10 +171,15 @@ def guest_order(db_session, sample_product):
         payment_confirmed=False,
         status="pending",
     )
-    db_session.add(order)
-    db_session.flush()
 
-    order_item = OrderItem(
+
+@pytest.fixture
+def guest_order(db_session, guest_order_bare, sample_product):
+    """Create a guest order with items."""
+    order = guest_order_bare
+    _insert(
+        db_session,
+        OrderItem,
         order_id=order.id,
         product_id=sample_product.id,
         product_title=sample_product.title,
@@ -143,9 +189,6 @@ def guest_order(db_session, sample_product):
         discount=Decimal("0.00"),
         total_price=Decimal("1000.00"),
     )
-    db_session.add(order_item)
-    db_session.commit()
-    db_session.refresh(order)
     return order
 
 
@@ -169,6 +212,7 @@ def test_get_user_orders_success(client, user_token, user_order):
     assert data["orders"][0]["orderNumber"] == user_order.order_number
 
 
+@pytest.mark.no_db
 def test_get_user_orders_unauthorized(client):
     """Test that unauthenticated requests are rejected."""
     response = client.get("/api/orders")
@@ -176,7 +220,7 @@ def test_get_user_orders_unauthorized(client):
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-def test_get_user_orders_pagination(client, user_token, user_order):
+def test_get_user_orders_pagination(client, user_token, user_order_bare):
     """Test pagination parameters."""
     response = client.get(
         "/api/orders?skip=0&limit=10",
@@ -188,6 +232,55 @@ def test_get_user_orders_pagination(client, user_token, user_order):
 
     assert data["skip"] == 0
     assert data["limit"] == 10
+    assert data["nextCursor"] is None
+
+
+def test_get_user_orders_cursor_pagination(client, db_session, user_token, regular_user):
+    """Test that following nextCursor walks the same pages as skip, newest first."""
+    created_at = datetime(2025, 1, 19, 12, 0)
+    for i in range(5):
+        _insert(
+            db_session,
+            Order,
+            order_number=f"ORD-20250119-PG{i:03d}",
+            user_id=regular_user.id,
+            delivery_county="Nairobi",
+            delivery_town="Nairobi",
+            delivery_address="123 Test Street",
+            subtotal=Decimal("1000.00"),
+            delivery_fee=Decimal("200.00"),
+            total_amount=Decimal("1200.00"),
+            payment_method="mpesa",
+            # Two orders share a timestamp, so the id breaks the tie
+            created_at=created_at + timedelta(minutes=min(i, 3)),
+        )
+    headers = {"Authorization": f"Bearer {user_token}"}
+
+    seen = []
+    url = "/api/orders?limit=2"
+    while url:
+        data = client.get(url, headers=headers).json()
+        assert data["total"] == 5
+        seen += [order["orderNumber"] for order in data["orders"]]
+        url = f"/api/orders?limit=2&cursor={data['nextCursor']}" if data["nextCursor"] else None
+
+    by_offset = [
+        order["orderNumber"]
+        for skip in (0, 2, 4)
+        for order in client.get(f"/api/orders?limit=2&skip={skip}", headers=headers).json()["orders"]
+    ]
+    assert seen == by_offset
+    assert sorted(seen) == [f"ORD-20250119-PG{i:03d}" for i in range(5)]
+
+
+def test_get_user_orders_invalid_cursor(client, user_token, other_user):
+    """Test that an unknown cursor is rejected."""
+    response = client.get(
+        f"/api/orders?cursor={other_user.id}",
+        headers={"Authorization": f"Bearer {user_token}"},
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
 
 
 def test_get_order_by_id_success(client, user_token, user_order):
@@ -217,10 +310,10 @@ def test_get_order_by_id_not_found(client, user_token):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-def test_get_order_by_id_forbidden(client, other_token, user_order):
+def test_get_order_by_id_forbidden(client, other_token, user_order_bare):
     """Test that users cannot access other users' orders."""
     response = client.get(
-        f"/api/orders/{user_order.id}",
+        f"/api/orders/{user_order_bare.id}",
         headers={"Authorization": f"Bearer {other_token}"},
     )
 
@@ -241,34 +334,31 @@ def test_track_order_authenticated_user(client, user_token, user_order):
     assert data["status"] == user_order.status
 
 
-def test_track_order_guest_with_email(client, guest_order):
-    """Test tracking guest order with correct email."""
-    response = client.get(
-        f"/api/orders/track/{guest_order.order_number}?email={guest_order.guest_email}"
-    )
-
-    assert response.status_code == status.HTTP_200_OK
+@pytest.mark.parametrize(
+    "email,expected_status",
+    [
+        ("guest@example.com", status.HTTP_200_OK),
+        ("GUEST@EXAMPLE.COM", status.HTTP_200_OK),
+        ("wrong@example.com", status.HTTP_403_FORBIDDEN),
+        (None, status.HTTP_400_BAD_REQUEST),
+    ],
+    ids=["matching", "case_insensitive", "wrong", "missing"],
+)
+def test_track_order_guest_email(client, guest_order, email, expected_status):
+    """Test that guest orders are tracked only with the order's email (any case)."""
+    url = f"/api/orders/track/{guest_order.order_number}"
+    if email is not None:
+        url += f"?email={email}"
+    response = client.get(url)
+
+    assert response.status_code == expected_status
     data = response.json()
 
-    assert data["orderNumber"] == guest_order.order_number
-    assert data["guestEmail"] == guest_order.guest_email
-
-
-def test_track_order_guest_wrong_email(client, guest_order):
-    """Test tracking guest order with wrong email."""
-    response = client.get(
-        f"/api/orders/track/{guest_order.order_number}?email=wrong@example.com"
-    )
-
-    assert response.status_code == status.HTTP_403_FORBIDDEN
-
-
-def test_track_order_guest_no_email(client, guest_order):
-    """Test tracking guest order without email parameter."""
-    response = client.get(f"/api/orders/track/{guest_order.order_number}")
-
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert "Email required" in response.json()["detail"]
+    if expected_status == status.HTTP_200_OK:
+        assert data["orderNumber"] == guest_order.order_number
+        assert data["guestEmail"] == guest_order.guest_email
+    elif email is None:
+        assert "Email required" in data["detail"]
 
 
 def test_track_order_not_found(client):
@@ -278,25 +368,12 @@ def test_track_order_not_found(client):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-def test_track_order_case_insensitive_email(client, guest_order):
-    """Test that email verification is case-insensitive."""
-    # Guest order has email "guest@example.com"
-    response = client.get(
-        f"/api/orders/track/{guest_order.order_number}?email=GUEST@EXAMPLE.COM"
-    )
-
-    assert response.status_code == status.HTTP_200_OK
-    data = response.json()
-
-    assert data["orderNumber"] == guest_order.order_number
-
-
 def test_track_order_authenticated_user_cannot_access_other_user_order(
-    client, other_token, user_order
+    client, other_token, user_order_bare
 ):
     """Test that authenticated users cannot track other users' orders."""
     response = client.get(
-        f"/api/orders/track/{user_order.order_number}",
+        f"/api/orders/track/{user_order_bare.order_number}",
         headers={"Authorization": f"Bearer {other_token}"},
     )
 
@@ -1,8 +1,12 @@
 """Tests for product review API."""
 from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
 
 import pytest
 from fastapi import status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
 from app.models.content import Review
 from app.models.order import Order, OrderItem
@@ -10,56 +14,96 @@ from app.models.product import Product
 from app.models.user import User
 
 
-@pytest.fixture
-def regular_user(db_session):
-    """Create a regular user for testing."""
-    user = User(
-        email="user@example.com",
-        google_id="user123",
-        full_name="Test User",
-        is_admin=False,
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+def _insert(session, model, **values):
+    """Insert one row through Core and return a read-only stand-in with its id."""
+    row_id = session.execute(insert(model).values(**values).returning(model.id)).scalar_one()
+    return SimpleNamespace(id=row_id, **values)
+
+
+# Users and the product are committed once per module and only read by the
+# tests; orders and reviews are created per test inside the db_session
+# transaction and rolled back.
+
+
+@pytest.fixture(scope="module")
+def seed_baseline(db_schema):
+    """Seed the three users and the sample product in a single transaction.
+
+    Ids are generated client-side, so each table is one batched INSERT and
+    nothing has to be read back.
+    """
+    rows = {
+        User: [
+            {
+                "id": uuid4(),
+                "email": "user@example.com",
+                "google_id": "user123",
+                "full_name": "Test User",
+                "is_admin": False,
+                "is_active": True,
+            },
+            {
+                "id": uuid4(),
+                "email": "other@example.com",
+                "google_id": "other123",
+                "full_name": "Other User",
+                "is_admin": False,
+                "is_active": True,
+            },
+            {
+                "id": uuid4(),
+                "email": "admin@example.com",
+                "google_id": "admin123",
+                "full_name": "Admin User",
+                "is_admin": True,
+                "admin_role": "super_admin",
+                "is_active": True,
+            },
+        ],
+        Product: [{
+            "id": uuid4(),
+            "title": "Test Lipstick",
+            "slug": "test-lipstick",
+            "description": "Test product description",
+            "base_price": Decimal("1500.00"),
+            "inventory_count": 100,
+            "is_active": True,
+        }],
+    }
 
+    with Session(db_schema) as session:
+        for model, mappings in rows.items():
+            session.bulk_insert_mappings(model, mappings)
+        session.commit()
 
-@pytest.fixture
-def other_user(db_session):
-    """Create another user for testing."""
-    user = User(
-        email="other@example.com",
-        google_id="other123",
-        full_name="Other User",
-        is_admin=False,
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    users, products = ([SimpleNamespace(**row) for row in rows[model]] for model in (User, Product))
+    yield {"users": users, "product": products[0]}
 
+    with Session(db_schema) as session:
+        for model in (Product, User):
+            session.query(model).filter(model.id.in_([row["id"] for row in rows[model]])).delete()
+        session.commit()
 
-@pytest.fixture
-def admin_user(db_session):
-    """Create an admin user for testing."""
-    user = User(
-        email="admin@example.com",
-        google_id="admin123",
-        full_name="Admin User",
-        is_admin=True,
-        admin_role="super_admin",
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
 
+@pytest.fixture(scope="module")
+def regular_user(seed_baseline):
+    """Regular user for testing."""
+    return seed_baseline["users"][0]
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
+def other_user(seed_baseline):
+    """Another user for testing."""
+    return seed_baseline["users"][1]
+
+
+@pytest.fixture(scope="module")
+def admin_user(seed_baseline):
+    """Admin user for testing."""
+    return seed_baseline["users"][2]
+
+
+@pytest.fixture(scope="module")
 def user_token(regular_user):
     """Create JWT token for regular user."""
     from app.core.security import create_access_token
@@ -67,7 +111,7 @@ def user_token(regular_user):
     return create_access_token(data={"sub": str(regular_user.id), "email": regular_user.email})
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def other_token(other_user):
     """Create JWT token for other user."""
     from app.core.security import create_access_token
@@ -75,7 +119,7 @@ def other_token(other_user):
     return create_access_token(data={"sub": str(other_user.id), "email": other_user.email})
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def admin_token(admin_user):
     """Create JWT token for admin user."""
     from app.core.security import create_access_token
@@ -83,27 +127,18 @@ def admin_token(admin_user):
     return create_access_token(data={"sub": str(admin_user.id), "email": admin_user.email})
 
 
-@pytest.fixture
-def sample_product(db_session):
-    """Create a sample product."""
-    product = Product(
-        title="Test Lipstick",
-        slug="test-lipstick",
-        description="Test product description",
-        base_price=Decimal("1500.00"),
-        inventory_count=100,
-        is_active=True,
-    )
-    db_session.add(product)
-    db_session.commit()
-    db_session.refresh(product)
-    return product
+@pytest.fixture(scope="module")
+def sample_product(seed_baseline):
+    """Sample product."""
+    return seed_baseline["product"]
 
 
 @pytest.fixture
 def delivered_order(db_session, regular_user, sample_product):
     """Create a delivered order for verified purchase testing."""
-    order = Order(
+    order = _insert(
+        db_session,
+        Order,
         order_number="ORD-20250119-TEST1",
         user_id=regular_user.id,
         delivery_county="Nairobi",
@@ -117,10 +152,10 @@ def delivered_order(db_session, regular_user, sample_product):
         payment_confirmed=True,
         status="delivered",
     )
-    db_session.add(order)
-    db_session.flush()
 
-    order_item = OrderItem(
+    _insert(
+        db_session,
+        OrderItem,
         order_id=order.id,
         product_id=sample_product.id,
         product_title=sample_product.title,
@@ -130,9 +165,6 @@ def delivered_order(db_session, regular_user, sample_product):
         discount=Decimal("0.00"),
         total_price=Decimal("1500.00"),
     )
-    db_session.add(order_item)
-    db_session.commit()
-    db_session.refresh(order)
     return order
 
 
@@ -237,30 +269,31 @@ def test_create_review_invalid_product(client, user_token):
 
 def test_get_product_reviews(client, db_session, sample_product, regular_user):
     """Test getting reviews for a product."""
+    # Two more reviewers besides regular_user, one batched INSERT per table
+    user_ids = db_session.execute(
+        insert(User).values([
+            {
+                "email": f"user{i}@example.com",
+                "google_id": f"user{i}123",
+                "full_name": f"User {i}",
+                "is_admin": False,
+                "is_active": True,
+            }
+            for i in (1, 2)
+        ]).returning(User.id)
+    ).scalars().all()
+
     # Create approved reviews
-    for i in range(3):
-        review = Review(
-            product_id=sample_product.id,
-            user_id=regular_user.id if i == 0 else None,
-            rating=5 - i,
-            review_text=f"Review {i+1} with enough text to pass validation requirements.",
-            is_approved=True,
-        )
-        if i > 0:
-            # Create temp user for other reviews
-            temp_user = User(
-                email=f"user{i}@example.com",
-                google_id=f"user{i}123",
-                full_name=f"User {i}",
-                is_admin=False,
-                is_active=True,
-            )
-            db_session.add(temp_user)
-            db_session.flush()
-            review.user_id = temp_user.id
-        db_session.add(review)
-
-    db_session.commit()
+    db_session.execute(insert(Review).values([
+        {
+            "product_id": sample_product.id,
+            "user_id": user_id,
+            "rating": 5 - i,
+            "review_text": f"Review {i+1} with enough text to pass validation requirements.",
+            "is_approved": True,
+        }
+        for i, user_id in enumerate([regular_user.id, *user_ids])
+    ]))
 
     response = client.get(f"/api/products/{sample_product.id}/reviews")
 
@@ -273,37 +306,82 @@ def test_get_product_reviews(client, db_session, sample_product, regular_user):
     assert len(data["reviews"]) == 3
 
 
-def test_get_product_reviews_only_approved(client, db_session, sample_product, regular_user):
-    """Test that only approved reviews are returned to public."""
-    # Create one approved and one unapproved review
-    approved_review = Review(
+def test_get_product_reviews_uses_index(explain, sample_product):
+    """Test that a page of approved reviews is read from the composite index."""
+    plan = explain(
+        "SELECT * FROM reviews WHERE product_id = :product_id AND is_approved = true "
+        "ORDER BY created_at DESC LIMIT 20",
         product_id=sample_product.id,
-        user_id=regular_user.id,
-        rating=5,
-        review_text="This is an approved review with sufficient text content.",
-        is_approved=True,
-    )
-    db_session.add(approved_review)
-
-    other_user = User(
-        email="temp@example.com",
-        google_id="temp123",
-        full_name="Temp User",
-        is_admin=False,
-        is_active=True,
     )
-    db_session.add(other_user)
-    db_session.flush()
+    assert "Index Scan using idx_reviews_product_approved_created" in plan
+    assert "Sort" not in plan
+
+
+def test_get_product_reviews_query_count(client, db_session, sample_product, count_queries):
+    """Test that the reviewers are loaded with the page, not one query per review."""
+    user_ids = db_session.execute(
+        insert(User).values([
+            {
+                "email": f"reviewer{i}@example.com",
+                "google_id": f"reviewer{i}",
+                "full_name": f"Reviewer {i}",
+                "is_admin": False,
+                "is_active": True,
+            }
+            for i in range(20)
+        ]).returning(User.id)
+    ).scalars().all()
+    db_session.execute(insert(Review).values([
+        {
+            "product_id": sample_product.id,
+            "user_id": user_id,
+            "rating": 4,
+            "review_text": "A review with enough text to pass validation requirements.",
+            "is_approved": True,
+        }
+        for user_id in user_ids
+    ]))
+
+    with count_queries() as queries:
+        response = client.get(f"/api/products/{sample_product.id}/reviews?pageSize=50")
 
-    unapproved_review = Review(
-        product_id=sample_product.id,
-        user_id=other_user.id,
-        rating=3,
-        review_text="This is an unapproved review that should not be visible.",
-        is_approved=False,
-    )
-    db_session.add(unapproved_review)
-    db_session.commit()
+    assert response.status_code == status.HTTP_200_OK
+    reviews = response.json()["reviews"]
+    assert len(reviews) == 20
+    assert all(review["user"]["fullName"].startswith("Reviewer") for review in reviews)
+    # The count, then the page joined to its reviewers
+    assert len(queries) <= 2
+
+
+def test_get_product_reviews_only_approved(client, db_session, sample_product, regular_user):
+    """Test that only approved reviews are returned to public."""
+    other_user_id = db_session.execute(
+        insert(User).values(
+            email="temp@example.com",
+            google_id="temp123",
+            full_name="Temp User",
+            is_admin=False,
+            is_active=True,
+        ).returning(User.id)
+    ).scalar_one()
+
+    # Create one approved and one unapproved review
+    db_session.execute(insert(Review).values([
+        {
+            "product_id": sample_product.id,
+            "user_id": regular_user.id,
+            "rating": 5,
+            "review_text": "This is an approved review with sufficient text content.",
+            "is_approved": True,
+        },
+        {
+            "product_id": sample_product.id,
+            "user_id": other_user_id,
+            "rating": 3,
+            "review_text": "This is an unapproved review that should not be visible.",
+            "is_approved": False,
+        },
+    ]))
 
     response = client.get(f"/api/products/{sample_product.id}/reviews")
 
@@ -315,29 +393,31 @@ def test_get_product_reviews_only_approved(client, db_session, sample_product, r
 
 def test_get_product_rating_summary(client, db_session, sample_product, regular_user):
     """Test getting product rating summary."""
-    # Create reviews with different ratings
+    # Create reviews with different ratings, one reviewer each
     ratings = [5, 5, 4, 4, 3]
-    for i, rating in enumerate(ratings):
-        user = User(
-            email=f"user{i}@example.com",
-            google_id=f"user{i}123",
-            full_name=f"User {i}",
-            is_admin=False,
-            is_active=True,
-        )
-        db_session.add(user)
-        db_session.flush()
-
-        review = Review(
-            product_id=sample_product.id,
-            user_id=user.id,
-            rating=rating,
-            review_text=f"Review with rating {rating} and sufficient text length.",
-            is_approved=True,
-        )
-        db_session.add(review)
-
-    db_session.commit()
+    user_ids = db_session.execute(
+        insert(User).values([
+            {
+                "email": f"user{i}@example.com",
+                "google_id": f"user{i}123",
+                "full_name": f"User {i}",
+                "is_admin": False,
+                "is_active": True,
+            }
+            for i in range(len(ratings))
+        ]).returning(User.id)
+    ).scalars().all()
+
+    db_session.execute(insert(Review).values([
+        {
+            "product_id": sample_product.id,
+            "user_id": user_id,
+            "rating": rating,
+            "review_text": f"Review with rating {rating} and sufficient text length.",
+            "is_approved": True,
+        }
+        for user_id, rating in zip(user_ids, ratings)
+    ]))
 
     response = client.get(f"/api/products/{sample_product.id}/reviews/summary")
 
@@ -362,8 +442,7 @@ def test_update_review_success(client, db_session, user_token, sample_product, r
         is_approved=True,
     )
     db_session.add(review)
-    db_session.commit()
-    db_session.refresh(review)
+    db_session.flush()
 
     # Update review
     update_data = {
@@ -396,8 +475,7 @@ def test_update_review_forbidden(client, db_session, other_token, sample_product
         is_approved=True,
     )
     db_session.add(review)
-    db_session.commit()
-    db_session.refresh(review)
+    db_session.flush()
 
     # Try to update with other_user token
     update_data = {
@@ -425,8 +503,7 @@ def test_delete_review_success(client, db_session, user_token, sample_product, r
         is_approved=True,
     )
     db_session.add(review)
-    db_session.commit()
-    db_session.refresh(review)
+    db_session.flush()
 
     response = client.delete(
         f"/api/reviews/{review.id}",
@@ -451,8 +528,7 @@ def test_admin_approve_review(client, db_session, admin_token, sample_product, r
         is_approved=False,
     )
     db_session.add(review)
-    db_session.commit()
-    db_session.refresh(review)
+    db_session.flush()
 
     # Admin approves review
     update_data = {
@@ -484,8 +560,7 @@ def test_admin_update_review_unauthorized(client, db_session, user_token, sample
         is_approved=False,
     )
     db_session.add(review)
-    db_session.commit()
-    db_session.refresh(review)
+    db_session.flush()
 
     update_data = {"isApproved": True}
 
@@ -509,13 +584,21 @@ def test_mark_review_helpful(client, db_session, sample_product, regular_user):
         helpful_count=0,
     )
     db_session.add(review)
-    db_session.commit()
-    db_session.refresh(review)
+    db_session.flush()
 
-    response = client.post(f"/api/reviews/{review.id}/helpful")
+    for expected in (1, 2):
+        response = client.post(f"/api/reviews/{review.id}/helpful")
 
-    assert response.status_code == status.HTTP_200_OK
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["helpfulCount"] == expected
+
+    # Verify each vote incremented the stored count
+    db_session.refresh(review, attribute_names=["helpful_count"])
+    assert review.helpful_count == 2
+
+
+def test_mark_review_helpful_not_found(client):
+    """Test marking a non-existent review as helpful."""
+    response = client.post("/api/reviews/00000000-0000-0000-0000-000000000000/helpful")
 
-    # Verify helpful count incremented
-    db_session.refresh(review)
-    assert review.helpful_count == 1
+    assert response.status_code == status.HTTP_404_NOT_FOUND
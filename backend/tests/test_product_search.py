@@ -1,143 +1,137 @@
 """Tests for product search functionality."""
 from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
 
 import pytest
 from fastapi import status
+from sqlalchemy.orm import Session
 
 from app.models.product import Brand, Category, Product
 
 
-@pytest.fixture
-def sample_brand(db_session):
-    """Create a sample brand."""
-    brand = Brand(
-        name="Fenty Beauty",
-        slug="fenty-beauty",
-        description="Beauty for all",
-        is_active=True,
-    )
-    db_session.add(brand)
-    db_session.commit()
-    db_session.refresh(brand)
-    return brand
-
-
-@pytest.fixture
-def another_brand(db_session):
-    """Create another brand."""
-    brand = Brand(
-        name="MAC Cosmetics",
-        slug="mac-cosmetics",
-        description="Professional makeup",
-        is_active=True,
-    )
-    db_session.add(brand)
-    db_session.commit()
-    db_session.refresh(brand)
-    return brand
-
-
-@pytest.fixture
-def sample_category(db_session):
-    """Create a sample category."""
-    category = Category(
-        name="Foundation",
-        slug="foundation",
-        description="Face foundations",
-        is_active=True,
-    )
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(category)
-    return category
-
-
-@pytest.fixture
-def another_category(db_session):
-    """Create another category."""
-    category = Category(
-        name="Lipstick",
-        slug="lipstick",
-        description="Lip colors",
-        is_active=True,
-    )
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(category)
-    return category
+# The brands, categories and products are committed once per module and only
+# read by the search tests.
+
 
+@pytest.fixture(scope="module")
+def seed_baseline(db_schema):
+    """Seed the search catalog in a single transaction.
 
-@pytest.fixture
-def sample_products(db_session, sample_brand, another_brand, sample_category, another_category):
-    """Create sample products for search testing."""
+    Ids are generated client-side, so each table is one batched INSERT and
+    nothing has to be read back.
+    """
+    fenty, mac = (
+        {"id": uuid4(), "name": name, "slug": slug, "description": description, "is_active": True}
+        for name, slug, description in (
+            ("Fenty Beauty", "fenty-beauty", "Beauty for all"),
+            ("MAC Cosmetics", "mac-cosmetics", "Professional makeup"),
+        )
+    )
+    foundation, lipstick = (
+        {"id": uuid4(), "name": name, "slug": slug, "description": description, "is_active": True}
+        for name, slug, description in (
+            ("Foundation", "foundation", "Face foundations"),
+            ("Lipstick", "lipstick", "Lip colors"),
+        )
+    )
     products = [
-        Product(
-            title="Fenty Pro Filt'r Foundation",
-            slug="fenty-pro-filtr-foundation",
-            description="Long-wearing foundation with buildable coverage",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("3400.00"),
-            inventory_count=50,
-            is_active=True,
-        ),
-        Product(
-            title="MAC Studio Fix Fluid Foundation",
-            slug="mac-studio-fix-fluid",
-            description="Medium-to-full coverage foundation",
-            brand_id=another_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("2800.00"),
-            inventory_count=30,
-            is_active=True,
-        ),
-        Product(
-            title="Fenty Stunna Lip Paint",
-            slug="fenty-stunna-lip-paint",
-            description="Longwear fluid lip color",
-            brand_id=sample_brand.id,
-            category_id=another_category.id,
-            base_price=Decimal("2000.00"),
-            inventory_count=100,
-            is_active=True,
-        ),
-        Product(
-            title="MAC Ruby Woo Lipstick",
-            slug="mac-ruby-woo-lipstick",
-            description="Iconic matte red lipstick",
-            brand_id=another_brand.id,
-            category_id=another_category.id,
-            base_price=Decimal("1800.00"),
-            inventory_count=75,
-            is_active=True,
-        ),
-        Product(
-            title="Expensive Luxury Foundation",
-            slug="expensive-luxury-foundation",
-            description="Premium high-end foundation",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("8000.00"),
-            inventory_count=10,
-            is_active=True,
-        ),
-        Product(
-            title="Inactive Foundation Product",
-            slug="inactive-foundation",
-            description="This product is inactive",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("1000.00"),
-            inventory_count=0,
-            is_active=False,  # Inactive product
-        ),
+        {
+            "title": "Fenty Pro Filt'r Foundation",
+            "slug": "fenty-pro-filtr-foundation",
+            "description": "Long-wearing foundation with buildable coverage",
+            "brand_id": fenty["id"],
+            "category_id": foundation["id"],
+            "base_price": Decimal("3400.00"),
+            "inventory_count": 50,
+            "is_active": True,
+        },
+        {
+            "title": "MAC Studio Fix Fluid Foundation",
+            "slug": "mac-studio-fix-fluid",
+            "description": "Medium-to-full coverage foundation",
+            "brand_id": mac["id"],
+            "category_id": foundation["id"],
+            "base_price": Decimal("2800.00"),
+            "inventory_count": 30,
+            "is_active": True,
+        },
+        {
+            "title": "Fenty Stunna Lip Paint",
+            "slug": "fenty-stunna-lip-paint",
+            "description": "Longwear fluid lip color",
+            "brand_id": fenty["id"],
+            "category_id": lipstick["id"],
+            "base_price": Decimal("2000.00"),
+            "inventory_count": 100,
+            "is_active": True,
+        },
+        {
+            "title": "MAC Ruby Woo Lipstick",
+            "slug": "mac-ruby-woo-lipstick",
+            "description": "Iconic matte red lipstick",
+            "brand_id": mac["id"],
+            "category_id": lipstick["id"],
+            "base_price": Decimal("1800.00"),
+            "inventory_count": 75,
+            "is_active": True,
+        },
+        {
+            "title": "Expensive Luxury Foundation",
+            "slug": "expensive-luxury-foundation",
+            "description": "Premium high-end foundation",
+            "brand_id": fenty["id"],
+            "category_id": foundation["id"],
+            "base_price": Decimal("8000.00"),
+            "inventory_count": 10,
+            "is_active": True,
+        },
+        {
+            "title": "Inactive Foundation Product",
+            "slug": "inactive-foundation",
+            "description": "This product is inactive",
+            "brand_id": fenty["id"],
+            "category_id": foundation["id"],
+            "base_price": Decimal("1000.00"),
+            "inventory_count": 0,
+            "is_active": False,  # Inactive product
+        },
     ]
+    rows = {
+        Brand: [fenty, mac],
+        Category: [foundation, lipstick],
+        Product: [{"id": uuid4(), **product} for product in products],
+    }
+
+    with Session(db_schema) as session:
+        for model, mappings in rows.items():
+            session.bulk_insert_mappings(model, mappings)
+        session.commit()
+
+    yield {model: [SimpleNamespace(**row) for row in mappings] for model, mappings in rows.items()}
+
+    with Session(db_schema) as session:
+        for model in (Product, Category, Brand):
+            session.query(model).filter(model.id.in_([row["id"] for row in rows[model]])).delete()
+        session.commit()
+
 
-    for product in products:
-        db_session.add(product)
-    db_session.commit()
+@pytest.fixture(scope="module")
+def sample_brand(seed_baseline):
+    """Sample brand."""
+    return seed_baseline[Brand][0]
 
-    return products
+
+@pytest.fixture(scope="module")
+def sample_category(seed_baseline):
+    """Sample category."""
+    return seed_baseline[Category][0]
+
+
+@pytest.fixture(scope="module")
+def sample_products(seed_baseline):
+    """Sample products for search testing."""
+    return seed_baseline[Product]
 
 
 def test_search_products_by_title(client, sample_products):
@@ -250,12 +244,24 @@ def test_search_products_pagination(client, sample_products):
     assert data["skip"] == 0
     assert data["limit"] == 2
 
+    first_page = [product["id"] for product in data["products"]]
+    next_cursor = data["next_cursor"]
+    assert next_cursor == first_page[-1]
+
     # Get second page
     response = client.get("/products/search?q=fenty&skip=2&limit=2")
     data = response.json()
 
     assert data["total"] == 3
     assert len(data["products"]) == 1  # Only 1 remaining
+    assert data["next_cursor"] is None
+
+    # The cursor continues where the first page ended, like skip does
+    response = client.get(f"/products/search?q=fenty&limit=2&cursor={next_cursor}")
+    assert response.status_code == status.HTTP_200_OK
+    cursor_page = [product["id"] for product in response.json()["products"]]
+    assert cursor_page == [product["id"] for product in data["products"]]
+    assert not set(cursor_page) & set(first_page)
 
 
 def test_search_products_empty_query(client):
@@ -309,6 +315,22 @@ def test_search_excludes_inactive_products(client, sample_products):
     assert data["total"] == 0
 
 
+def test_search_products_query_count(client, sample_products, count_queries):
+    """Test that brands, categories and images load without a query per product."""
+    with count_queries() as queries:
+        response = client.get("/products/search?q=fenty")
+
+    assert response.status_code == status.HTTP_200_OK
+    products = response.json()["products"]
+    assert len(products) == 3
+    assert all(product["brand"] and product["category"] for product in products)
+    # The page with a window count, then the images of the whole page
+    assert len(queries) == 2
+    page = queries[0]
+    assert page.count("JOIN brands") == 1
+    assert page.count("JOIN categories") == 1
+
+
 def test_get_product_suggestions(client, sample_products):
     """Test getting product autocomplete suggestions."""
     response = client.get("/products/suggestions?q=fenty")
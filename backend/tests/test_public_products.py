@@ -1,129 +1,144 @@
 """
 Tests for public product API endpoints
 """
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
 import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
 from app.models.product import Brand, Category, Product
+from app.schemas.product import ProductUpdate
+from app.services import product_service
+
+
+# The brand, category and catalog are committed once per module and only
+# read by the tests; anything a test changes happens inside its db_session
+# transaction and is rolled back.
+
+
+@pytest.fixture(scope="module")
+def seed_baseline(db_schema):
+    """Seed the brand, category and products in a single transaction.
+
+    Ids are generated client-side, so each table is one batched INSERT and
+    nothing has to be read back.
+    """
+    brand = {
+        "id": uuid4(),
+        "name": "Test Brand",
+        "slug": "test-brand",
+        "description": "A test brand for testing",
+        "is_active": True,
+    }
+    category = {
+        "id": uuid4(),
+        "name": "Test Category",
+        "slug": "test-category",
+        "description": "A test category for testing",
+        "is_active": True,
+    }
+    common = {"brand_id": brand["id"], "category_id": category["id"]}
+    products = [
+        {
+            "title": "Premium Lipstick",
+            "slug": "premium-lipstick",
+            "description": "High-quality lipstick in various shades",
+            "base_price": Decimal("25.99"),
+            "sku": "LIP-001",
+            "inventory_count": 50,
+            "low_stock_threshold": 10,
+            "is_active": True,
+            "is_featured": True,
+            "tags": ["lipstick", "makeup", "premium"],
+        },
+        {
+            "title": "Basic Foundation",
+            "slug": "basic-foundation",
+            "description": "Affordable foundation for everyday use",
+            "base_price": Decimal("15.50"),
+            "sku": "FND-001",
+            "inventory_count": 30,
+            "low_stock_threshold": 5,
+            "is_active": True,
+            "is_featured": False,
+            "tags": ["foundation", "makeup", "affordable"],
+        },
+        {
+            "title": "Luxury Mascara",
+            "slug": "luxury-mascara",
+            "description": "Premium mascara for dramatic lashes",
+            "base_price": Decimal("35.00"),
+            "sku": "MAS-001",
+            "inventory_count": 20,
+            "low_stock_threshold": 5,
+            "is_active": True,
+            "is_featured": True,
+            "tags": ["mascara", "makeup", "luxury"],
+        },
+        {
+            "title": "Out of Stock Product",
+            "slug": "out-of-stock-product",
+            "description": "This product is out of stock",
+            "base_price": Decimal("20.00"),
+            "sku": "OOS-001",
+            "inventory_count": 0,
+            "low_stock_threshold": 5,
+            "is_active": True,
+            "is_featured": False,
+            "tags": ["test"],
+        },
+        {
+            "title": "Inactive Product",
+            "slug": "inactive-product",
+            "description": "This product is inactive",
+            "base_price": Decimal("10.00"),
+            "sku": "INACT-001",
+            "inventory_count": 100,
+            "low_stock_threshold": 10,
+            "is_active": False,  # Inactive product should not appear
+            "is_featured": False,
+            "tags": ["inactive"],
+        },
+    ]
+    rows = {
+        Brand: [brand],
+        Category: [category],
+        Product: [{"id": uuid4(), **common, **product} for product in products],
+    }
 
+    with Session(db_schema) as session:
+        for model, mappings in rows.items():
+            session.bulk_insert_mappings(model, mappings)
+        session.commit()
 
-@pytest.fixture
-def test_brand(db_session: Session):
-    """Create a test brand."""
-    brand = Brand(
-        name="Test Brand",
-        slug="test-brand",
-        description="A test brand for testing",
-        is_active=True,
-    )
-    db_session.add(brand)
-    db_session.commit()
-    db_session.refresh(brand)
-    return brand
-
-
-@pytest.fixture
-def test_category(db_session: Session):
-    """Create a test category."""
-    category = Category(
-        name="Test Category",
-        slug="test-category",
-        description="A test category for testing",
-        display_order=1,
-        is_active=True,
-    )
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(category)
-    return category
+    yield {model: [SimpleNamespace(**row) for row in mappings] for model, mappings in rows.items()}
 
+    with Session(db_schema) as session:
+        for model in (Product, Category, Brand):
+            session.query(model).filter(model.id.in_([row["id"] for row in rows[model]])).delete()
+        session.commit()
 
-@pytest.fixture
-def test_products(db_session: Session, test_brand, test_category):
-    """Create multiple test products with different attributes."""
-    products = [
-        Product(
-            title="Premium Lipstick",
-            slug="premium-lipstick",
-            description="High-quality lipstick in various shades",
-            brand_id=test_brand.id,
-            category_id=test_category.id,
-            base_price=25.99,
-            sku="LIP-001",
-            inventory_count=50,
-            low_stock_threshold=10,
-            is_active=True,
-            is_featured=True,
-            tags=["lipstick", "makeup", "premium"],
-        ),
-        Product(
-            title="Basic Foundation",
-            slug="basic-foundation",
-            description="Affordable foundation for everyday use",
-            brand_id=test_brand.id,
-            category_id=test_category.id,
-            base_price=15.50,
-            sku="FND-001",
-            inventory_count=30,
-            low_stock_threshold=5,
-            is_active=True,
-            is_featured=False,
-            tags=["foundation", "makeup", "affordable"],
-        ),
-        Product(
-            title="Luxury Mascara",
-            slug="luxury-mascara",
-            description="Premium mascara for dramatic lashes",
-            brand_id=test_brand.id,
-            category_id=test_category.id,
-            base_price=35.00,
-            sku="MAS-001",
-            inventory_count=20,
-            low_stock_threshold=5,
-            is_active=True,
-            is_featured=True,
-            tags=["mascara", "makeup", "luxury"],
-        ),
-        Product(
-            title="Out of Stock Product",
-            slug="out-of-stock-product",
-            description="This product is out of stock",
-            brand_id=test_brand.id,
-            category_id=test_category.id,
-            base_price=20.00,
-            sku="OOS-001",
-            inventory_count=0,
-            low_stock_threshold=5,
-            is_active=True,
-            is_featured=False,
-            tags=["test"],
-        ),
-        Product(
-            title="Inactive Product",
-            slug="inactive-product",
-            description="This product is inactive",
-            brand_id=test_brand.id,
-            category_id=test_category.id,
-            base_price=10.00,
-            sku="INACT-001",
-            inventory_count=100,
-            low_stock_threshold=10,
-            is_active=False,  # Inactive product should not appear
-            is_featured=False,
-            tags=["inactive"],
-        ),
-    ]
 
-    for product in products:
-        db_session.add(product)
+@pytest.fixture(scope="module")
+def test_brand(seed_baseline):
+    """Test brand."""
+    return seed_baseline[Brand][0]
 
-    db_session.commit()
 
-    for product in products:
-        db_session.refresh(product)
+@pytest.fixture(scope="module")
+def test_category(seed_baseline):
+    """Test category."""
+    return seed_baseline[Category][0]
+
 
-    return products
+@pytest.fixture(scope="module")
+def test_products(seed_baseline):
+    """Multiple test products with different attributes."""
+    return seed_baseline[Product]
 
 
 def test_list_products_default(client: TestClient, test_products):
@@ -149,6 +164,48 @@ def test_list_products_default(client: TestClient, test_products):
     assert "out-of-stock-product" not in slugs
 
 
+def test_list_products_query_count(client: TestClient, test_products, count_queries):
+    """Test that a page loads its relations without a query per product."""
+    with count_queries() as queries:
+        response = client.get("/products")
+
+    assert response.status_code == 200
+    assert len(response.json()["items"]) == 3
+    # The page joined to brands and categories with a window count, then its images
+    assert len(queries) == 2
+
+
+def test_list_products_cached_until_products_change(
+    client: TestClient, db_session: Session, test_products, count_queries
+):
+    """Test that listings are served from cache and refreshed after product writes."""
+    lipstick = test_products[0]
+    assert client.get("/products").status_code == 200
+
+    with count_queries() as queries:
+        response = client.get("/products")
+    assert response.status_code == 200
+    assert queries == []
+
+    # A direct database write bypasses the services, so the cached listing stands
+    db_session.execute(
+        update(Product).where(Product.id == lipstick.id).values(title="Renamed Lipstick")
+    )
+    db_session.commit()
+    titles = [item["title"] for item in client.get("/products").json()["items"]]
+    assert "Renamed Lipstick" not in titles
+
+    # Writing through the product service clears the cache
+    product_service.update_product(db_session, lipstick.id, ProductUpdate(is_featured=False))
+    titles = [item["title"] for item in client.get("/products").json()["items"]]
+    assert "Renamed Lipstick" in titles
+
+    # So does an inventory change
+    product_service.update_inventory(db_session, lipstick.id, -lipstick.inventory_count)
+    slugs = [item["slug"] for item in client.get("/products").json()["items"]]
+    assert "premium-lipstick" not in slugs
+
+
 def test_list_products_include_out_of_stock(client: TestClient, test_products):
     """Test listing products including out of stock items."""
     response = client.get("/products?inStockOnly=false")
@@ -203,6 +260,16 @@ def test_list_products_with_price_range(client: TestClient, test_products):
     assert data["items"][0]["title"] == "Premium Lipstick"
 
 
+def test_list_products_with_exact_price_bounds(client: TestClient, test_products):
+    """Test that price bounds are inclusive at the cent."""
+    response = client.get("/products?minPrice=25.99&maxPrice=25.99")
+
+    assert response.status_code == 200
+    data = response.json()
+
+    assert [item["title"] for item in data["items"]] == ["Premium Lipstick"]
+
+
 @pytest.mark.skip(reason="Search with ARRAY.contains() requires PostgreSQL-specific ARRAY type in production")
 def test_list_products_with_search(client: TestClient, test_products):
     """Test searching products by text."""
@@ -280,6 +347,51 @@ def test_list_products_pagination(client: TestClient, test_products):
     assert data["page"] == 2
     assert len(data["items"]) == 1  # Last page has 1 item
 
+    # A page past the end still reports the total
+    data = client.get("/products?page=3&page_size=2").json()
+    assert data["items"] == []
+    assert data["total"] == 3
+
+
+@pytest.mark.parametrize(
+    "sort",
+    ["", "&sortBy=base_price&sortOrder=asc", "&sortBy=title&sortOrder=desc"],
+    ids=["default", "price_asc", "title_desc"],
+)
+def test_list_products_cursor_pagination(client: TestClient, test_products, sort):
+    """Test that following next_cursor walks the listing in the same order as one page."""
+    expected = [item["slug"] for item in client.get(f"/products?page_size=10{sort}").json()["items"]]
+
+    seen = []
+    url = f"/products?page_size=2{sort}"
+    while url:
+        data = client.get(url).json()
+        assert data["total"] == 3
+        seen += [item["slug"] for item in data["items"]]
+        url = f"/products?page_size=2{sort}&cursor={data['next_cursor']}" if data["next_cursor"] else None
+
+    assert seen == expected
+    assert len(seen) == 3
+
+
+def test_list_products_invalid_cursor(client: TestClient):
+    """Test that an unknown cursor is rejected."""
+    response = client.get("/products?cursor=00000000-0000-0000-0000-000000000000")
+
+    assert response.status_code == 400
+
+
+@pytest.mark.parametrize("column", ["created_at", "base_price", "title"])
+@pytest.mark.parametrize("direction", ["ASC", "DESC"])
+def test_list_products_sort_uses_index(explain, column, direction):
+    """Test that a listing page is read in order from the partial listing index."""
+    plan = explain(
+        "SELECT * FROM products WHERE is_active = true AND inventory_count > 0 "
+        f"ORDER BY {column} {direction} LIMIT 20"
+    )
+    assert f"idx_products_listing_{column}" in plan
+    assert "Sort" not in plan
+
 
 def test_list_featured_products(client: TestClient, test_products):
     """Test getting featured products."""
@@ -302,6 +414,16 @@ def test_list_featured_products(client: TestClient, test_products):
     assert "luxury-mascara" in slugs
 
 
+def test_list_featured_products_uses_index(explain):
+    """Test that the featured page is read from the partial featured index."""
+    plan = explain(
+        "SELECT * FROM products WHERE is_active = true AND is_featured = true "
+        "AND inventory_count > 0 ORDER BY created_at DESC LIMIT 10"
+    )
+    assert "idx_products_featured" in plan
+    assert "Sort" not in plan
+
+
 def test_get_product_by_id(client: TestClient, test_products):
     """Test getting a single product by ID."""
     product = test_products[0]  # Premium Lipstick
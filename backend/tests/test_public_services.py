@@ -4,43 +4,67 @@ Tests for public Service Package API endpoints
 import pytest
 from uuid import uuid4
 
+pytestmark = pytest.mark.asyncio
+
+# Fields of a plain active package; tests override only what they check
+PACKAGE_DEFAULTS = {
+    "package_type": "regular",
+    "name": "Regular Package",
+    "base_other_price": 3000,
+    "duration_minutes": 60,
+    "is_active": True,
+}
+
+
+@pytest.fixture
+def make_packages(db_session):
+    """
+    Create a factory that inserts service packages in one batched INSERT
+
+    Each argument is a dict of fields overriding PACKAGE_DEFAULTS; the
+    generated ids are returned in the same order. Ids are assigned
+    client-side, so nothing is read back after the commit.
+    """
+    from app.models.service import ServicePackage
+
+    def _make_packages(*overrides):
+        rows = [{"id": uuid4(), **PACKAGE_DEFAULTS, **fields} for fields in overrides]
+        db_session.bulk_insert_mappings(ServicePackage, rows)
+        db_session.commit()
+        return [row["id"] for row in rows]
+
+    return _make_packages
+
 
 class TestPublicServicePackagesAPI:
     """Test suite for public service packages endpoints (no authentication required)"""
 
-    def test_list_active_services(self, client, db_session):
+    async def test_list_active_services(self, aclient, make_packages):
         """Test listing active service packages"""
-        from app.models.service import ServicePackage
-
-        # Create test service packages
-        active_package = ServicePackage(
-            package_type="bridal_large",
-            name="Luxury Bridal Package",
-            description="Complete bridal makeup for large parties",
-            base_bride_price=15000,
-            base_maid_price=5000,
-            base_mother_price=7000,
-            base_other_price=4000,
-            max_maids=10,
-            min_maids=4,
-            includes_facial=True,
-            duration_minutes=300,
-            is_active=True,
-            display_order=1
-        )
-        inactive_package = ServicePackage(
-            package_type="regular",
-            name="Inactive Package",
-            description="This should not appear",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=False
+        make_packages(
+            {
+                "package_type": "bridal_large",
+                "name": "Luxury Bridal Package",
+                "description": "Complete bridal makeup for large parties",
+                "base_bride_price": 15000,
+                "base_maid_price": 5000,
+                "base_mother_price": 7000,
+                "base_other_price": 4000,
+                "max_maids": 10,
+                "min_maids": 4,
+                "includes_facial": True,
+                "duration_minutes": 300,
+                "display_order": 1,
+            },
+            {
+                "name": "Inactive Package",
+                "description": "This should not appear",
+                "is_active": False,
+            },
         )
-        db_session.add_all([active_package, inactive_package])
-        db_session.commit()
 
         # List services (no auth required)
-        response = client.get("/api/services")
+        response = await aclient.get("/api/services")
         assert response.status_code == 200
 
         data = response.json()
@@ -49,26 +73,21 @@ class TestPublicServicePackagesAPI:
         assert data["items"][0]["name"] == "Luxury Bridal Package"
         assert data["items"][0]["is_active"] is True
 
-    def test_list_services_with_pagination(self, client, db_session):
+    async def test_list_services_with_pagination(self, aclient, make_packages):
         """Test service packages listing with pagination"""
-        from app.models.service import ServicePackage
-
         # Create 25 active service packages
-        for i in range(25):
-            package = ServicePackage(
-                package_type="regular",
-                name=f"Package {i}",
-                description=f"Description {i}",
-                base_other_price=3000 + i * 100,
-                duration_minutes=60,
-                is_active=True,
-                display_order=i
-            )
-            db_session.add(package)
-        db_session.commit()
+        make_packages(*(
+            {
+                "name": f"Package {i}",
+                "description": f"Description {i}",
+                "base_other_price": 3000 + i * 100,
+                "display_order": i,
+            }
+            for i in range(25)
+        ))
 
         # Get first page
-        response = client.get("/api/services?page=1&page_size=10")
+        response = await aclient.get("/api/services?page=1&page_size=10")
         assert response.status_code == 200
         data = response.json()
         assert data["total"] == 25
@@ -78,71 +97,125 @@ class TestPublicServicePackagesAPI:
         assert len(data["items"]) == 10
 
         # Get second page
-        response = client.get("/api/services?page=2&page_size=10")
+        response = await aclient.get("/api/services?page=2&page_size=10")
         assert response.status_code == 200
         data = response.json()
         assert len(data["items"]) == 10
 
         # Get last page
-        response = client.get("/api/services?page=3&page_size=10")
+        response = await aclient.get("/api/services?page=3&page_size=10")
         assert response.status_code == 200
         data = response.json()
         assert len(data["items"]) == 5
 
-    def test_filter_services_by_package_type(self, client, db_session):
-        """Test filtering service packages by type"""
+        # A page past the end still reports the total
+        response = await aclient.get("/api/services?page=4&page_size=10")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["total"] == 25
+        assert len(data["items"]) == 0
+
+    async def test_list_services_cursor_pagination(self, aclient, make_packages):
+        """Test that following next_cursor walks the same pages as page numbers"""
+        # Two packages share a display_order and a name, so the id breaks the tie
+        make_packages(*({"name": f"Package {min(i, 3)}", "display_order": min(i, 3)} for i in range(5)))
+
+        seen = []
+        url = "/api/services?page_size=2"
+        while url:
+            data = (await aclient.get(url)).json()
+            assert data["total"] == 5
+            seen += [item["id"] for item in data["items"]]
+            url = f"/api/services?page_size=2&cursor={data['next_cursor']}" if data["next_cursor"] else None
+
+        by_page = [
+            item["id"]
+            for page in (1, 2, 3)
+            for item in (await aclient.get(f"/api/services?page_size=2&page={page}")).json()["items"]
+        ]
+        assert seen == by_page
+        assert len(set(seen)) == 5
+
+    async def test_list_services_invalid_cursor(self, aclient, db_session):
+        """Test that an unknown cursor is rejected"""
+        response = await aclient.get(f"/api/services?cursor={uuid4()}")
+        assert response.status_code == 400
+
+    async def test_list_services_cached_until_packages_change(self, aclient, db_session, make_packages):
+        """Test that the listing is served from cache until a package is updated"""
+        from sqlalchemy import update
+
         from app.models.service import ServicePackage
+        from app.schemas.service_package import ServicePackageUpdate
+        from app.services.service_package_service import update_package
 
-        bridal_package = ServicePackage(
-            package_type="bridal_large",
-            name="Bridal Package",
-            base_bride_price=15000,
-            duration_minutes=300,
-            is_active=True
-        )
-        regular_package = ServicePackage(
-            package_type="regular",
-            name="Regular Package",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True
-        )
-        db_session.add_all([bridal_package, regular_package])
+        [package_id] = make_packages({})
+
+        response = await aclient.get("/api/services")
+        assert [item["name"] for item in response.json()["items"]] == ["Regular Package"]
+
+        # A direct database write bypasses the service, so the cached listing stands
+        db_session.execute(update(ServicePackage).values(name="Renamed Package"))
         db_session.commit()
+        response = await aclient.get("/api/services")
+        assert [item["name"] for item in response.json()["items"]] == ["Regular Package"]
+
+        # Updating through the service clears the cache
+        update_package(db_session, package_id, ServicePackageUpdate(duration_minutes=90))
+        response = await aclient.get("/api/services")
+        assert [item["name"] for item in response.json()["items"]] == ["Renamed Package"]
+
+    async def test_list_services_query_count(self, aclient, make_packages, count_queries):
+        """Test that a page of packages and its total come from a single query"""
+        make_packages(*({"name": f"Package {i}", "display_order": i} for i in range(5)))
+
+        with count_queries() as statements:
+            response = await aclient.get("/api/services?page_size=2")
+        assert response.status_code == 200
+        assert response.json()["total"] == 5
+        assert len(statements) == 1
+
+    async def test_filter_services_by_package_type(self, aclient, make_packages):
+        """Test filtering service packages by type"""
+        make_packages(
+            {
+                "package_type": "bridal_large",
+                "name": "Bridal Package",
+                "base_bride_price": 15000,
+                "base_other_price": None,
+                "duration_minutes": 300,
+            },
+            {},
+        )
 
         # Filter by bridal_large
-        response = client.get("/api/services?package_type=bridal_large")
+        response = await aclient.get("/api/services?package_type=bridal_large")
         assert response.status_code == 200
         data = response.json()
         assert data["total"] == 1
         assert data["items"][0]["package_type"] == "bridal_large"
 
         # Filter by regular
-        response = client.get("/api/services?package_type=regular")
+        response = await aclient.get("/api/services?package_type=regular")
         assert response.status_code == 200
         data = response.json()
         assert data["total"] == 1
         assert data["items"][0]["package_type"] == "regular"
 
-    def test_get_service_details_by_id(self, client, db_session):
+    async def test_get_service_details_by_id(self, aclient, make_packages):
         """Test getting a specific active service package by ID"""
-        from app.models.service import ServicePackage
-
-        package = ServicePackage(
-            package_type="bride_only",
-            name="Bride Only Package",
-            description="Makeup for bride only",
-            base_bride_price=10000,
-            includes_facial=True,
-            duration_minutes=180,
-            is_active=True
-        )
-        db_session.add(package)
-        db_session.commit()
-        db_session.refresh(package)
+        [package_id] = make_packages({
+            "package_type": "bride_only",
+            "name": "Bride Only Package",
+            "description": "Makeup for bride only",
+            "base_bride_price": 10000,
+            "base_other_price": None,
+            "includes_facial": True,
+            "duration_minutes": 180,
+        })
 
         # Get package details (no auth required)
-        response = client.get(f"/api/services/{package.id}")
+        response = await aclient.get(f"/api/services/{package_id}")
         assert response.status_code == 200
 
         data = response.json()
@@ -152,64 +225,30 @@ class TestPublicServicePackagesAPI:
         assert data["includes_facial"] is True
         assert data["is_active"] is True
 
-    def test_get_inactive_service_returns_404(self, client, db_session):
+    async def test_get_inactive_service_returns_404(self, aclient, make_packages):
         """Test that inactive service packages return 404 for public endpoint"""
-        from app.models.service import ServicePackage
-
-        inactive_package = ServicePackage(
-            package_type="regular",
-            name="Inactive Package",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=False
-        )
-        db_session.add(inactive_package)
-        db_session.commit()
-        db_session.refresh(inactive_package)
+        [inactive_package_id] = make_packages({"name": "Inactive Package", "is_active": False})
 
         # Try to get inactive package (should return 404)
-        response = client.get(f"/api/services/{inactive_package.id}")
+        response = await aclient.get(f"/api/services/{inactive_package_id}")
         assert response.status_code == 404
 
-    def test_get_nonexistent_service_returns_404(self, client):
+    async def test_get_nonexistent_service_returns_404(self, aclient):
         """Test getting a service package that doesn't exist"""
         fake_id = uuid4()
-        response = client.get(f"/api/services/{fake_id}")
+        response = await aclient.get(f"/api/services/{fake_id}")
         assert response.status_code == 404
 
-    def test_services_ordered_by_display_order(self, client, db_session):
+    async def test_services_ordered_by_display_order(self, aclient, make_packages):
         """Test that service packages are ordered by display_order"""
-        from app.models.service import ServicePackage
-
         # Create packages with different display orders
-        package1 = ServicePackage(
-            package_type="regular",
-            name="Package C",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True,
-            display_order=3
-        )
-        package2 = ServicePackage(
-            package_type="regular",
-            name="Package A",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True,
-            display_order=1
-        )
-        package3 = ServicePackage(
-            package_type="regular",
-            name="Package B",
-            base_other_price=3000,
-            duration_minutes=60,
-            is_active=True,
-            display_order=2
+        make_packages(
+            {"name": "Package C", "display_order": 3},
+            {"name": "Package A", "display_order": 1},
+            {"name": "Package B", "display_order": 2},
         )
-        db_session.add_all([package1, package2, package3])
-        db_session.commit()
 
-        response = client.get("/api/services")
+        response = await aclient.get("/api/services")
         assert response.status_code == 200
 
         data = response.json()
@@ -219,29 +258,23 @@ class TestPublicServicePackagesAPI:
         assert data["items"][1]["name"] == "Package B"  # display_order = 2
         assert data["items"][2]["name"] == "Package C"  # display_order = 3
 
-    def test_service_pricing_breakdown_included(self, client, db_session):
+    async def test_service_pricing_breakdown_included(self, aclient, make_packages):
         """Test that pricing breakdown is included in response"""
-        from app.models.service import ServicePackage
-
-        package = ServicePackage(
-            package_type="bridal_large",
-            name="Full Bridal Package",
-            description="Complete bridal party makeup",
-            base_bride_price=15000,
-            base_maid_price=5000,
-            base_mother_price=7000,
-            base_other_price=4000,
-            max_maids=10,
-            min_maids=4,
-            includes_facial=True,
-            duration_minutes=300,
-            is_active=True
-        )
-        db_session.add(package)
-        db_session.commit()
-        db_session.refresh(package)
-
-        response = client.get(f"/api/services/{package.id}")
+        [package_id] = make_packages({
+            "package_type": "bridal_large",
+            "name": "Full Bridal Package",
+            "description": "Complete bridal party makeup",
+            "base_bride_price": 15000,
+            "base_maid_price": 5000,
+            "base_mother_price": 7000,
+            "base_other_price": 4000,
+            "max_maids": 10,
+            "min_maids": 4,
+            "includes_facial": True,
+            "duration_minutes": 300,
+        })
+
+        response = await aclient.get(f"/api/services/{package_id}")
         assert response.status_code == 200
 
         data = response.json()
@@ -255,27 +288,22 @@ class TestPublicServicePackagesAPI:
         assert float(data["base_mother_price"]) == 7000
         assert float(data["base_other_price"]) == 4000
 
-    def test_service_metadata_included(self, client, db_session):
+    async def test_service_metadata_included(self, aclient, make_packages):
         """Test that service metadata (duration, facial, etc.) is included"""
-        from app.models.service import ServicePackage
-
-        package = ServicePackage(
-            package_type="bridal_small",
-            name="Small Bridal Package",
-            description="Perfect for intimate weddings",
-            base_bride_price=12000,
-            base_maid_price=4500,
-            max_maids=3,
-            min_maids=1,
-            includes_facial=True,
-            duration_minutes=240,
-            is_active=True
-        )
-        db_session.add(package)
-        db_session.commit()
-        db_session.refresh(package)
-
-        response = client.get(f"/api/services/{package.id}")
+        [package_id] = make_packages({
+            "package_type": "bridal_small",
+            "name": "Small Bridal Package",
+            "description": "Perfect for intimate weddings",
+            "base_bride_price": 12000,
+            "base_maid_price": 4500,
+            "base_other_price": None,
+            "max_maids": 3,
+            "min_maids": 1,
+            "includes_facial": True,
+            "duration_minutes": 240,
+        })
+
+        response = await aclient.get(f"/api/services/{package_id}")
         assert response.status_code == 200
 
         data = response.json()
@@ -285,9 +313,9 @@ class TestPublicServicePackagesAPI:
         assert data["min_maids"] == 1
         assert data["description"] == "Perfect for intimate weddings"
 
-    def test_empty_services_list(self, client, db_session):
+    async def test_empty_services_list(self, aclient, db_session):
         """Test listing services when none exist"""
-        response = client.get("/api/services")
+        response = await aclient.get("/api/services")
         assert response.status_code == 200
 
         data = response.json()
@@ -295,3 +323,12 @@ class TestPublicServicePackagesAPI:
         assert len(data["items"]) == 0
         assert data["page"] == 1
         assert data["total_pages"] == 1
+
+    async def test_list_services_uses_index(self, explain):
+        """Test that a page of active packages is read in order from the listing index"""
+        plan = explain(
+            "SELECT * FROM service_packages WHERE is_active = true "
+            "ORDER BY display_order, name, id LIMIT 20"
+        )
+        assert "Index Scan using idx_service_packages_listing" in plan
+        assert "Sort" not in plan
@@ -1,141 +1,163 @@
 """Tests for testimonials API endpoints."""
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
+
 import pytest
 from fastapi import status
+from sqlalchemy import update
+from sqlalchemy.orm import Session
 
 from app.models.content import Testimonial
-from app.models.service import ServicePackage, TransportLocation
+from app.models.service import ServicePackage
 from app.models.product import Product, Brand, Category
 
-
-@pytest.fixture
-def service_package(db_session):
-    """Create a test service package."""
-    package = ServicePackage(
-        package_type="bridal_large",
-        name="Test Bridal Package",
-        description="Test package",
-        base_bride_price=10000.00,
-        is_active=True,
-        display_order=1,
-    )
-    db_session.add(package)
-    db_session.commit()
-    db_session.refresh(package)
-    return package
-
-
-@pytest.fixture
-def product(db_session):
-    """Create a test product."""
-    # Create brand
-    brand = Brand(
-        name="Test Brand",
-        slug="test-brand",
-        is_active=True,
-    )
-    db_session.add(brand)
-
-    # Create category
-    category = Category(
-        name="Test Category",
-        slug="test-category",
-        display_order=1,
-        is_active=True,
-    )
-    db_session.add(category)
-    db_session.commit()
-
-    # Create product
-    product = Product(
-        title="Test Product",
-        slug="test-product",
-        description="A test product",
-        brand_id=brand.id,
-        category_id=category.id,
-        base_price=100.00,
-        inventory_count=50,
-        low_stock_threshold=10,
-        is_active=True,
-        is_featured=False,
-    )
-    db_session.add(product)
-    db_session.commit()
-    db_session.refresh(product)
-    return product
+pytestmark = pytest.mark.asyncio
+
+
+# The service package and product that testimonials point at are committed
+# once per module. The testimonials themselves are added per test inside the
+# db_session transaction, since several tests need the table empty or
+# filled with their own rows.
+
+
+@pytest.fixture(scope="module")
+def seed_baseline(db_schema):
+    """Seed the service package and the product (with its brand and category).
+
+    Ids are generated client-side, so each table is one batched INSERT and
+    nothing has to be read back.
+    """
+    brand = {"id": uuid4(), "name": "Test Brand", "slug": "test-brand", "is_active": True}
+    category = {
+        "id": uuid4(),
+        "name": "Test Category",
+        "slug": "test-category",
+        "display_order": 1,
+        "is_active": True,
+    }
+    rows = {
+        ServicePackage: [{
+            "id": uuid4(),
+            "package_type": "bridal_large",
+            "name": "Test Bridal Package",
+            "description": "Test package",
+            "base_bride_price": Decimal("10000.00"),
+            "is_active": True,
+            "display_order": 1,
+        }],
+        Brand: [brand],
+        Category: [category],
+        Product: [{
+            "id": uuid4(),
+            "title": "Test Product",
+            "slug": "test-product",
+            "description": "A test product",
+            "brand_id": brand["id"],
+            "category_id": category["id"],
+            "base_price": Decimal("100.00"),
+            "inventory_count": 50,
+            "low_stock_threshold": 10,
+            "is_active": True,
+            "is_featured": False,
+        }],
+    }
+
+    with Session(db_schema) as session:
+        for model, mappings in rows.items():
+            session.bulk_insert_mappings(model, mappings)
+        session.commit()
+
+    yield {model: SimpleNamespace(**mappings[0]) for model, mappings in rows.items()}
+
+    with Session(db_schema) as session:
+        for model in (Product, Category, Brand, ServicePackage):
+            session.query(model).filter(model.id.in_([row["id"] for row in rows[model]])).delete()
+        session.commit()
+
+
+@pytest.fixture(scope="module")
+def service_package(seed_baseline):
+    """Test service package."""
+    return seed_baseline[ServicePackage]
+
+
+@pytest.fixture(scope="module")
+def product(seed_baseline):
+    """Test product."""
+    return seed_baseline[Product]
 
 
 @pytest.fixture
 def sample_testimonials(db_session, service_package, product):
-    """Create sample testimonials for testing."""
-    testimonials = [
+    """Create sample testimonials for testing, in one batched INSERT."""
+    rows = [
         # Approved, featured testimonial
-        Testimonial(
-            customer_name="John Doe",
-            customer_photo_url="https://example.com/john.jpg",
-            location="Nairobi",
-            rating=5,
-            testimonial_text="Amazing service! The makeup was flawless.",
-            related_service_id=service_package.id,
-            is_featured=True,
-            is_approved=True,
-            display_order=1,
-        ),
+        {
+            "customer_name": "John Doe",
+            "customer_photo_url": "https://example.com/john.jpg",
+            "location": "Nairobi",
+            "rating": 5,
+            "testimonial_text": "Amazing service! The makeup was flawless.",
+            "related_service_id": service_package.id,
+            "is_featured": True,
+            "is_approved": True,
+            "display_order": 1,
+        },
         # Approved, not featured testimonial
-        Testimonial(
-            customer_name="Jane Smith",
-            location="Kitui",
-            rating=5,
-            testimonial_text="Highly recommended! Professional and talented.",
-            is_featured=False,
-            is_approved=True,
-            display_order=2,
-        ),
+        {
+            "customer_name": "Jane Smith",
+            "location": "Kitui",
+            "rating": 5,
+            "testimonial_text": "Highly recommended! Professional and talented.",
+            "is_featured": False,
+            "is_approved": True,
+            "display_order": 2,
+        },
         # Approved testimonial for product
-        Testimonial(
-            customer_name="Alice Johnson",
-            customer_photo_url="https://example.com/alice.jpg",
-            rating=4,
-            testimonial_text="Great product, fast delivery!",
-            related_product_id=product.id,
-            is_featured=False,
-            is_approved=True,
-            display_order=3,
-        ),
+        {
+            "customer_name": "Alice Johnson",
+            "customer_photo_url": "https://example.com/alice.jpg",
+            "rating": 4,
+            "testimonial_text": "Great product, fast delivery!",
+            "related_product_id": product.id,
+            "is_featured": False,
+            "is_approved": True,
+            "display_order": 3,
+        },
         # NOT approved testimonial (should not appear in results)
-        Testimonial(
-            customer_name="Bob Wilson",
-            rating=5,
-            testimonial_text="This should not appear - not approved yet.",
-            is_featured=False,
-            is_approved=False,
-            display_order=4,
-        ),
+        {
+            "customer_name": "Bob Wilson",
+            "rating": 5,
+            "testimonial_text": "This should not appear - not approved yet.",
+            "is_featured": False,
+            "is_approved": False,
+            "display_order": 4,
+        },
         # Approved, featured testimonial without related entities
-        Testimonial(
-            customer_name="Carol Brown",
-            location="Mombasa",
-            rating=5,
-            testimonial_text="Absolutely wonderful experience!",
-            is_featured=True,
-            is_approved=True,
-            display_order=0,  # Should appear first
-        ),
+        {
+            "customer_name": "Carol Brown",
+            "location": "Mombasa",
+            "rating": 5,
+            "testimonial_text": "Absolutely wonderful experience!",
+            "is_featured": True,
+            "is_approved": True,
+            "display_order": 0,  # Should appear first
+        },
     ]
 
-    for testimonial in testimonials:
-        db_session.add(testimonial)
+    # Every row gets the same keys, so they all go in a single executemany
+    columns = {key for row in rows for key in row}
+    rows = [{"id": uuid4(), **dict.fromkeys(columns), **row} for row in rows]
+    db_session.bulk_insert_mappings(Testimonial, rows)
     db_session.commit()
 
-    # Refresh all testimonials
-    for testimonial in testimonials:
-        db_session.refresh(testimonial)
-
-    return testimonials
+    return [SimpleNamespace(**row) for row in rows]
 
 
-def test_list_testimonials_default(client, sample_testimonials):
+async def test_list_testimonials_default(aclient, sample_testimonials):
     """Test listing all approved testimonials."""
-    response = client.get("/api/testimonials")
+    response = await aclient.get("/api/testimonials")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -160,9 +182,9 @@ def test_list_testimonials_default(client, sample_testimonials):
         assert item["customerName"] != "Bob Wilson"
 
 
-def test_list_featured_testimonials(client, sample_testimonials):
+async def test_list_featured_testimonials(aclient, sample_testimonials):
     """Test listing only featured testimonials."""
-    response = client.get("/api/testimonials/featured")
+    response = await aclient.get("/api/testimonials/featured")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -180,9 +202,9 @@ def test_list_featured_testimonials(client, sample_testimonials):
     assert items[1]["displayOrder"] == 1
 
 
-def test_filter_testimonials_by_service(client, sample_testimonials, service_package):
+async def test_filter_testimonials_by_service(aclient, sample_testimonials, service_package):
     """Test filtering testimonials by service package."""
-    response = client.get(f"/api/testimonials?related_service_id={service_package.id}")
+    response = await aclient.get(f"/api/testimonials?related_service_id={service_package.id}")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -196,9 +218,9 @@ def test_filter_testimonials_by_service(client, sample_testimonials, service_pac
     assert item["customerName"] == "John Doe"
 
 
-def test_filter_testimonials_by_product(client, sample_testimonials, product):
+async def test_filter_testimonials_by_product(aclient, sample_testimonials, product):
     """Test filtering testimonials by product."""
-    response = client.get(f"/api/testimonials?related_product_id={product.id}")
+    response = await aclient.get(f"/api/testimonials?related_product_id={product.id}")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -212,9 +234,38 @@ def test_filter_testimonials_by_product(client, sample_testimonials, product):
     assert item["customerName"] == "Alice Johnson"
 
 
-def test_testimonials_exclude_unapproved(client, sample_testimonials):
+async def test_list_testimonials_query_count(aclient, sample_testimonials, count_queries):
+    """Test that the listing, with its related ids, comes from a single query."""
+    with count_queries() as statements:
+        response = await aclient.get("/api/testimonials")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["total"] == 4
+    assert len(statements) == 1
+
+
+async def test_featured_testimonials_cached_until_testimonials_change(aclient, db_session, sample_testimonials):
+    """Test that the featured listing is served from cache until a testimonial is updated."""
+    from app.services.testimonial_service import update_testimonial
+
+    response = await aclient.get("/api/testimonials/featured")
+    assert response.json()["total"] == 2
+
+    # A direct database write bypasses the service, so the cached listing stands
+    db_session.execute(update(Testimonial).values(is_featured=False))
+    db_session.commit()
+    response = await aclient.get("/api/testimonials/featured")
+    assert response.json()["total"] == 2
+
+    # Updating through the service clears the cache
+    update_testimonial(db_session, sample_testimonials[0].id, display_order=5)
+    response = await aclient.get("/api/testimonials/featured")
+    assert response.json()["total"] == 0
+
+
+async def test_testimonials_exclude_unapproved(aclient, sample_testimonials):
     """Test that unapproved testimonials are excluded from results."""
-    response = client.get("/api/testimonials")
+    response = await aclient.get("/api/testimonials")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -226,9 +277,9 @@ def test_testimonials_exclude_unapproved(client, sample_testimonials):
     assert "Bob Wilson" not in customer_names
 
 
-def test_testimonials_empty_results(client, db_session):
+async def test_testimonials_empty_results(aclient, db_session):
     """Test listing testimonials when none exist."""
-    response = client.get("/api/testimonials")
+    response = await aclient.get("/api/testimonials")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -237,23 +288,13 @@ def test_testimonials_empty_results(client, db_session):
     assert len(data["items"]) == 0
 
 
-def test_featured_testimonials_empty_results(client, sample_testimonials):
+async def test_featured_testimonials_empty_results(aclient, db_session, sample_testimonials):
     """Test featured testimonials when all are set to not featured."""
     # Update all testimonials to not featured
-    for testimonial in sample_testimonials:
-        testimonial.is_featured = False
-
-    # Get the database session from fixtures
-    from app.core.database import SessionLocal
-    db = SessionLocal()
-    try:
-        for testimonial in sample_testimonials:
-            db.merge(testimonial)
-        db.commit()
-    finally:
-        db.close()
+    db_session.execute(update(Testimonial).values(is_featured=False))
+    db_session.commit()
 
-    response = client.get("/api/testimonials/featured")
+    response = await aclient.get("/api/testimonials/featured")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -262,9 +303,9 @@ def test_featured_testimonials_empty_results(client, sample_testimonials):
     assert len(data["items"]) == 0
 
 
-def test_testimonial_response_schema(client, sample_testimonials):
+async def test_testimonial_response_schema(aclient, sample_testimonials):
     """Test that testimonial response has all required fields."""
-    response = client.get("/api/testimonials")
+    response = await aclient.get("/api/testimonials")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -296,7 +337,7 @@ def test_testimonial_response_schema(client, sample_testimonials):
     assert 1 <= item["rating"] <= 5
 
 
-def test_testimonials_ordering(client, db_session):
+async def test_testimonials_ordering(aclient, db_session):
     """Test that testimonials are ordered correctly."""
     # Create testimonials with specific ordering attributes
     testimonials = [
@@ -338,7 +379,7 @@ def test_testimonials_ordering(client, db_session):
         db_session.add(testimonial)
     db_session.commit()
 
-    response = client.get("/api/testimonials")
+    response = await aclient.get("/api/testimonials")
 
     assert response.status_code == status.HTTP_200_OK
 
@@ -370,17 +411,27 @@ def test_testimonials_ordering(client, db_session):
     assert items[3]["customerName"] == "User A"
 
 
-def test_invalid_service_id_filter(client):
+async def test_list_testimonials_uses_index(explain):
+    """Test that approved testimonials are read in listing order from the index."""
+    plan = explain(
+        "SELECT * FROM testimonials WHERE is_approved = true "
+        "ORDER BY is_featured DESC, display_order, created_at DESC"
+    )
+    assert "Index Scan using idx_testimonials_listing" in plan
+    assert "Sort" not in plan
+
+
+async def test_invalid_service_id_filter(aclient):
     """Test filtering with invalid service ID."""
-    response = client.get("/api/testimonials?related_service_id=invalid-uuid")
+    response = await aclient.get("/api/testimonials?related_service_id=invalid-uuid")
 
     # Should return 422 validation error
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
 
 
-def test_invalid_product_id_filter(client):
+async def test_invalid_product_id_filter(aclient):
     """Test filtering with invalid product ID."""
-    response = client.get("/api/testimonials?related_product_id=invalid-uuid")
+    response = await aclient.get("/api/testimonials?related_product_id=invalid-uuid")
 
     # Should return 422 validation error
     assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
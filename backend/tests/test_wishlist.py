@@ -1,137 +1,162 @@
 """Tests for wishlist functionality."""
 from decimal import Decimal
+from types import SimpleNamespace
+from uuid import uuid4
 
 import pytest
 from fastapi import status
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
 
+from app.core.security import create_access_token
+from app.models.order import Wishlist
 from app.models.product import Brand, Category, Product
 from app.models.user import User
 
-
-@pytest.fixture
-def sample_brand(db_session):
-    """Create a sample brand."""
-    brand = Brand(
-        name="Test Brand",
-        slug="test-brand",
-        description="Test brand for wishlist tests",
-        is_active=True,
-    )
-    db_session.add(brand)
-    db_session.commit()
-    db_session.refresh(brand)
-    return brand
-
-
-@pytest.fixture
-def sample_category(db_session):
-    """Create a sample category."""
-    category = Category(
-        name="Test Category",
-        slug="test-category",
-        description="Test category for wishlist tests",
-        is_active=True,
-    )
-    db_session.add(category)
-    db_session.commit()
-    db_session.refresh(category)
-    return category
-
-
-@pytest.fixture
-def sample_products(db_session, sample_brand, sample_category):
-    """Create sample products for wishlist testing."""
+pytestmark = pytest.mark.asyncio
+
+# The catalog and users are committed once per module and only read by the
+# tests; wishlist rows are created per test through the API inside the
+# db_session transaction and rolled back.
+
+
+@pytest.fixture(scope="module")
+def seed_baseline(db_schema):
+    """Seed the brand, category, products and two users in a single transaction.
+
+    Ids are generated client-side, so each table is one batched INSERT and
+    nothing has to be read back.
+    """
+    brand = {
+        "id": uuid4(),
+        "name": "Test Brand",
+        "slug": "test-brand",
+        "description": "Test brand for wishlist tests",
+        "is_active": True,
+    }
+    category = {
+        "id": uuid4(),
+        "name": "Test Category",
+        "slug": "test-category",
+        "description": "Test category for wishlist tests",
+        "is_active": True,
+    }
     products = [
-        Product(
-            title="Product 1",
-            slug="product-1",
-            description="First test product",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("1000.00"),
-            inventory_count=50,
-            is_active=True,
-        ),
-        Product(
-            title="Product 2",
-            slug="product-2",
-            description="Second test product",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("2000.00"),
-            inventory_count=10,
-            is_active=True,
-        ),
-        Product(
-            title="Inactive Product",
-            slug="inactive-product",
-            description="Product that is not active",
-            brand_id=sample_brand.id,
-            category_id=sample_category.id,
-            base_price=Decimal("3000.00"),
-            inventory_count=100,
-            is_active=False,
-        ),
+        {
+            "title": "Product 1",
+            "slug": "product-1",
+            "description": "First test product",
+            "base_price": Decimal("1000.00"),
+            "inventory_count": 50,
+            "is_active": True,
+        },
+        {
+            "title": "Product 2",
+            "slug": "product-2",
+            "description": "Second test product",
+            "base_price": Decimal("2000.00"),
+            "inventory_count": 10,
+            "is_active": True,
+        },
+        {
+            "title": "Inactive Product",
+            "slug": "inactive-product",
+            "description": "Product that is not active",
+            "base_price": Decimal("3000.00"),
+            "inventory_count": 100,
+            "is_active": False,
+        },
     ]
-
-    for product in products:
-        db_session.add(product)
-    db_session.commit()
-
-    return products
+    rows = {
+        Brand: [brand],
+        Category: [category],
+        Product: [
+            {"id": uuid4(), "brand_id": brand["id"], "category_id": category["id"], **product}
+            for product in products
+        ],
+        User: [
+            {
+                "id": uuid4(),
+                "email": "testuser@example.com",
+                "google_id": "test123",
+                "full_name": "Test User",
+                "is_active": True,
+            },
+            {
+                "id": uuid4(),
+                "email": "anotheruser@example.com",
+                "google_id": "test456",
+                "full_name": "Another User",
+                "is_active": True,
+            },
+        ],
+    }
+
+    with Session(db_schema) as session:
+        for model, mappings in rows.items():
+            session.bulk_insert_mappings(model, mappings)
+        session.commit()
+
+    products, users = ([SimpleNamespace(**row) for row in rows[model]] for model in (Product, User))
+    yield {"products": products, "users": users}
+
+    with Session(db_schema) as session:
+        for model in (User, Product, Category, Brand):
+            session.query(model).filter(model.id.in_([row["id"] for row in rows[model]])).delete()
+        session.commit()
+
+
+@pytest.fixture(scope="module")
+def sample_products(seed_baseline):
+    """Sample products for wishlist testing."""
+    return seed_baseline["products"]
+
+
+@pytest.fixture(scope="module")
+def authenticated_user(seed_baseline):
+    """Authenticated user for testing."""
+    return seed_baseline["users"][0]
+
+
+@pytest.fixture(scope="module")
+def another_user(seed_baseline):
+    """Another user for authorization testing."""
+    return seed_baseline["users"][1]
 
 
 @pytest.fixture
-def authenticated_user(db_session):
-    """Create authenticated user for testing."""
-    user = User(
-        email="testuser@example.com",
-        google_id="test123",
-        full_name="Test User",
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+def seed_wishlist(db_session):
+    """Create a factory that puts a product in a user's wishlist directly.
 
+    For tests that only need a wishlist to exist before exercising another
+    endpoint; the add endpoint itself is covered by its own tests. The insert
+    runs on db_session's connection, which the app shares, so the row is
+    visible to it without a commit and is discarded with the test's rollback.
+    """
 
-@pytest.fixture
-def another_user(db_session):
-    """Create another user for authorization testing."""
-    user = User(
-        email="anotheruser@example.com",
-        google_id="test456",
-        full_name="Another User",
-        is_active=True,
-    )
-    db_session.add(user)
-    db_session.commit()
-    db_session.refresh(user)
-    return user
+    def _seed_wishlist(user_id, product_id):
+        db_session.execute(insert(Wishlist).values(user_id=user_id, product_id=product_id))
 
+    return _seed_wishlist
 
-@pytest.fixture
+
+@pytest.fixture(scope="module")
 def user_token(authenticated_user):
     """Create JWT token for authenticated user."""
-    from app.core.security import create_access_token
-
     return create_access_token(
         data={"sub": str(authenticated_user.id), "email": authenticated_user.email}
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def another_user_token(another_user):
     """Create JWT token for another user."""
-    from app.core.security import create_access_token
-
     return create_access_token(data={"sub": str(another_user.id), "email": another_user.email})
 
 
-def test_get_empty_wishlist(client, user_token):
+async def test_get_empty_wishlist(aclient, user_token):
     """Test getting empty wishlist."""
-    response = client.get(
+    response = await aclient.get(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
     )
@@ -145,18 +170,26 @@ def test_get_empty_wishlist(client, user_token):
     assert data["total"] == 0
 
 
-def test_get_wishlist_unauthorized(client):
-    """Test that unauthenticated users cannot access wishlist."""
-    response = client.get("/api/wishlist")
+@pytest.mark.no_db
+@pytest.mark.parametrize("method,path", [
+    ("get", "/api/wishlist"),
+    ("post", "/api/wishlist"),
+    ("delete", f"/api/wishlist/{uuid4()}"),
+    ("get", f"/api/wishlist/check/{uuid4()}"),
+], ids=["list", "add", "remove", "check"])
+async def test_wishlist_unauthorized(aclient, method, path):
+    """Test that every wishlist endpoint requires authentication."""
+    body = {"productId": str(uuid4())} if method == "post" else None
+    response = await aclient.request(method, path, json=body)
 
     assert response.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-def test_add_product_to_wishlist(client, user_token, sample_products):
+async def test_add_product_to_wishlist(aclient, user_token, sample_products):
     """Test successfully adding product to wishlist."""
     product = sample_products[0]
 
-    response = client.post(
+    response = await aclient.post(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product.id)},
@@ -172,29 +205,24 @@ def test_add_product_to_wishlist(client, user_token, sample_products):
     assert "createdAt" in data
 
 
-def test_add_multiple_products_to_wishlist(client, user_token, sample_products):
+async def test_add_multiple_products_to_wishlist(aclient, user_token, sample_products):
     """Test adding multiple products to wishlist."""
     product1 = sample_products[0]
     product2 = sample_products[1]
 
-    # Add first product
-    response1 = client.post(
-        "/api/wishlist",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product1.id)},
-    )
+    response1, response2 = [
+        await aclient.post(
+            "/api/wishlist",
+            headers={"Authorization": f"Bearer {user_token}"},
+            json={"productId": str(product.id)},
+        )
+        for product in (product1, product2)
+    ]
     assert response1.status_code == status.HTTP_201_CREATED
-
-    # Add second product
-    response2 = client.post(
-        "/api/wishlist",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product2.id)},
-    )
     assert response2.status_code == status.HTTP_201_CREATED
 
     # Get wishlist
-    response = client.get(
+    response = await aclient.get(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
     )
@@ -206,12 +234,12 @@ def test_add_multiple_products_to_wishlist(client, user_token, sample_products):
     assert data["total"] == 2
 
 
-def test_add_duplicate_product_fails(client, user_token, sample_products):
+async def test_add_duplicate_product_fails(aclient, user_token, sample_products):
     """Test that adding duplicate product to wishlist fails."""
     product = sample_products[0]
 
     # Add product first time
-    response1 = client.post(
+    response1 = await aclient.post(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product.id)},
@@ -219,21 +247,22 @@ def test_add_duplicate_product_fails(client, user_token, sample_products):
     assert response1.status_code == status.HTTP_201_CREATED
 
     # Try to add same product again
-    response2 = client.post(
+    response2 = await aclient.post(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product.id)},
     )
 
     assert response2.status_code == status.HTTP_400_BAD_REQUEST
-    assert "already in" in response2.json()["detail"].lower() and "wishlist" in response2.json()["detail"].lower()
+    detail = response2.json()["detail"].lower()
+    assert "already in" in detail and "wishlist" in detail
 
 
-def test_add_inactive_product_fails(client, user_token, sample_products):
+async def test_add_inactive_product_fails(aclient, user_token, sample_products):
     """Test that adding inactive product to wishlist fails."""
     product = sample_products[2]  # Inactive product
 
-    response = client.post(
+    response = await aclient.post(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product.id)},
@@ -243,13 +272,11 @@ def test_add_inactive_product_fails(client, user_token, sample_products):
     assert "not available" in response.json()["detail"].lower()
 
 
-def test_add_nonexistent_product_fails(client, user_token):
+async def test_add_nonexistent_product_fails(aclient, user_token):
     """Test that adding nonexistent product fails."""
-    from uuid import uuid4
-
     fake_id = uuid4()
 
-    response = client.post(
+    response = await aclient.post(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(fake_id)},
@@ -259,31 +286,15 @@ def test_add_nonexistent_product_fails(client, user_token):
     assert "not found" in response.json()["detail"].lower()
 
 
-def test_add_to_wishlist_unauthorized(client, sample_products):
-    """Test that adding to wishlist requires authentication."""
-    product = sample_products[0]
-
-    response = client.post(
-        "/api/wishlist",
-        json={"productId": str(product.id)},
-    )
-
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-
-def test_remove_from_wishlist(client, user_token, sample_products):
+async def test_remove_from_wishlist(aclient, user_token, sample_products, authenticated_user, seed_wishlist):
     """Test removing product from wishlist."""
     product = sample_products[0]
 
-    # Add product
-    client.post(
-        "/api/wishlist",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id)},
-    )
+    # Start with the product in the wishlist
+    seed_wishlist(authenticated_user.id, product.id)
 
     # Remove product
-    response = client.delete(
+    response = await aclient.delete(
         f"/api/wishlist/{product.id}",
         headers={"Authorization": f"Bearer {user_token}"},
     )
@@ -291,18 +302,18 @@ def test_remove_from_wishlist(client, user_token, sample_products):
     assert response.status_code == status.HTTP_204_NO_CONTENT
 
     # Verify wishlist is empty
-    wishlist_response = client.get(
+    wishlist_response = await aclient.get(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
     )
     assert len(wishlist_response.json()["items"]) == 0
 
 
-def test_remove_nonexistent_product_fails(client, user_token, sample_products):
+async def test_remove_nonexistent_product_fails(aclient, user_token, sample_products):
     """Test that removing product not in wishlist fails."""
     product = sample_products[0]
 
-    response = client.delete(
+    response = await aclient.delete(
         f"/api/wishlist/{product.id}",
         headers={"Authorization": f"Bearer {user_token}"},
     )
@@ -310,21 +321,12 @@ def test_remove_nonexistent_product_fails(client, user_token, sample_products):
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
 
-def test_remove_from_wishlist_unauthorized(client, sample_products):
-    """Test that removing from wishlist requires authentication."""
-    product = sample_products[0]
-
-    response = client.delete(f"/api/wishlist/{product.id}")
-
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-
-def test_check_product_in_wishlist(client, user_token, sample_products):
+async def test_check_product_in_wishlist(aclient, user_token, sample_products, authenticated_user, seed_wishlist):
     """Test checking if product is in wishlist."""
     product = sample_products[0]
 
     # Initially not in wishlist
-    response = client.get(
+    response = await aclient.get(
         f"/api/wishlist/check/{product.id}",
         headers={"Authorization": f"Bearer {user_token}"},
     )
@@ -333,14 +335,10 @@ def test_check_product_in_wishlist(client, user_token, sample_products):
     assert response.json()["inWishlist"] is False
 
     # Add product
-    client.post(
-        "/api/wishlist",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id)},
-    )
+    seed_wishlist(authenticated_user.id, product.id)
 
     # Now should be in wishlist
-    response = client.get(
+    response = await aclient.get(
         f"/api/wishlist/check/{product.id}",
         headers={"Authorization": f"Bearer {user_token}"},
     )
@@ -349,36 +347,27 @@ def test_check_product_in_wishlist(client, user_token, sample_products):
     assert response.json()["inWishlist"] is True
 
 
-def test_check_wishlist_unauthorized(client, sample_products):
-    """Test that checking wishlist requires authentication."""
-    product = sample_products[0]
-
-    response = client.get(f"/api/wishlist/check/{product.id}")
-
-    assert response.status_code == status.HTTP_401_UNAUTHORIZED
-
-
-def test_wishlist_items_newest_first(client, user_token, sample_products):
+async def test_wishlist_items_newest_first(aclient, user_token, sample_products):
     """Test that wishlist items are returned newest first."""
     product1 = sample_products[0]
     product2 = sample_products[1]
 
     # Add product1 first
-    client.post(
+    await aclient.post(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product1.id)},
     )
 
     # Add product2 second
-    client.post(
+    await aclient.post(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
         json={"productId": str(product2.id)},
     )
 
     # Get wishlist
-    response = client.get(
+    response = await aclient.get(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
     )
@@ -391,19 +380,17 @@ def test_wishlist_items_newest_first(client, user_token, sample_products):
     assert data["items"][1]["productId"] == str(product1.id)
 
 
-def test_wishlist_isolation_between_users(client, user_token, another_user_token, sample_products):
+async def test_wishlist_isolation_between_users(
+    aclient, another_user_token, sample_products, authenticated_user, seed_wishlist
+):
     """Test that wishlists are isolated between users."""
     product = sample_products[0]
 
-    # User 1 adds product
-    client.post(
-        "/api/wishlist",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id)},
-    )
+    # User 1 has the product in their wishlist
+    seed_wishlist(authenticated_user.id, product.id)
 
     # User 2's wishlist should be empty
-    response = client.get(
+    response = await aclient.get(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {another_user_token}"},
     )
@@ -413,19 +400,15 @@ def test_wishlist_isolation_between_users(client, user_token, another_user_token
     assert len(data["items"]) == 0
 
 
-def test_wishlist_includes_product_details(client, user_token, sample_products):
+async def test_wishlist_includes_product_details(aclient, user_token, sample_products, authenticated_user, seed_wishlist):
     """Test that wishlist response includes product details."""
     product = sample_products[0]
 
-    # Add product
-    client.post(
-        "/api/wishlist",
-        headers={"Authorization": f"Bearer {user_token}"},
-        json={"productId": str(product.id)},
-    )
+    # Start with the product in the wishlist
+    seed_wishlist(authenticated_user.id, product.id)
 
     # Get wishlist
-    response = client.get(
+    response = await aclient.get(
         "/api/wishlist",
         headers={"Authorization": f"Bearer {user_token}"},
     )